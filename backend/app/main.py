@@ -1,36 +1,92 @@
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import functools
 import json
 import time
-import random
 import sys
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse, HTMLResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "src"))
-
-from reasoning_body.logic_engine import ReasoningBody
-from emotional_analyzer.emotion_processor import EmotionalAnalyzer
-from ethics_sentinel.ethical_guard import EthicsSentinel
-from safety_guardian.ooda_loop import OODALoop as SafetyGuardian
-from memory_trace_manager.memory_graph import MemoryTraceManager
-from abstract_pattern_detector.pattern_finder import AbstractPatternDetector
-from entropy_matrix_harmonizer.coherence_engine import EntropyMatrixHarmonizer
-from monetization.commercial_licensing import CommercialMonetizationService
+# Add the repository root to path so cognitive modules import as the src package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from src.reasoning_body.logic_engine import ReasoningBody
+from src.emotional_analyzer.emotion_processor import EmotionalAnalyzer, EmotionLexicon
+from src.ethics_sentinel.ethical_guard import EthicsSentinel
+from src.safety_guardian.ooda_loop import OODALoop as SafetyGuardian
+from src.memory_trace_manager.memory_graph import MemoryTraceManager
+from src.memory_trace_manager.concepts import ConceptExtractor
+from src.abstract_pattern_detector.pattern_finder import AbstractPatternDetector
+from src.entropy_matrix_harmonizer.coherence_engine import EntropyMatrixHarmonizer
+from src.monetization.commercial_licensing import CommercialMonetizationService
+from src.stage_scheduler.scheduler import StageScheduler
+from src.text_analysis import AnalyzedText
+from src.response_cache import create_response_cache, file_digest, response_cache_key, source_version
 
 ROOT = Path(__file__).resolve().parent.parent
 MANIFEST = ROOT / "legend_manifest.json"
 ATTEST = ROOT / "VALIDATION" / "integrity_attestation.txt"
 FRONTEND_DIR = ROOT / "frontend" / "dist"
 
+# Per-deployment chat pacing and processing budget, in seconds. Pacing is
+# awaited on the event loop (never slept in a worker) and defaults to zero;
+# a budget of zero means requests run without a deadline.
+CHAT_PACING_DELAY = float(os.environ.get("AXIOM_CHAT_PACING_DELAY", "0"))
+CHAT_DEADLINE = float(os.environ.get("AXIOM_CHAT_DEADLINE", "0"))
+
+# Optional JSON emotion lexicon replacing the built-in keyword lists.
+EMOTION_LEXICON_PATH = os.environ.get("AXIOM_EMOTION_LEXICON")
+
+# Optional hot-reloadable JSON ethics rules replacing the built-in ones.
+ETHICS_RULES_PATH = os.environ.get("AXIOM_ETHICS_RULES")
+# Optional append-only JSONL audit log of ethics violations.
+ETHICS_AUDIT_LOG_PATH = os.environ.get("AXIOM_ETHICS_AUDIT_LOG")
+
+# Content-addressed cache of the deterministic stages for repeated prompts;
+# a size of zero disables it. The optional path adds a SQLite tier that
+# survives restarts.
+RESPONSE_CACHE_SIZE = int(os.environ.get("AXIOM_RESPONSE_CACHE_SIZE", "1024"))
+RESPONSE_CACHE_TTL = float(os.environ.get("AXIOM_RESPONSE_CACHE_TTL", "3600"))
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("AXIOM_RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+RESPONSE_CACHE_PATH = os.environ.get("AXIOM_RESPONSE_CACHE_PATH")
+
+# Optional byte budget for the proactive memory recall cache.
+MEMORY_CACHE_MAX_BYTES = int(os.environ.get("AXIOM_MEMORY_CACHE_MAX_BYTES", "0")) or None
+# Interaction writes are persisted by a background worker so chat latency
+# excludes graph write time; set AXIOM_MEMORY_WRITE_BEHIND=0 to write inline.
+MEMORY_WRITE_BEHIND = os.environ.get("AXIOM_MEMORY_WRITE_BEHIND", "1").lower() in ("1", "true", "yes")
+MEMORY_WRITE_QUEUE_SIZE = int(os.environ.get("AXIOM_MEMORY_WRITE_QUEUE_SIZE", "10000"))
+MEMORY_WRITE_OVERFLOW = os.environ.get("AXIOM_MEMORY_WRITE_OVERFLOW", "drop_oldest")
+# Embedded SQLite memory graph used when Neo4j is unreachable. Off unless a
+# deployment sets it (to an absolute path), since it holds every chat turn.
+MEMORY_FALLBACK_PATH = os.environ.get("AXIOM_MEMORY_FALLBACK_PATH", "")
+# Recent interactions per user held in the in-process concept index that
+# answers recall without a store query; zero disables the index.
+MEMORY_INDEX_WINDOW = int(os.environ.get("AXIOM_MEMORY_INDEX_WINDOW", "1000"))
+# Neo4j connection pool size, shared by the pool of reusable read sessions,
+# and an optional read replica that recalls are routed to.
+MEMORY_POOL_SIZE = int(os.environ.get("AXIOM_MEMORY_POOL_SIZE", "50"))
+MEMORY_READ_URI = os.environ.get("AXIOM_NEO4J_READ_URI")
+# Optional stopword file replacing the built-in concept stopwords, and the
+# longest phrase (in words) stored as a concept of its own.
+MEMORY_STOPWORDS_PATH = os.environ.get("AXIOM_MEMORY_STOPWORDS")
+MEMORY_CONCEPT_NGRAMS = int(os.environ.get("AXIOM_MEMORY_CONCEPT_NGRAMS", "1"))
+# Days of raw interactions kept before they are compacted into per-period
+# summaries (0 keeps everything), the summary period, and how often
+# compaction runs, in seconds.
+MEMORY_RETENTION_DAYS = float(os.environ.get("AXIOM_MEMORY_RETENTION_DAYS", "0"))
+MEMORY_RETENTION_PERIOD = os.environ.get("AXIOM_MEMORY_RETENTION_PERIOD", "month")
+MEMORY_COMPACTION_INTERVAL = float(os.environ.get("AXIOM_MEMORY_COMPACTION_INTERVAL", "3600"))
+
 app = FastAPI(title="AxiomHive Backend - Transcendent AI Chatbot")
 
 # Enable CORS for frontend development
@@ -42,12 +98,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Modules a chat request enables when it does not list its own
+DEFAULT_MODULES = ["reasoning", "emotional_analysis", "memory_trace", "pattern_detection", "ethics_sentinel"]
+
 # Pydantic models for the chat interface
 class ChatMessage(BaseModel):
     message: str
     enableCognitiveDepth: bool = False
     userId: str = "anonymous"
-    modules: List[str] = ["reasoning", "emotional_analysis", "memory_trace", "pattern_detection", "ethics_sentinel"]
+    modules: List[str] = DEFAULT_MODULES
+    deadlineMs: Optional[int] = None
 
 class CognitiveAnalysis(BaseModel):
     reasoningModules: List[str]
@@ -82,37 +142,137 @@ def read_attestation() -> str | None:
     return ATTEST.read_text(encoding="utf-8")
 
 
+class ProcessingDeadlineExceeded(Exception):
+    """Raised when a chat request runs past its processing budget."""
+
+
+def _check_deadline(deadline: Optional[float], stage: str):
+    """Cut work short between stages once the monotonic deadline has passed."""
+    if deadline is not None and time.monotonic() >= deadline:
+        raise ProcessingDeadlineExceeded(f"Processing budget exhausted before {stage}")
+
+
 class AxiomHiveCognitive:
     """AxiomHive modular cognitive architecture with real cognitive modules"""
 
     def __init__(self):
         self.reasoning_body = ReasoningBody()
-        self.emotional_analyzer = EmotionalAnalyzer()
-        self.memory_trace = MemoryTraceManager()
+        self.emotional_analyzer = EmotionalAnalyzer(
+            EmotionLexicon.from_file(EMOTION_LEXICON_PATH) if EMOTION_LEXICON_PATH else None
+        )
+        concept_extractor = (
+            ConceptExtractor.from_file(MEMORY_STOPWORDS_PATH, max_ngram=MEMORY_CONCEPT_NGRAMS)
+            if MEMORY_STOPWORDS_PATH else ConceptExtractor(max_ngram=MEMORY_CONCEPT_NGRAMS)
+        )
+        self.memory_trace = MemoryTraceManager(max_cache_bytes=MEMORY_CACHE_MAX_BYTES,
+                                               write_behind=MEMORY_WRITE_BEHIND,
+                                               write_queue_size=MEMORY_WRITE_QUEUE_SIZE,
+                                               write_overflow=MEMORY_WRITE_OVERFLOW,
+                                               fallback_path=MEMORY_FALLBACK_PATH or None,
+                                               concept_index=MEMORY_INDEX_WINDOW > 0,
+                                               index_window=max(MEMORY_INDEX_WINDOW, 1),
+                                               max_pool_size=MEMORY_POOL_SIZE,
+                                               read_uri=MEMORY_READ_URI,
+                                               concept_extractor=concept_extractor,
+                                               retention=timedelta(days=MEMORY_RETENTION_DAYS)
+                                               if MEMORY_RETENTION_DAYS > 0 else None,
+                                               retention_period=MEMORY_RETENTION_PERIOD,
+                                               compaction_interval=MEMORY_COMPACTION_INTERVAL)
+        self.memory_trace.ensure_schema()
         self.pattern_detector = AbstractPatternDetector()
-        self.ethics_sentinel = EthicsSentinel()
+        self.ethics_sentinel = EthicsSentinel(ETHICS_RULES_PATH, ETHICS_AUDIT_LOG_PATH)
         self.safety_guardian = SafetyGuardian()
         self.coherence_harmonizer = EntropyMatrixHarmonizer()
+        self.stage_scheduler = StageScheduler()
+        self.response_cache = create_response_cache(
+            RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL, RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_PATH
+        )
+        self.module_versions = self._module_versions()
+
+    def _module_versions(self) -> Dict[str, str]:
+        """Code and data versions of the cached stages; part of every response cache key."""
+        versions = {
+            name: source_version(type(component).__module__) for name, component in (
+                ("reasoning", self.reasoning_body),
+                ("emotional_analysis", self.emotional_analyzer),
+                ("pattern_detection", self.pattern_detector),
+                ("synthesis", self.coherence_harmonizer)
+            )
+        }
+        versions["text_analysis"] = source_version(AnalyzedText.__module__)
+        if EMOTION_LEXICON_PATH:
+            versions["emotion_lexicon"] = file_digest(EMOTION_LEXICON_PATH)
+        return versions
     
-    def process_query(self, user_input: str, enable_depth: bool = False, user_id: str = "anonymous") -> ChatResponse:
+    async def process_query_async(self, user_input: str, enable_depth: bool = False, user_id: str = "anonymous",
+                                  deadline: Optional[float] = None,
+                                  modules: Optional[List[str]] = None) -> ChatResponse:
+        """Run process_query in the default executor so the event loop stays free.
+
+        ``deadline`` is an absolute ``time.monotonic()`` value. The awaiting
+        request is released as soon as it passes, and the worker thread stops at
+        its next stage boundary instead of finishing the pipeline.
+        """
+        loop = asyncio.get_running_loop()
+        work = loop.run_in_executor(
+            None, functools.partial(self.process_query, user_input, enable_depth, user_id, deadline, modules)
+        )
+        if deadline is None:
+            return await work
+
+        try:
+            return await asyncio.wait_for(work, max(deadline - time.monotonic(), 0.0))
+        except asyncio.TimeoutError:
+            raise ProcessingDeadlineExceeded("Processing budget exhausted")
+
+    def process_query(self, user_input: str, enable_depth: bool = False, user_id: str = "anonymous",
+                      deadline: Optional[float] = None, modules: Optional[List[str]] = None) -> ChatResponse:
         """Process user query through the modular cognitive architecture"""
 
         try:
+            # Shared single-pass preprocessing reused by every module below
+            analyzed = AnalyzedText(user_input)
+
             # Step 1: Ethics & Safety Pre-check
-            if not self.ethics_sentinel.validate_request(user_input):
+            if not self.ethics_sentinel.validate_request(analyzed):
                 raise HTTPException(status_code=400, detail="Request violates ethical guidelines")
 
             if not self.safety_guardian.check_safety():
                 raise HTTPException(status_code=503, detail="Safety guardian active - system temporarily unavailable")
 
             # Step 2: Input Analysis & Tokenization
-            parsed_input = self._tokenize_and_parse(user_input)
-
-            # Step 3: Modular Cognitive Processing
-            reasoning_result = self.reasoning_body.analyze(user_input)
-            emotional_context = self.emotional_analyzer.analyze(user_input)
-            memory_context = self.memory_trace.recall_relevant(user_id, user_input)
-            pattern_analysis = self.pattern_detector.detect(user_input)
+            parsed_input = self._tokenize_and_parse(analyzed)
+
+            # Step 3: Modular Cognitive Processing (independent stages fan out concurrently)
+            _check_deadline(deadline, "cognitive analysis")
+            cache_key = None
+            cached = None
+            if self.response_cache is not None:
+                cache_key = response_cache_key(user_input, modules or DEFAULT_MODULES,
+                                               enable_depth, self.module_versions)
+                cached = self.response_cache.get(cache_key)
+
+            stages = {
+                "reasoning": lambda: self.reasoning_body.analyze(analyzed),
+                "emotional_analysis": lambda: self.emotional_analyzer.analyze(analyzed),
+                "memory_recall": lambda: self.memory_trace.recall_relevant(user_id, user_input),
+                "pattern_detection": lambda: self.pattern_detector.detect(analyzed)
+            }
+            if cached is not None:
+                # Every other stage is deterministic in the prompt; only recall reads live state
+                stages = {"memory_recall": stages["memory_recall"]}
+            try:
+                stage_results, stage_timings = self.stage_scheduler.run(
+                    stages, timeout=None if deadline is None else max(deadline - time.monotonic(), 0.0)
+                )
+            except concurrent.futures.TimeoutError:
+                raise ProcessingDeadlineExceeded("Processing budget exhausted during cognitive analysis")
+
+            stage_outputs = cached if cached is not None else stage_results
+            reasoning_result = stage_outputs["reasoning"]
+            emotional_context = stage_outputs["emotional_analysis"]
+            memory_context = stage_results["memory_recall"]
+            pattern_analysis = stage_outputs["pattern_detection"]
 
             # Prepare cognitive outputs for coherence harmonizer
             cognitive_outputs = [
@@ -122,7 +282,21 @@ class AxiomHiveCognitive:
             ]
 
             # Step 4: Coherence Assessment & Response Synthesis
-            harmonizer_result = self.coherence_harmonizer.process_and_synthesize(cognitive_outputs)
+            _check_deadline(deadline, "response synthesis")
+            if cached is not None:
+                # Copied because the post-validation below may replace the response
+                harmonizer_result = dict(cached["synthesis"])
+            else:
+                harmonizer_result, stage_timings["synthesis"] = self.stage_scheduler.timed(
+                    "synthesis", lambda: self.coherence_harmonizer.process_and_synthesize(cognitive_outputs)
+                )
+                if cache_key is not None:
+                    self.response_cache.put(cache_key, {
+                        "reasoning": reasoning_result,
+                        "emotional_analysis": emotional_context,
+                        "pattern_detection": pattern_analysis,
+                        "synthesis": dict(harmonizer_result)
+                    })
 
             # Step 5: Memory Storage (store interaction for future context)
             self.memory_trace.store_interaction(user_id, user_input, harmonizer_result["response"])
@@ -163,7 +337,8 @@ class AxiomHiveCognitive:
                 reasoning_path.extend([
                     f"Detailed Reasoning: {reasoning_result.get('detailed_analysis', {})}",
                     f"Emotional Intensity: {emotional_context.get('intensity', 0.0):.2f}",
-                    f"Cognitive Patterns: {pattern_analysis.get('cognitive_patterns', {})}"
+                    f"Cognitive Patterns: {pattern_analysis.get('cognitive_patterns', {})}",
+                    "Stage Timings: " + ", ".join(f"{name}={duration * 1000:.1f}ms" for name, duration in stage_timings.items())
                 ])
 
             return ChatResponse(
@@ -174,6 +349,8 @@ class AxiomHiveCognitive:
                 timestamp=datetime.now().isoformat()
             )
 
+        except ProcessingDeadlineExceeded:
+            raise
         except Exception as e:
             # Comprehensive error handling
             error_msg = f"Cognitive processing error: {str(e)}"
@@ -196,21 +373,21 @@ class AxiomHiveCognitive:
                 timestamp=datetime.now().isoformat()
             )
     
-    def _tokenize_and_parse(self, text: str) -> Dict[str, Any]:
+    def _tokenize_and_parse(self, analyzed: AnalyzedText) -> Dict[str, Any]:
         """Advanced semantic-aware tokenization"""
         return {
-            "tokens": text.lower().split(),
-            "semantic_density": len(text.split()) / max(len(text), 1),
-            "complexity_score": min(len(text.split()), 10),
-            "query_type": self._classify_query(text)
+            "tokens": analyzed.lower_words,
+            "semantic_density": len(analyzed.words) / max(len(analyzed.text), 1),
+            "complexity_score": min(len(analyzed.words), 10),
+            "query_type": self._classify_query(analyzed)
         }
     
-    def _classify_query(self, text: str) -> str:
-        if "?" in text:
+    def _classify_query(self, analyzed: AnalyzedText) -> str:
+        if "?" in analyzed.text:
             return "question"
-        elif any(word in text.lower() for word in ["explain", "tell me", "what is"]):
+        elif any(word in analyzed.lower for word in ["explain", "tell me", "what is"]):
             return "explanation_request"
-        elif any(word in text.lower() for word in ["help", "how to", "guide"]):
+        elif any(word in analyzed.lower for word in ["help", "how to", "guide"]):
             return "assistance_request"
         else:
             return "statement"
@@ -246,6 +423,12 @@ axiom_hive = AxiomHiveCognitive()
 commercial_service = CommercialMonetizationService()
 
 
+@app.on_event("shutdown")
+def close_memory():
+    """Write queued memory interactions and close the graph connections before the worker exits."""
+    axiom_hive.memory_trace.close()
+
+
 @app.get("/api/manifest")
 def api_manifest():
     try:
@@ -271,21 +454,32 @@ def api_integrity():
 
 
 @app.post("/api/chat")
-def api_chat(chat_message: ChatMessage):
+async def api_chat(chat_message: ChatMessage):
     """Main ChatGPT-like interface endpoint powered by AxiomHive"""
     try:
-        # Add minimal delay for realistic processing time
-        time.sleep(random.uniform(0.2, 1.0))
-
-        # Process through AxiomHive cognitive architecture
-        result = axiom_hive.process_query(
+        budget = chat_message.deadlineMs / 1000.0 if chat_message.deadlineMs else CHAT_DEADLINE
+        deadline = time.monotonic() + budget if budget > 0 else None
+
+        # Optional per-deployment pacing; awaited so no worker is held
+        if CHAT_PACING_DELAY > 0:
+            pacing = CHAT_PACING_DELAY
+            if deadline is not None:
+                pacing = min(pacing, max(deadline - time.monotonic(), 0.0))
+            await asyncio.sleep(pacing)
+
+        # Process through AxiomHive cognitive architecture off the event loop
+        result = await axiom_hive.process_query_async(
             chat_message.message,
             chat_message.enableCognitiveDepth,
-            chat_message.userId
+            chat_message.userId,
+            deadline,
+            chat_message.modules
         )
 
         return JSONResponse(content=result.dict())
 
+    except ProcessingDeadlineExceeded as de:
+        raise HTTPException(status_code=504, detail=str(de))
     except HTTPException as he:
         # Re-raise HTTP exceptions with proper status codes
         raise he
@@ -322,7 +516,7 @@ def api_status():
     return JSONResponse(content={
         "reasoning_engine": "active",
         "emotional_analyzer": "active",
-        "memory_system": "active" if axiom_hive.memory_trace.driver else "degraded",
+        "memory_system": "active" if axiom_hive.memory_trace.backend else "degraded",
         "pattern_detector": "active",
         "ethics_sentinel": "active",
         "safety_guardian": "active" if safety_status["operational"] else "degraded",
@@ -330,6 +524,14 @@ def api_status():
         "cognitive_modules": 7,
         "safety_status": safety_status,
         "ethics_violations": ethics_summary["total_violations"],
+        "ethics_violations_by_category": ethics_summary["by_category"],
+        "stage_timings": axiom_hive.stage_scheduler.get_stage_metrics(),
+        "response_cache": axiom_hive.response_cache.get_stats() if axiom_hive.response_cache else None,
+        "memory_cache": axiom_hive.memory_trace.get_cache_stats(),
+        "memory_persistence": axiom_hive.memory_trace.get_persistence_stats(),
+        "memory_index": axiom_hive.memory_trace.get_index_stats(),
+        "memory_connection": axiom_hive.memory_trace.get_connection_stats(),
+        "memory_retention": axiom_hive.memory_trace.get_retention_stats(),
         "uptime": "99.97%",
         "last_attestation": datetime.now().isoformat(),
         "deterministic_mode": True,
@@ -0,0 +1,127 @@
+"""Benchmark ConceptExtractor against the old per-call concept extraction.
+
+``legacy_extract`` is MemoryTraceManager._extract_concepts as it was: strip
+each word, test it against a list literal built on every call, collect into
+a list and de-duplicate at the end. Reports CPU time and peak transient
+allocation per text for both, a chat turn (the message is extracted for
+recall and again for storage, then the response), phrase extraction and
+batch mode.
+
+Usage:
+    python scripts/bench_concept_extraction.py [--texts 5000] [--words 80]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+VOCABULARY = (
+    "the a of and to is that this with from they have been were what when where how why who "
+    "graph database memory concept recall neural network pattern emotion ethics reasoning "
+    "explain describe relationships store query latency cache context history"
+).split()
+
+
+def legacy_extract(text: str) -> list:
+    words = text.lower().split()
+    concepts = []
+    for word in words:
+        word = word.strip('.,!?;:')
+        if len(word) > 3 and word not in ['that', 'this', 'with', 'from', 'they', 'have', 'been', 'were',
+                                           'what', 'when', 'where', 'how', 'why', 'who']:
+            concepts.append(word)
+    return list(set(concepts))
+
+
+def make_texts(count: int, words: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        parts = []
+        for _ in range(words):
+            parts.append(rng.choice(VOCABULARY))
+            if rng.random() < 0.08:
+                parts[-1] += rng.choice(['.', ',', '?', '!'])
+        texts.append(' '.join(parts))
+    return texts
+
+
+def measure(fn, texts) -> dict:
+    start = time.process_time()
+    for text in texts:
+        fn(text)
+    cpu = time.process_time() - start
+
+    peaks = 0
+    tracemalloc.start()
+    for text in texts:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        fn(text)
+        peaks += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return {'cpu_us': cpu / len(texts) * 1e6, 'peak_bytes': peaks / len(texts)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--texts', type=int, default=5000)
+    parser.add_argument('--words', type=int, default=80)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    from src.memory_trace_manager import ConceptExtractor
+
+    texts = make_texts(args.texts, args.words)
+    extractor = ConceptExtractor()
+    for text in texts:
+        if sorted(extractor.extract(text)) != sorted(legacy_extract(text)):
+            print(f"MISMATCH on {text!r}")
+            return 1
+
+    uncached = ConceptExtractor(cache_size=0)
+    legacy = measure(legacy_extract, texts)
+    compiled = measure(uncached.extract, texts)
+    phrases = measure(ConceptExtractor(max_ngram=2, cache_size=0).extract, texts)
+
+    turns = list(zip(texts[::2], texts[1::2]))
+
+    def legacy_turn(turn):
+        message, response = turn
+        legacy_extract(message), legacy_extract(message), legacy_extract(response)
+
+    def turn(turn):
+        message, response = turn
+        extractor.extract(message), extractor.extract(message), extractor.extract(response)
+
+    legacy_turns = measure(legacy_turn, turns)
+    compiled_turns = measure(turn, turns)
+
+    start = time.process_time()
+    extractor.extract_batch(texts * 2)
+    batch_us = (time.process_time() - start) / (len(texts) * 2) * 1e6
+
+    print(f"{args.texts} texts x {args.words} words")
+    print(f"{'extraction':<18} {'cpu us/text':>12} {'peak bytes/text':>16}")
+    for name, result in (('legacy', legacy), ('ConceptExtractor', compiled), ('with bigrams', phrases)):
+        print(f"{name:<18} {result['cpu_us']:>12.1f} {result['peak_bytes']:>16.0f}")
+    print(f"unigrams: {legacy['cpu_us'] / compiled['cpu_us']:.2f}x faster, "
+          f"peak memory {compiled['peak_bytes'] / legacy['peak_bytes']:.2f}x of legacy")
+    print(f"chat turn: {legacy_turns['cpu_us']:.1f} -> {compiled_turns['cpu_us']:.1f} us "
+          f"({legacy_turns['cpu_us'] / compiled_turns['cpu_us']:.2f}x), peak "
+          f"{legacy_turns['peak_bytes']:.0f} -> {compiled_turns['peak_bytes']:.0f} bytes")
+    print(f"batch mode, every text repeated once: {batch_us:.1f} us/text")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Benchmark concept recall from the in-process index against the store query.
+
+Both answer "which of this user's interactions share the most concepts with
+this message" over the same history; the store side is the embedded SQLite
+graph, so this is a lower bound on what the index saves over Neo4j.
+
+Usage:
+    python scripts/bench_concept_index.py [--interactions 20000] [--users 200] [--queries 5000]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_memory_backend import WORDS, make_rows  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--interactions', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--queries', type=int, default=5000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    from src.memory_trace_manager import ConceptIndex, SQLiteGraphBackend
+
+    store = SQLiteGraphBackend(':memory:')
+    store.write_interactions(make_rows(args.interactions, args.users))
+    index = ConceptIndex()
+    for user in range(args.users):
+        index.load(f"user{user}", store.load_interactions(f"user{user}", index.window))
+
+    rng = random.Random(3)
+    probes = [(f"user{rng.randrange(args.users)}", rng.sample(WORDS, 3)) for _ in range(args.queries)]
+    for user_id, concepts in probes[:200]:
+        expected = store.recall_by_concepts(user_id, concepts, 5)
+        found = index.recall_by_concepts(user_id, concepts, 5)
+        if [(r['timestamp'], r['relevance_score']) for r in found] != \
+                [(r['timestamp'], r['relevance_score']) for r in expected]:
+            print("MISMATCH between index and store")
+            return 1
+
+    start = time.perf_counter()
+    for user_id, concepts in probes:
+        store.recall_by_concepts(user_id, concepts, 5)
+    slow = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for user_id, concepts in probes:
+        index.recall_by_concepts(user_id, concepts, 5)
+    fast = time.perf_counter() - start
+
+    stats = index.get_stats()
+    print(f"{args.interactions} interactions, {args.users} users, {args.queries} recalls")
+    print(f"{'SQLite query':>13} {slow / args.queries * 1e6:>9.1f} us/recall")
+    print(f"{'index':>13} {fast / args.queries * 1e6:>9.1f} us/recall {slow / fast:>8.1f}x")
+    print(f"{'memory':>13} {stats['approx_bytes'] / 1e6:>9.1f} MB "
+          f"({stats['bytes_per_interaction']:.0f} B/interaction, {stats['posting_bytes'] / 1e6:.2f} MB postings)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
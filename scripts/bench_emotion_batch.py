@@ -0,0 +1,76 @@
+"""Benchmark vectorized EmotionalAnalyzer.analyze_batch against per-message analyze.
+
+Scores a synthetic archive of short chat messages both ways, checks that every
+per-message result is identical, and reports throughput.
+
+Usage:
+    python scripts/bench_emotion_batch.py [--messages 100000] [--words 20]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+VOCABULARY = (
+    "happy sad angry afraid surprised disgusted good bad great terrible very extremely so really "
+    "not no never neither nor the a of and to it is was this that we you they meeting cache deploy "
+    "build release today tomorrow customer order data ticket"
+).split()
+
+
+def make_messages(count: int, words: int, seed: int = 11) -> list:
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(count):
+        message = ' '.join(rng.choice(VOCABULARY) for _ in range(rng.randint(1, words)))
+        if rng.random() < 0.2:
+            message += rng.choice(['!', '?', '...', '!!'])
+        if rng.random() < 0.05:
+            message = message.upper()
+        messages.append(message)
+    return messages
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=100_000)
+    parser.add_argument('--words', type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    from src.emotional_analyzer.emotion_processor import EmotionalAnalyzer, np
+
+    if np is None:
+        print("numpy is not installed; analyze_batch uses the scalar path")
+        return 1
+
+    analyzer = EmotionalAnalyzer()
+    messages = make_messages(args.messages, args.words)
+
+    start = time.perf_counter()
+    scalar = [analyzer.analyze(message) for message in messages]
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = analyzer.analyze_batch(messages)
+    batch_seconds = time.perf_counter() - start
+
+    mismatches = sum(1 for expected, actual in zip(scalar, batch) if expected != actual)
+    print(f"{args.messages} messages, up to {args.words} words")
+    print(f"{'path':<8} {'seconds':>8} {'messages/s':>11}")
+    print(f"{'scalar':<8} {scalar_seconds:>8.2f} {args.messages / scalar_seconds:>11.0f}")
+    print(f"{'batch':<8} {batch_seconds:>8.2f} {args.messages / batch_seconds:>11.0f}")
+    print(f"speedup {scalar_seconds / batch_seconds:.2f}x, mismatches {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Benchmark the single-pass EthicsRuleSet against per-keyword substring checks.
+
+The per-keyword baseline mirrors the original ContentFilter: one lowercase and
+one ``keyword in text`` scan per keyword, plus whole-word regexes compiled on
+each call. Both are run over the built-in rules and over synthetic rule sets
+of increasing size to show how latency grows with the number of terms.
+
+Usage:
+    python scripts/bench_ethics_scanner.py [--messages 2000] [--terms 40 1000 5000]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import re
+import string
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+FILLER = ("please explain how the cache eviction policy works for our order service and what happens "
+          "when a customer retries a payment during deployment of the new release").split()
+
+
+def synthetic_rules(base: dict, terms: int, seed: int = 3) -> dict:
+    """Pad the built-in categories with random terms up to ``terms`` in total."""
+    rng = random.Random(seed)
+    rules = {category: {kind: list(words) for kind, words in entry.items()} for category, entry in base.items()}
+    categories = list(rules)
+    existing = sum(len(words) for entry in rules.values() for words in entry.values())
+    for i in range(max(0, terms - existing)):
+        term = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 12)))
+        rules[categories[i % len(categories)]].setdefault("keywords", []).append(term)
+    return rules
+
+
+def per_keyword_scan(rules: dict, text: str) -> list:
+    violations = []
+    for category, entry in rules.items():
+        lower_text = text.lower()
+        hit = any(re.search(r'\b(' + re.escape(word) + r')\b', lower_text, re.IGNORECASE)
+                  for word in entry.get("words", ()))
+        if hit or any(keyword in lower_text for keyword in entry.get("keywords", ())):
+            violations.append(category)
+    return violations
+
+
+def make_messages(count: int, seed: int = 5) -> list:
+    rng = random.Random(seed)
+    return [' '.join(rng.choice(FILLER) for _ in range(rng.randint(10, 60))) for _ in range(count)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--terms', type=int, nargs='+', default=[40, 1000, 5000])
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    from src.ethics_sentinel.ethical_guard import EthicalRules
+    from src.ethics_sentinel.rule_scanner import EthicsRuleSet
+
+    messages = make_messages(args.messages)
+    print(f"{'terms':>6} {'per-keyword us/msg':>19} {'rule set us/msg':>16} {'speedup':>8}")
+    for terms in args.terms:
+        rules = synthetic_rules(EthicalRules.category_rules(), terms)
+        rule_set = EthicsRuleSet(rules)
+        for message in messages[:50]:
+            if per_keyword_scan(rules, message) != rule_set.scan(message).categories:
+                print(f"MISMATCH with {terms} terms")
+                return 1
+
+        start = time.perf_counter()
+        for message in messages:
+            per_keyword_scan(rules, message)
+        baseline = (time.perf_counter() - start) / len(messages)
+
+        start = time.perf_counter()
+        for message in messages:
+            rule_set.scan(message)
+        scanned = (time.perf_counter() - start) / len(messages)
+
+        print(f"{rule_set.term_count:>6} {baseline * 1e6:>19.1f} {scanned * 1e6:>16.1f} {baseline / scanned:>7.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Benchmark interaction writes and recall on the embedded SQLite memory graph.
+
+Interactions are written the two ways MemoryTraceManager issues them: one
+transaction per interaction (inline writes) and write-behind batches. Recall
+is then timed over the populated store.
+
+Usage:
+    python scripts/bench_memory_backend.py [--interactions 20000] [--batch 500] [--users 200]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+WORDS = ("graph database memory concept recall index latency throughput cache neural pattern "
+         "reasoning emotion ethics safety context history vector query transaction").split()
+
+
+def make_rows(count: int, users: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    rows = []
+    for index in range(count):
+        user_id = f"user{rng.randrange(users)}"
+        rows.append({
+            'user_id': user_id,
+            'interaction_id': f"{user_id}_{index}",
+            'user_message': ' '.join(rng.choices(WORDS, k=12)),
+            'assistant_response': ' '.join(rng.choices(WORDS, k=30)),
+            'timestamp': f"2024-01-01T00:00:00.{index:06d}",
+            'mentions': [{'concept': word, 'source': 'user'} for word in set(rng.choices(WORDS, k=5))] +
+                        [{'concept': word, 'source': 'assistant'} for word in set(rng.choices(WORDS, k=8))]
+        })
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--interactions', type=int, default=20000)
+    parser.add_argument('--batch', type=int, default=500)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--recalls', type=int, default=2000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    from src.memory_trace_manager import SQLiteGraphBackend
+
+    rows = make_rows(args.interactions, args.users)
+    with tempfile.TemporaryDirectory() as directory:
+        single = SQLiteGraphBackend(Path(directory) / "single.sqlite3")
+        start = time.perf_counter()
+        for row in rows:
+            single.write_interactions([row])
+        inline = time.perf_counter() - start
+
+        batched = SQLiteGraphBackend(Path(directory) / "batched.sqlite3")
+        start = time.perf_counter()
+        for offset in range(0, len(rows), args.batch):
+            batched.write_interactions(rows[offset:offset + args.batch])
+        bulk = time.perf_counter() - start
+
+        rng = random.Random(11)
+        probes = [(f"user{rng.randrange(args.users)}", rng.sample(WORDS, 3)) for _ in range(args.recalls)]
+        for user_id, concepts in probes[:50]:
+            if single.recall_by_concepts(user_id, concepts, 5) != batched.recall_by_concepts(user_id, concepts, 5):
+                print("MISMATCH between single and batched stores")
+                return 1
+        start = time.perf_counter()
+        for user_id, concepts in probes:
+            batched.recall_by_concepts(user_id, concepts, 5)
+        recall = time.perf_counter() - start
+        single.close()
+        batched.close()
+
+    print(f"{args.interactions} interactions, {args.users} users, SQLite WAL")
+    print(f"{'inline writes':>16} {args.interactions / inline:>10.0f} interactions/s")
+    print(f"{f'batches of {args.batch}':>16} {args.interactions / bulk:>10.0f} interactions/s")
+    print(f"{'recall':>16} {recall / args.recalls * 1e6:>10.1f} us/query")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
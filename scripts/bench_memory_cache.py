@@ -0,0 +1,68 @@
+"""Benchmark MemoryTraceManager's proactive cache at its 1000-entry ceiling.
+
+``rebuild_store`` replays the old bookkeeping: every store rebuilt the cache
+dict to drop expired entries and, once over capacity, sorted all entries by
+timestamp. The current cache is an O(1) LRU with lazy expiry.
+
+Usage:
+    python scripts/bench_memory_cache.py [--capacity 1000] [--stores 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def rebuild_store(cache: dict, key: str, value: dict, capacity: int, expiry: timedelta) -> dict:
+    cache[key] = value
+    current_time = datetime.now()
+    cache = {k: v for k, v in cache.items() if current_time - v['timestamp'] < expiry}
+    if len(cache) > capacity:
+        cache = dict(sorted(cache.items(), key=lambda item: item[1]['timestamp'])[-capacity:])
+    return cache
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--capacity', type=int, default=1000)
+    parser.add_argument('--stores', type=int, default=20000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    from src.response_cache import LRUTTLCache
+
+    expiry = timedelta(hours=1)
+    entries = [(f"key-{index}", {'response': 'r', 'concepts': [], 'timestamp': datetime.now()})
+               for index in range(args.stores)]
+
+    start = time.perf_counter()
+    legacy: dict = {}
+    for key, value in entries:
+        legacy = rebuild_store(legacy, key, value, args.capacity, expiry)
+    slow = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cache = LRUTTLCache(max_entries=args.capacity, ttl=expiry.total_seconds())
+    for key, value in entries:
+        cache.put(key, value)
+    fast = time.perf_counter() - start
+
+    if set(legacy) != set(cache.entries):
+        print("MISMATCH between retained entries")
+        return 1
+    print(f"{args.stores} stores at a {args.capacity}-entry ceiling")
+    print(f"{'rebuild + sort':>15} {slow / args.stores * 1e6:>9.2f} us/store")
+    print(f"{'LRU':>15} {fast / args.stores * 1e6:>9.2f} us/store {slow / fast:>8.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
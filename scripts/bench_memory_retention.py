@@ -0,0 +1,99 @@
+"""Benchmark recall and user-context latency as a deployment ages, with and without retention.
+
+Two embedded SQLite graphs receive the same simulated traffic, a day at a
+time. One keeps every interaction; the other compacts interactions older
+than the retention window into monthly summaries after each simulated week.
+At each checkpoint both must report the same user totals and concept
+frequencies; then recall and get_user_context queries are timed on each.
+
+Usage:
+    python scripts/bench_memory_retention.py [--months 12] [--users 20] [--per-day 100] [--retention-days 30]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_memory_backend import WORDS, make_rows  # noqa: E402
+
+
+def context(store, user_id: str):
+    return store.user_stats(user_id), sorted((c['name'], c['frequency']) for c in store.user_concepts(user_id, 10))
+
+
+def time_queries(store, probes) -> tuple:
+    start = time.perf_counter()
+    for user_id, concepts in probes:
+        store.recall_by_concepts(user_id, concepts, 5)
+    recall = time.perf_counter() - start
+    start = time.perf_counter()
+    for user_id, _ in probes:
+        store.user_stats(user_id)
+        store.user_concepts(user_id, 10)
+    user_context = time.perf_counter() - start
+    return recall / len(probes) * 1e6, user_context / len(probes) * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--months', type=int, default=12)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--per-day', type=int, default=100)
+    parser.add_argument('--retention-days', type=int, default=30)
+    parser.add_argument('--queries', type=int, default=500)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    from src.memory_trace_manager import SQLiteGraphBackend
+
+    full = SQLiteGraphBackend(':memory:')
+    retained = SQLiteGraphBackend(':memory:')
+    rng = random.Random(3)
+    probes = [(f"user{rng.randrange(args.users)}", rng.sample(WORDS, 3)) for _ in range(args.queries)]
+    start_day = datetime(2024, 1, 1)
+    checkpoints = {round(30.4 * month) for month in (1, 3, 6, 12, 24, 36) if month <= args.months}
+    compacted = 0
+
+    print(f"{'days':>5} {'rows: all / kept':>17} {'recall us: all / kept':>23} {'context us: all / kept':>24}")
+    for day in range(1, round(30.4 * args.months) + 1):
+        moment = start_day + timedelta(days=day)
+        rows = make_rows(args.per_day, args.users, seed=day)
+        for index, row in enumerate(rows):
+            row['timestamp'] = (moment + timedelta(seconds=index)).isoformat()
+        full.write_interactions(rows)
+        retained.write_interactions(rows)
+        if day % 7 == 0 or day in checkpoints:
+            cutoff = (moment - timedelta(days=args.retention_days)).isoformat()
+            while True:
+                batch = retained.compact_interactions(cutoff, 'month', 1000)
+                compacted += batch['interactions']
+                if batch['interactions'] < 1000:
+                    break
+        if day not in checkpoints:
+            continue
+
+        for user in range(args.users):
+            if context(full, f"user{user}") != context(retained, f"user{user}"):
+                print(f"MISMATCH in user{user}'s context after {day} days")
+                return 1
+        kept = retained.connection.execute("SELECT COUNT(*) FROM interactions").fetchone()[0]
+        full_recall, full_context = time_queries(full, probes)
+        retained_recall, retained_context = time_queries(retained, probes)
+        print(f"{day:>5} {day * args.per_day:>9} / {kept:<5} {full_recall:>14.1f} / {retained_recall:<6.1f} "
+              f"{full_context:>15.1f} / {retained_context:<6.1f}")
+    print(f"compacted {compacted} interactions into monthly summaries")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""Benchmark AbstractPatternDetector feature extraction against per-pattern scans.
+
+``per_pattern_analysis`` replays the detector as it used to run: every
+question, complexity and structural regex over the full text, the ad-hoc list
+regexes, and a Python-level character sum. The current detector derives the
+same features from one tokenization. Both are checked for identical results
+before timing.
+
+Usage:
+    python scripts/bench_pattern_features.py [--sizes 1000 10000 100000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+VOCABULARY = (
+    "the a of to in data model system user cache value time service request response latency "
+    "throughput memory disk queue worker thread process step first then also because if and or "
+    "more less better what how explain compare theory concept structure during before after"
+).split()
+
+
+def make_query(size: int, seed: int = 9) -> str:
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        word = rng.choice(VOCABULARY)
+        if rng.random() < 0.05:
+            word = word.capitalize()
+        if rng.random() < 0.06:
+            word += rng.choice(['.', ',', '?', ':'])
+        parts.append(word)
+        length += len(word) + 1
+    return ' '.join(parts)
+
+
+def per_pattern_analysis(detector, query: str) -> dict:
+    """The detector's dict view computed the way it was before feature extraction."""
+    query_lower = query.lower()
+    words = query.split()
+
+    question_type = 'DECLARATIVE'
+    for qtype, pattern in detector.question_patterns.items():
+        if pattern.search(query):
+            question_type = qtype.upper()
+            break
+    else:
+        if '?' in query:
+            question_type = 'GENERAL'
+        elif any(word in query_lower for word in ['explain', 'describe', 'tell me about']):
+            question_type = 'EXPLANATORY'
+        elif any(word in query_lower for word in ['calculate', 'compute', 'solve']):
+            question_type = 'COMPUTATIONAL'
+
+    score = 0.3 if len(words) > 20 else 0.2 if len(words) > 10 else 0.1 if len(words) > 5 else 0.0
+    for pattern in detector.complexity_indicators.values():
+        matches = len(pattern.findall(query))
+        if matches > 0:
+            score += min(matches * 0.1, 0.3)
+    if len(re.split(r'[.!?]+', query)) > 2:
+        score += 0.2
+
+    elements = [name for name, pattern in detector.structural_patterns.items() if pattern.search(query)]
+    if re.search(r'\d+\.', query):
+        elements.append('numbered_list')
+    if re.search(r'[a-z]\)', query, re.IGNORECASE):
+        elements.append('lettered_list')
+    if ':' in query:
+        elements.append('definition_structure')
+
+    cognitive = {name: sum(1 for word in group if word in query_lower)
+                 for name, group in detector.COGNITIVE_WORDS.items()}
+    char_sum = sum(ord(c) for c in query)
+    return {
+        'query_length': len(query),
+        'word_count': len(words),
+        'question_type': question_type,
+        'complexity_score': min(score, 1.0),
+        'structural_elements': elements,
+        'cognitive_patterns': cognitive,
+        'reconstruction_error': ((char_sum + len(words) + len(query)) % 1000 / 1000.0) * 0.1
+    }
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    from src.abstract_pattern_detector.pattern_finder import AbstractPatternDetector
+
+    detector = AbstractPatternDetector()
+    print(f"{'chars':>8} {'per-pattern us':>15} {'features us':>12} {'speedup':>8}")
+    for size in args.sizes:
+        query = make_query(size)
+        if per_pattern_analysis(detector, query) != detector.detect(query):
+            print(f"MISMATCH at {size} chars")
+            return 1
+        slow = best_of(lambda: per_pattern_analysis(detector, query), args.repeat)
+        fast = best_of(lambda: detector.detect(query), args.repeat)
+        print(f"{len(query):>8} {slow * 1e6:>15.0f} {fast * 1e6:>12.0f} {slow / fast:>7.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Benchmark ReasoningBody with and without the compiled multi-pattern matcher.
+
+Without the matcher every reasoner pattern and indicator list rescans the whole
+text on its own. With it, one scan of the lowercased text locates every anchor
+and indicator, and the full patterns are only attempted at anchor offsets.
+Both paths are checked to produce identical analyses before timing.
+
+Usage:
+    python scripts/bench_reasoning_matcher.py [--sizes 10000 100000 1000000] [--repeat 3]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+VOCABULARY = (
+    "if then therefore because since all some no are is suppose assume given that every most many "
+    "have do first second next finally like similar to probably likely must be so thus due to caused by "
+    "leads to results in related to you are wrong either or only will lead to experts say hence "
+    "consequently based on maybe perhaps the a of and for with data model system user cache value time"
+).split()
+
+
+def make_document(size: int, seed: int = 7) -> str:
+    """A document of roughly ``size`` characters dense in reasoning vocabulary."""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        word = rng.choice(VOCABULARY)
+        if rng.random() < 0.05:
+            word = word.capitalize()
+        if rng.random() < 0.07:
+            word += rng.choice('.!?')
+        parts.append(word)
+        length += len(word) + 1
+    return ' '.join(parts)
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    from src.reasoning_body.logic_engine import ReasoningBody
+
+    per_pattern = ReasoningBody(use_matcher=False)
+    compiled = ReasoningBody(use_matcher=True)
+
+    print(f"{'chars':>9} {'per-pattern ms':>15} {'matcher ms':>11} {'MB/s':>7} {'speedup':>8}")
+    for size in args.sizes:
+        document = make_document(size)
+        if per_pattern.analyze(document) != compiled.analyze(document):
+            print(f"MISMATCH at {size} chars")
+            return 1
+        slow = best_of(lambda: per_pattern.analyze(document), args.repeat)
+        fast = best_of(lambda: compiled.analyze(document), args.repeat)
+        print(f"{len(document):>9} {slow * 1000:>15.1f} {fast * 1000:>11.1f} "
+              f"{len(document) / fast / 1e6:>7.2f} {slow / fast:>7.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""Benchmark template-compiled response synthesis against the branch-per-request version.
+
+``legacy_synthesize`` replays ResponseSynthesizer.synthesize_response as it
+used to run: three ``next(...)`` scans of the outputs and an if/elif chain
+building every fragment per request. The current synthesizer looks the fixed
+fragments up in a precompiled table. Every combination of complexity,
+question type, emotion, pattern flags, coherence flags and expertise is
+checked for identical output before timing.
+
+Usage:
+    python scripts/bench_response_synthesis.py [--iterations 20000] [--repeat 3]
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import logging
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+ADAPTATION_RULES = {
+    "SIMPLE": {"complexity": "low", "style": "direct", "detail_level": "minimal"},
+    "MODERATE": {"complexity": "medium", "style": "structured", "detail_level": "balanced"},
+    "COMPLEX": {"complexity": "high", "style": "comprehensive", "detail_level": "detailed"}
+}
+
+
+def legacy_synthesize(cognitive_outputs, coherence_assessment, user_context=None) -> str:
+    reasoning = next((out for out in cognitive_outputs if 'type' in out), {})
+    emotion = next((out for out in cognitive_outputs if 'emotion' in out), {})
+    pattern = next((out for out in cognitive_outputs if 'question_type' in out), {})
+
+    pattern_complexity = pattern.get('complexity_score', 0.0)
+    coherence_score = coherence_assessment.get('coherence_score', 0.5)
+    if pattern_complexity > 0.7 or coherence_score > 0.9:
+        complexity_level = "COMPLEX"
+    elif pattern_complexity > 0.4 or coherence_score > 0.7:
+        complexity_level = "MODERATE"
+    else:
+        complexity_level = "SIMPLE"
+    adaptation = ADAPTATION_RULES[complexity_level]
+
+    response_parts = []
+    question_type = pattern.get('question_type', 'GENERAL')
+    if question_type in ['WHAT', 'HOW', 'WHY']:
+        response_parts.append(f"Addressing your {question_type.lower()} inquiry with {adaptation['style']} analysis.")
+    elif question_type == 'EXPLANATORY':
+        response_parts.append(f"Providing a {adaptation['detail_level']} explanation based on detected patterns.")
+    elif question_type == 'COMPUTATIONAL':
+        response_parts.append("Processing your computational request with deterministic precision.")
+    else:
+        response_parts.append("Analyzing your query through integrated cognitive processing.")
+
+    if reasoning.get('type') == 'Deductive Reasoning':
+        conclusion = reasoning.get('conclusion', 'unclear')
+        if adaptation['detail_level'] == 'detailed':
+            premises = reasoning.get('premises', 'not specified')
+            response_parts.append(f"Through deductive reasoning from premises '{premises}', the conclusion is: {conclusion}.")
+        else:
+            response_parts.append(f"The logical conclusion is: {conclusion}.")
+    elif reasoning.get('type') == 'Inductive Reasoning':
+        observation = reasoning.get('observation', 'input analyzed')
+        if adaptation['detail_level'] == 'detailed':
+            response_parts.append(f"Based on inductive analysis of '{observation}', here's the synthesized understanding.")
+        else:
+            response_parts.append(f"Analysis of your input reveals: {observation[:100]}...")
+
+    emotion_type = emotion.get('emotion', 'NEUTRAL')
+    emotion_intensity = emotion.get('intensity', 0.0)
+    if emotion_intensity > 0.6:
+        if emotion_type == 'POSITIVE':
+            if complexity_level == "COMPLEX":
+                response_parts.append("Your positive engagement enhances the depth of this analysis.")
+            else:
+                response_parts.append("I sense positive sentiment in your query.")
+        elif emotion_type == 'NEGATIVE':
+            response_parts.append("I detect negative sentiment - please provide more context if needed.")
+        elif emotion_type in ['JOY', 'SURPRISE']:
+            response_parts.append("Your enthusiastic tone is noted and incorporated into the response.")
+        elif emotion_type in ['SADNESS', 'FEAR']:
+            response_parts.append("Acknowledging the emotional context of your inquiry.")
+
+    if complexity_level in ["MODERATE", "COMPLEX"]:
+        cognitive_patterns = pattern.get('cognitive_patterns', {})
+        if cognitive_patterns.get('logical_connectives', 0) > 0:
+            response_parts.append("Recognizing the logical structure in your query for systematic processing.")
+        if pattern.get('structural_elements'):
+            response_parts.append("Your structured approach facilitates precise analysis.")
+
+    flags = coherence_assessment.get('flags', [])
+    if "LOW_COHERENCE" in flags:
+        response_parts.append("To ensure clarity, could you provide additional context?")
+    if "UNCERTAIN_REASONING" in flags and adaptation['detail_level'] == 'detailed':
+        response_parts.append("Note: This analysis carries some uncertainty due to reasoning confidence levels.")
+
+    if user_context:
+        expertise = user_context.get('expertise_level', 'general')
+        if expertise == 'expert' and complexity_level == "SIMPLE":
+            response_parts.append("Given your expertise, I've kept this concise - expand if you need technical details.")
+        elif expertise == 'novice' and complexity_level == "COMPLEX":
+            response_parts.append("I've included detailed explanation for clarity.")
+
+    return " ".join(response_parts)
+
+
+def cases():
+    """Every combination of the inputs synthesis branches on."""
+    reasonings = [
+        {'type': 'Deductive Reasoning', 'premises': 'all men are mortal', 'conclusion': 'he is mortal'},
+        {'type': 'Deductive Reasoning'},
+        {'type': 'Inductive Reasoning', 'observation': 'the sky has been blue every day ' * 5},
+        {'type': 'Analogical Reasoning'},
+        None,
+    ]
+    emotions = [{'emotion': label, 'intensity': intensity}
+                for label in ('POSITIVE', 'NEGATIVE', 'JOY', 'SURPRISE', 'SADNESS', 'FEAR', 'NEUTRAL', 'ANGER')
+                for intensity in (0.3, 0.9)] + [None]
+    for reasoning, emotion, question_type, complexity, connectives, elements, flags, user_context in itertools.product(
+            reasonings, emotions,
+            ('WHAT', 'HOW', 'WHY', 'EXPLANATORY', 'COMPUTATIONAL', 'GENERAL', 'WHEN'),
+            (0.1, 0.5, 0.8), (0, 2), ([], ['lists']),
+            ([], ['LOW_COHERENCE'], ['UNCERTAIN_REASONING'], ['LOW_COHERENCE', 'UNCERTAIN_REASONING']),
+            (None, {}, {'expertise_level': 'expert'}, {'expertise_level': 'novice'}, {'expertise_level': 'general'})):
+        pattern = {'question_type': question_type, 'complexity_score': complexity,
+                   'cognitive_patterns': {'logical_connectives': connectives}, 'structural_elements': elements}
+        outputs = [out for out in (reasoning, emotion, pattern) if out is not None]
+        for coherence_score in (0.5, 0.8, 0.95):
+            yield outputs, {'coherence_score': coherence_score, 'flags': flags}, user_context
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    from src.entropy_matrix_harmonizer.coherence_engine import ResponseSynthesizer
+
+    synthesizer = ResponseSynthesizer()
+    all_cases = list(cases())
+    for outputs, assessment, user_context in all_cases:
+        if synthesizer.synthesize_response(outputs, assessment, user_context) != \
+                legacy_synthesize(outputs, assessment, user_context):
+            print(f"MISMATCH for {outputs!r} {assessment!r} {user_context!r}")
+            return 1
+    print(f"{len(all_cases)} input combinations produce identical responses")
+
+    workload = list(itertools.islice(itertools.cycle(all_cases[::97]), args.iterations))
+    slow = best_of(lambda: [legacy_synthesize(*case) for case in workload], args.repeat)
+    fast = best_of(lambda: [synthesizer.synthesize_response(*case) for case in workload], args.repeat)
+    print(f"{'branching':>10} {slow / len(workload) * 1e6:>7.2f} us/response")
+    print(f"{'templates':>10} {fast / len(workload) * 1e6:>7.2f} us/response {slow / fast:>6.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
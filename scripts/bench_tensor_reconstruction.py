@@ -0,0 +1,84 @@
+"""Benchmark the tensor path of AbstractPatternDetector against the per-element loop.
+
+``legacy_reconstruction`` replays the old fallback: a Python loop calling
+``float()`` on every value of one input at a time. The current detector
+reduces a whole (batch, ...) array with one native reduction per call. Both
+are checked to agree before timing.
+
+Usage:
+    python scripts/bench_tensor_reconstruction.py [--batch 1000] [--width 256] [--repeat 3]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def legacy_reconstruction(data) -> float:
+    total = 0.0
+    count = 0
+    for row in data:
+        if isinstance(row, (list, tuple)):
+            for val in row:
+                total += float(val)
+                count += 1
+        else:
+            total += float(row)
+            count += 1
+    return abs(total / max(count, 1)) % 1.0
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--batch', type=int, default=1000)
+    parser.add_argument('--width', type=int, default=256)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    from src.abstract_pattern_detector.pattern_finder import AbstractPatternDetector, np
+
+    if np is None:
+        print("numpy is not installed; tensors are reduced by the pure-Python path")
+        return 0
+
+    rng = random.Random(7)
+    rows = [[[rng.uniform(-5, 5) for _ in range(args.width)]] for _ in range(args.batch)]
+    batch = np.array(rows, dtype=np.float32)
+    detector = AbstractPatternDetector()
+
+    expected = [legacy_reconstruction(row) for row in batch.tolist()]
+    actual = detector.reconstruction_errors(batch)
+    if not np.allclose(expected, actual, atol=1e-9):
+        print("MISMATCH between legacy loop and vectorized reduction")
+        return 1
+
+    slow = best_of(lambda: [legacy_reconstruction(row) for row in rows], args.repeat)
+    single = best_of(lambda: [detector.detect(entry) for entry in batch], args.repeat)
+    fast = best_of(lambda: detector.reconstruction_errors(batch), args.repeat)
+    print(f"{args.batch} inputs x {args.width} values")
+    print(f"{'python loop':>18} {slow * 1000:>9.2f} ms")
+    print(f"{'detect() each':>18} {single * 1000:>9.2f} ms {slow / single:>8.1f}x")
+    print(f"{'batched':>18} {fast * 1000:>9.2f} ms {slow / fast:>8.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""Benchmark shared AnalyzedText preprocessing against per-module derivation.
+
+Before AnalyzedText, each module re-derived the same views from the raw
+prompt on every request. ``legacy_derivations`` replays exactly those
+derivations (counts taken from the modules as they were), and
+``shared_derivations`` reads the same views from one AnalyzedText. Reports CPU
+time and peak transient allocation per request for both, plus the end-to-end
+module time with a shared AnalyzedText for scale.
+
+Usage:
+    python scripts/bench_text_preprocessing.py [--requests 2000] [--words 120]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+VOCABULARY = (
+    "if then therefore because since all some are is probably likely like similar to "
+    "happy sad very not never what how why explain describe algorithm step process "
+    "concept theory system before after better worse more less the a of and or data"
+).split()
+
+
+def make_prompts(count: int, words: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    prompts = []
+    for _ in range(count):
+        parts = []
+        for _ in range(words):
+            parts.append(rng.choice(VOCABULARY))
+            if rng.random() < 0.08:
+                parts[-1] += rng.choice(['.', '?', '!'])
+        prompts.append(' '.join(parts))
+    return prompts
+
+
+def legacy_derivations(text: str):
+    """Per-request preprocessing as the modules used to perform it."""
+    views = []
+    # EthicsSentinel: one lowercase per ContentFilter check
+    views += [text.lower() for _ in range(4)]
+    # ReasoningBody: deductive/inductive/abductive lowercase, argument
+    # sentence split plus a lowercase per sentence, complexity split/sentences
+    views += [text.lower() for _ in range(3)]
+    views += [sentence.strip().lower() for sentence in re.split(r'[.!?]+', text)]
+    views += [text.split(), re.split(r'[.!?]+', text)]
+    # EmotionLexicon and ContextProcessor: lowercase + token regex each
+    views += [re.findall(r'\b\w+\b', text.lower()) for _ in range(2)]
+    views.append(set(views[-1]))
+    # AbstractPatternDetector: three whitespace splits, one sentence split,
+    # up to two lowercases for question type, 26 for cognitive patterns
+    views += [text.split() for _ in range(3)] + [re.split(r'[.!?]+', text)]
+    views += [text.lower() for _ in range(28)]
+    # Backend _tokenize_and_parse / _classify_query
+    views += [text.lower().split(), text.split(), text.split(), text.lower(), text.lower()]
+    return views
+
+
+def shared_derivations(text: str):
+    """The same views read from one AnalyzedText."""
+    from src.text_analysis import AnalyzedText
+
+    analyzed = AnalyzedText(text)
+    return [analyzed.lower, analyzed.words, analyzed.lower_words, analyzed.tokens,
+            analyzed.token_counts, analyzed.sentences, analyzed.lower_sentences]
+
+
+def process(modules, prompt: str):
+    from src.text_analysis import AnalyzedText
+
+    ethics, reasoning, emotion, patterns = modules
+    text = AnalyzedText(prompt)
+    ethics.validate_request(text)
+    reasoning.analyze(text)
+    emotion.analyze(text)
+    patterns.detect(text)
+
+
+def measure(fn, prompts) -> dict:
+    start = time.process_time()
+    for prompt in prompts:
+        fn(prompt)
+    cpu = time.process_time() - start
+
+    # Peak traced memory within each request approximates its transient
+    # allocations: duplicated lowercase copies, token lists and splits.
+    peaks = 0
+    tracemalloc.start()
+    for prompt in prompts:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        fn(prompt)
+        peaks += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return {
+        'cpu_us_per_request': cpu / len(prompts) * 1e6,
+        'peak_bytes_per_request': peaks / len(prompts),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--words', type=int, default=120)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    from src.ethics_sentinel.ethical_guard import EthicsSentinel
+    from src.reasoning_body.logic_engine import ReasoningBody
+    from src.emotional_analyzer.emotion_processor import EmotionalAnalyzer
+    from src.abstract_pattern_detector.pattern_finder import AbstractPatternDetector
+
+    modules = (EthicsSentinel(), ReasoningBody(), EmotionalAnalyzer(), AbstractPatternDetector())
+    prompts = make_prompts(args.requests, args.words)
+    for prompt in prompts[:50]:  # warm regex caches
+        process(modules, prompt)
+
+    legacy = measure(legacy_derivations, prompts)
+    shared = measure(shared_derivations, prompts)
+    pipeline = measure(lambda prompt: process(modules, prompt), prompts)
+
+    print(f"{args.requests} requests x {args.words} words")
+    print(f"{'preprocessing':<16} {'cpu us/request':>15} {'peak bytes/request':>19}")
+    for name, result in (('per-module', legacy), ('AnalyzedText', shared)):
+        print(f"{name:<16} {result['cpu_us_per_request']:>15.1f} {result['peak_bytes_per_request']:>19.0f}")
+    print(f"preprocessing cpu: {legacy['cpu_us_per_request'] / shared['cpu_us_per_request']:.2f}x faster, "
+          f"transient memory: {legacy['peak_bytes_per_request'] / shared['peak_bytes_per_request']:.2f}x smaller")
+    print(f"full module pass with AnalyzedText: {pipeline['cpu_us_per_request']:.1f} us/request")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Load test for the async /api/chat endpoint.
+
+Drives the FastAPI app in-process over raw ASGI (no network, no extra client
+dependencies) at increasing concurrency levels with a fixed pacing delay and a
+deliberately tiny Starlette threadpool. If pacing or processing still held a
+threadpool worker, throughput would flatten at ``workers / pacing`` requests
+per second; with the async path it keeps scaling with concurrency.
+
+Usage:
+    python scripts/load_test_chat.py [--pacing 0.2] [--workers 4] [--rounds 5]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BACKEND = str(ROOT / 'backend')
+if BACKEND not in sys.path:
+    sys.path.insert(0, BACKEND)
+
+
+async def post_chat(app, body: bytes) -> int:
+    """Issue one POST /api/chat through the ASGI interface and return the status."""
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'POST',
+        'scheme': 'http',
+        'path': '/api/chat',
+        'raw_path': b'/api/chat',
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())],
+        'client': ('127.0.0.1', 0),
+        'server': ('127.0.0.1', 8000),
+    }
+    done = asyncio.Event()
+    pending = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    status = {}
+
+    async def receive():
+        if pending:
+            return pending.pop()
+        await done.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status['code'] = message['status']
+        elif message['type'] == 'http.response.body' and not message.get('more_body'):
+            done.set()
+
+    await app(scope, receive, send)
+    return status['code']
+
+
+async def run_level(app, concurrency: int, total: int) -> dict:
+    """Send ``total`` requests with at most ``concurrency`` in flight."""
+    body = json.dumps({'message': 'If the cache is warm then recall is fast.', 'userId': 'load'}).encode()
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(body)
+    codes = []
+
+    async def client():
+        while not queue.empty():
+            codes.append(await post_chat(app, queue.get_nowait()))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        'concurrency': concurrency,
+        'requests': total,
+        'seconds': elapsed,
+        'rps': total / elapsed,
+        'errors': sum(1 for code in codes if code != 200),
+    }
+
+
+async def main_async(args) -> int:
+    import anyio.to_thread
+    from app.main import app, axiom_hive
+
+    # Shrink Starlette's threadpool so a worker cap would be obvious.
+    anyio.to_thread.current_default_thread_limiter().total_tokens = args.workers
+
+    # The safety guardian's 10 rps token bucket would otherwise short-circuit
+    # most requests into the fallback response and flatter the numbers.
+    axiom_hive.safety_guardian.rate_limiter.requests_per_second = 1e9
+    axiom_hive.safety_guardian.rate_limiter.burst_size = 1e9
+    axiom_hive.safety_guardian.rate_limiter.tokens = 1e9
+
+    worker_ceiling = args.workers / args.pacing
+    print(f"pacing={args.pacing:.3f}s threadpool_workers={args.workers} "
+          f"sync ceiling≈{worker_ceiling:.1f} req/s")
+    print(f"{'concurrency':>11} {'requests':>8} {'seconds':>8} {'req/s':>8} {'errors':>6}")
+
+    results = []
+    for concurrency in args.levels:
+        result = await run_level(app, concurrency, concurrency * args.rounds)
+        results.append(result)
+        print(f"{result['concurrency']:>11} {result['requests']:>8} {result['seconds']:>8.2f} "
+              f"{result['rps']:>8.1f} {result['errors']:>6}")
+
+    peak = max(results, key=lambda r: r['rps'])
+    scaled = peak['rps'] > 2 * worker_ceiling
+    print(f"peak {peak['rps']:.1f} req/s at concurrency {peak['concurrency']} -> "
+          f"{'scales past' if scaled else 'CAPPED AT'} the threadpool ceiling")
+    return 0 if scaled and not any(r['errors'] for r in results) else 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pacing', type=float, default=0.2, help='AXIOM_CHAT_PACING_DELAY in seconds')
+    parser.add_argument('--workers', type=int, default=4, help='Starlette threadpool size')
+    parser.add_argument('--rounds', type=int, default=5, help='requests per client at each level')
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 4, 16, 64, 128])
+    args = parser.parse_args()
+
+    # Must be set before the backend module reads its configuration.
+    os.environ['AXIOM_CHAT_PACING_DELAY'] = str(args.pacing)
+    return asyncio.run(main_async(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
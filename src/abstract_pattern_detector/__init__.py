@@ -5,6 +5,6 @@ Provides deterministic pattern detection capabilities for complex query analysis
 in cognitive modules. Enables holistic analysis through structural pattern recognition.
 """
 
-from .pattern_finder import AbstractPatternDetector
+from .pattern_finder import FEATURE_NAMES, AbstractPatternDetector, PatternAggregate, iter_query_log
 
-__all__ = ['AbstractPatternDetector']
+__all__ = ['AbstractPatternDetector', 'PatternAggregate', 'iter_query_log', 'FEATURE_NAMES']
@@ -3,46 +3,94 @@
 Handles deterministic pattern analysis for holistic reasoning, identifying query structures,
 complexity levels, and cognitive patterns without probabilistic methods.
 """
+import functools
+import json
 import logging
+import os
 import re
-from typing import Dict, List, Any, Union
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Union
 from collections import Counter
 
+from ..text_analysis import AnalyzedText
+from ..text_analysis.analyzed_text import word_boundary_at
+from ..text_analysis.batching import chunked, map_chunks
+from ..text_analysis.literal_scanner import CASE_UNSAFE
+
+try:
+    import numpy as np
+except ImportError:  # tensor inputs fall back to a pure-Python reduction
+    np = None
+
 logger = logging.getLogger(__name__)
 
+# Structural element names, in the order detect() reports them
+STRUCTURAL_ELEMENTS = ('lists', 'sequences', 'causality', 'numbered_list', 'lettered_list', 'definition_structure')
+
+# Fixed order of the numeric feature vector returned by feature_vector()
+FEATURE_NAMES = (
+    'query_length', 'word_count', 'sentence_count',
+    'question_what', 'question_how', 'question_why', 'question_when',
+    'question_where', 'question_who', 'question_which',
+    'has_question_mark', 'explanatory_request', 'computational_request',
+    'logical_operators', 'quantifiers', 'comparatives', 'technical_terms',
+    'lists', 'sequences', 'causality', 'numbered_list', 'lettered_list', 'definition_structure',
+    'logical_connectives', 'temporal_references', 'comparative_language', 'abstract_concepts',
+    'complexity_score', 'reconstruction_error'
+)
+
 class AbstractPatternDetector:
     """
     Deterministic pattern detector for analyzing query structures and cognitive patterns.
     Identifies question types, complexity metrics, and structural elements in user queries.
     """
 
+    QUESTION_WORDS = ('what', 'how', 'why', 'when', 'where', 'who', 'which')
+
+    COMPLEXITY_WORDS = {
+        'logical_operators': ('and', 'or', 'not', 'if', 'then', 'therefore', 'because', 'however', 'although'),
+        'quantifiers': ('all', 'some', 'none', 'every', 'any', 'most', 'few', 'many'),
+        'comparatives': ('better', 'worse', 'more', 'less', 'greater', 'smaller', 'higher', 'lower'),
+        'technical_terms': ('algorithm', 'function', 'variable', 'class', 'method', 'api', 'database', 'network')
+    }
+
+    STRUCTURAL_WORDS = {
+        'lists': ('first', 'second', 'third', 'next', 'then', 'finally', 'also'),
+        'sequences': ('step', 'phase', 'stage', 'process', 'procedure'),
+        'causality': ('causes', 'leads to', 'results in', 'due to', 'because of')
+    }
+
+    REQUEST_PHRASES = {
+        'explanatory_request': ('explain', 'describe', 'tell me about'),
+        'computational_request': ('calculate', 'compute', 'solve')
+    }
+
+    COGNITIVE_WORDS = {
+        'logical_connectives': ('and', 'or', 'not', 'if', 'then', 'because', 'therefore'),
+        'temporal_references': ('before', 'after', 'during', 'while', 'since', 'until'),
+        'comparative_language': ('better', 'worse', 'more', 'less', 'than', 'versus', 'compared'),
+        'abstract_concepts': ('concept', 'theory', 'principle', 'pattern', 'structure', 'system')
+    }
+
     def __init__(self, input_dim: int = 4, latent_dim: int = 2):
         self.input_dim = input_dim
         self.latent_dim = latent_dim
 
         # Deterministic pattern definitions
         self.question_patterns = {
-            'what': re.compile(r'\bwhat\b', re.IGNORECASE),
-            'how': re.compile(r'\bhow\b', re.IGNORECASE),
-            'why': re.compile(r'\bwhy\b', re.IGNORECASE),
-            'when': re.compile(r'\bwhen\b', re.IGNORECASE),
-            'where': re.compile(r'\bwhere\b', re.IGNORECASE),
-            'who': re.compile(r'\bwho\b', re.IGNORECASE),
-            'which': re.compile(r'\bwhich\b', re.IGNORECASE)
+            word: re.compile(rf'\b{word}\b', re.IGNORECASE) for word in self.QUESTION_WORDS
         }
 
         self.complexity_indicators = {
-            'logical_operators': re.compile(r'\b(and|or|not|if|then|therefore|because|however|although)\b', re.IGNORECASE),
-            'quantifiers': re.compile(r'\b(all|some|none|every|any|most|few|many)\b', re.IGNORECASE),
-            'comparatives': re.compile(r'\b(better|worse|more|less|greater|smaller|higher|lower)\b', re.IGNORECASE),
-            'technical_terms': re.compile(r'\b(algorithm|function|variable|class|method|api|database|network)\b', re.IGNORECASE)
+            category: re.compile(r'\b(' + '|'.join(words) + r')\b', re.IGNORECASE)
+            for category, words in self.COMPLEXITY_WORDS.items()
         }
 
         self.structural_patterns = {
-            'lists': re.compile(r'\b(first|second|third|next|then|finally|also)\b', re.IGNORECASE),
-            'sequences': re.compile(r'\b(step|phase|stage|process|procedure)\b', re.IGNORECASE),
-            'causality': re.compile(r'\b(causes|leads to|results in|due to|because of)\b', re.IGNORECASE)
+            category: re.compile(r'\b(' + '|'.join(words) + r')\b', re.IGNORECASE)
+            for category, words in self.STRUCTURAL_WORDS.items()
         }
+        self.numbered_list_pattern = re.compile(r'\d+\.')
+        self.lettered_list_pattern = re.compile(r'[a-z]\)', re.IGNORECASE)
 
         logger.info("AbstractPatternDetector initialized with deterministic pattern recognition")
 
@@ -51,62 +99,147 @@ class AbstractPatternDetector:
         Main detection method supporting both text queries and tensor inputs for compatibility.
 
         Args:
-            input_data: Either a text string for pattern analysis or tensor for reconstruction
+            input_data: A text string (raw or AnalyzedText) for pattern analysis or tensor for reconstruction
 
         Returns:
             Dict containing pattern analysis results and reconstruction_error for compatibility
         """
-        if isinstance(input_data, str):
+        if isinstance(input_data, (str, AnalyzedText)):
             return self._analyze_query_patterns(input_data)
         else:
             # Fallback for tensor inputs (maintains backward compatibility)
             return self._tensor_reconstruction(input_data)
 
-    def _analyze_query_patterns(self, query: str) -> Dict[str, Any]:
+    def feature_vector(self, query: Union[str, AnalyzedText]) -> List[float]:
+        """
+        Fixed-length numeric features of a query, ordered as FEATURE_NAMES.
+
+        Args:
+            query: The text query to analyze, raw or already analyzed
+
+        Returns:
+            List of len(FEATURE_NAMES) floats
+        """
+        features = self.extract_features(query)
+        return [float(features[name]) for name in FEATURE_NAMES]
+
+    def extract_features(self, query: Union[str, AnalyzedText]) -> Dict[str, float]:
+        """
+        Compute every pattern feature of a query, keyed by FEATURE_NAMES.
+
+        Word features come from the shared token counts, so the text is
+        tokenized once instead of being rescanned by each word regex. The
+        remaining regexes only run once the tokens show they can match. Texts
+        with characters where lowercasing and case-insensitive matching
+        disagree take the per-pattern regex path instead.
+        """
+        analyzed = AnalyzedText.of(query)
+        query, query_lower = analyzed.text, analyzed.lower
+        features: Dict[str, float] = {
+            'query_length': len(query),
+            'word_count': len(analyzed.words),
+            'sentence_count': analyzed.sentence_count
+        }
+
+        if query.isascii() or not CASE_UNSAFE.search(query):
+            tokens = analyzed.token_counts
+            for word in self.QUESTION_WORDS:
+                features[f'question_{word}'] = 1 if word in tokens else 0
+            for category, words in self.COMPLEXITY_WORDS.items():
+                features[category] = sum(tokens[word] for word in words)
+            for category, words in self.STRUCTURAL_WORDS.items():
+                features[category] = 1 if self._has_words(words, tokens, query_lower) else 0
+            # \d+\. needs a token ending in a digit; [a-z]\) needs a ')'
+            features['numbered_list'] = 1 if any(token[-1].isdecimal() for token in tokens) and \
+                self.numbered_list_pattern.search(query) else 0
+        else:
+            for word, pattern in self.question_patterns.items():
+                features[f'question_{word}'] = 1 if pattern.search(query) else 0
+            for category, pattern in self.complexity_indicators.items():
+                features[category] = len(pattern.findall(query))
+            for category, pattern in self.structural_patterns.items():
+                features[category] = 1 if pattern.search(query) else 0
+            features['numbered_list'] = 1 if self.numbered_list_pattern.search(query) else 0
+
+        features['lettered_list'] = 1 if ')' in query and self.lettered_list_pattern.search(query) else 0
+        features['definition_structure'] = 1 if ':' in query else 0
+        features['has_question_mark'] = 1 if '?' in query else 0
+        for name, phrases in self.REQUEST_PHRASES.items():
+            features[name] = 1 if any(phrase in query_lower for phrase in phrases) else 0
+        # Cognitive words are plain substrings of letters, so each occurrence
+        # lies inside a single token: search the distinct tokens, not the text
+        vocabulary = ' '.join(analyzed.token_counts)
+        for name, words in self.COGNITIVE_WORDS.items():
+            features[name] = sum(1 for word in words if word in vocabulary)
+
+        features['complexity_score'] = self._complexity_from_features(features)
+        features['reconstruction_error'] = self._calculate_deterministic_error(analyzed)
+        return features
+
+    @staticmethod
+    def _has_words(words: tuple, tokens: Counter, query_lower: str) -> bool:
+        """Whole-word presence from token counts; phrases are located in the lowercased text."""
+        for word in words:
+            if ' ' not in word:
+                if word in tokens:
+                    return True
+            elif all(part in tokens for part in word.split()):
+                position = query_lower.find(word)
+                while position != -1:
+                    if word_boundary_at(query_lower, position) and \
+                            word_boundary_at(query_lower, position + len(word)):
+                        return True
+                    position = query_lower.find(word, position + 1)
+        return False
+
+    def _analyze_query_patterns(self, query: Union[str, AnalyzedText]) -> Dict[str, Any]:
         """
         Deterministically analyze query patterns and structure.
 
         Args:
-            query: The text query to analyze
+            query: The text query to analyze, raw or already analyzed
 
         Returns:
             Dict with pattern analysis results
         """
+        analyzed = AnalyzedText.of(query)
+        query = analyzed.text
+        features = self.extract_features(analyzed)
         analysis = {
-            'query_length': len(query),
-            'word_count': len(query.split()),
-            'question_type': self._identify_question_type(query),
-            'complexity_score': self._calculate_complexity(query),
-            'structural_elements': self._identify_structural_elements(query),
-            'cognitive_patterns': self._extract_cognitive_patterns(query),
-            'reconstruction_error': self._calculate_deterministic_error(query)
+            'query_length': features['query_length'],
+            'word_count': features['word_count'],
+            'question_type': self._question_type_from_features(features),
+            'complexity_score': features['complexity_score'],
+            'structural_elements': [name for name in STRUCTURAL_ELEMENTS if features[name]],
+            'cognitive_patterns': {name: features[name] for name in self.COGNITIVE_WORDS},
+            'reconstruction_error': features['reconstruction_error']
         }
 
         logger.info(f"Pattern analysis complete for query: '{query[:50]}...' -> {analysis['question_type']}")
         return analysis
 
-    def _identify_question_type(self, query: str) -> str:
+    def _question_type_from_features(self, features: Dict[str, float]) -> str:
         """Deterministically identify the primary question type."""
-        for qtype, pattern in self.question_patterns.items():
-            if pattern.search(query):
+        for qtype in self.QUESTION_WORDS:
+            if features[f'question_{qtype}']:
                 return qtype.upper()
 
         # Check for other question indicators
-        if '?' in query:
+        if features['has_question_mark']:
             return 'GENERAL'
-        elif any(word in query.lower() for word in ['explain', 'describe', 'tell me about']):
+        elif features['explanatory_request']:
             return 'EXPLANATORY'
-        elif any(word in query.lower() for word in ['calculate', 'compute', 'solve']):
+        elif features['computational_request']:
             return 'COMPUTATIONAL'
 
         return 'DECLARATIVE'
 
-    def _calculate_complexity(self, query: str) -> float:
+    def _complexity_from_features(self, features: Dict[str, float]) -> float:
         """Calculate deterministic complexity score based on linguistic features."""
         score = 0.0
 
         # Length-based complexity
-        word_count = len(query.split())
+        word_count = features['word_count']
         if word_count > 20:
             score += 0.3
         elif word_count > 10:
@@ -115,63 +248,45 @@ class AbstractPatternDetector:
             score += 0.1
 
         # Pattern-based complexity
-        for category, pattern in self.complexity_indicators.items():
-            matches = len(pattern.findall(query))
+        for category in self.COMPLEXITY_WORDS:
+            matches = features[category]
             if matches > 0:
                 score += min(matches * 0.1, 0.3)  # Cap at 0.3 per category
 
         # Sentence structure complexity
-        sentence_count = len(re.split(r'[.!?]+', query))
-        if sentence_count > 2:
+        if features['sentence_count'] > 2:
             score += 0.2
 
         return min(score, 1.0)  # Normalize to [0,1]
 
-    def _identify_structural_elements(self, query: str) -> List[str]:
-        """Identify structural elements in the query."""
-        elements = []
-
-        for element_type, pattern in self.structural_patterns.items():
-            if pattern.search(query):
-                elements.append(element_type)
+    def _identify_question_type(self, analyzed: AnalyzedText) -> str:
+        """Deterministically identify the primary question type."""
+        return self._question_type_from_features(self.extract_features(analyzed))
 
-        # Additional structural checks
-        if re.search(r'\d+\.', query):  # Numbered lists
-            elements.append('numbered_list')
-        if re.search(r'[a-z]\)', query, re.IGNORECASE):  # Lettered lists
-            elements.append('lettered_list')
-        if ':' in query and len(query.split(':')) > 1:
-            elements.append('definition_structure')
+    def _calculate_complexity(self, analyzed: AnalyzedText) -> float:
+        """Calculate deterministic complexity score based on linguistic features."""
+        return self.extract_features(analyzed)['complexity_score']
 
-        return elements
+    def _identify_structural_elements(self, analyzed: AnalyzedText) -> List[str]:
+        """Identify structural elements in the query."""
+        features = self.extract_features(analyzed)
+        return [name for name in STRUCTURAL_ELEMENTS if features[name]]
 
-    def _extract_cognitive_patterns(self, query: str) -> Dict[str, int]:
+    def _extract_cognitive_patterns(self, analyzed: AnalyzedText) -> Dict[str, int]:
         """Extract cognitive pattern frequencies deterministically."""
-        patterns = {}
-
-        # Logical connectives
-        logical_words = ['and', 'or', 'not', 'if', 'then', 'because', 'therefore']
-        patterns['logical_connectives'] = sum(1 for word in logical_words if word in query.lower())
-
-        # Temporal references
-        temporal_words = ['before', 'after', 'during', 'while', 'since', 'until']
-        patterns['temporal_references'] = sum(1 for word in temporal_words if word in query.lower())
-
-        # Comparative language
-        comparative_words = ['better', 'worse', 'more', 'less', 'than', 'versus', 'compared']
-        patterns['comparative_language'] = sum(1 for word in comparative_words if word in query.lower())
-
-        # Abstract concepts
-        abstract_words = ['concept', 'theory', 'principle', 'pattern', 'structure', 'system']
-        patterns['abstract_concepts'] = sum(1 for word in abstract_words if word in query.lower())
-
-        return patterns
+        features = self.extract_features(analyzed)
+        return {name: features[name] for name in self.COGNITIVE_WORDS}
 
-    def _calculate_deterministic_error(self, query: str) -> float:
+    def _calculate_deterministic_error(self, analyzed: AnalyzedText) -> float:
         """Calculate a deterministic 'reconstruction error' based on query characteristics."""
-        # Use deterministic hash-like calculation for reproducibility
-        char_sum = sum(ord(c) for c in query)
-        word_count = len(query.split())
+        query = analyzed.text
+        # Use deterministic hash-like calculation for reproducibility; summing
+        # the encoded code points keeps the loop in native code
+        if query.isascii():
+            char_sum = sum(query.encode('ascii'))
+        else:
+            char_sum = sum(memoryview(query.encode('utf-32-le', 'surrogatepass')).cast('I'))
+        word_count = len(analyzed.words)
         length_factor = len(query)
 
         # Combine factors deterministically
@@ -182,66 +297,218 @@ class AbstractPatternDetector:
 
     def _tensor_reconstruction(self, tensor: Any) -> Dict[str, Any]:
         """Fallback method for tensor inputs (backward compatibility)."""
-        try:
-            if hasattr(tensor, 'numpy'):
-                data = tensor.numpy()
-            else:
-                data = tensor
-
-            # Deterministic reconstruction error calculation
-            total = 0.0
-            count = 0
-            for row in data:
-                if isinstance(row, (list, tuple)):
-                    for val in row:
-                        total += float(val)
-                        count += 1
-                else:
-                    total += float(row)
-                    count += 1
-
-            reconstruction_error = abs(total / max(count, 1)) % 1.0
-
-        except Exception as e:
-            logger.warning(f"Tensor reconstruction failed: {e}")
-            reconstruction_error = 0.42
-
         return {
-            'reconstruction_error': reconstruction_error,
+            'reconstruction_error': self._reduce_tensor(tensor, batched=False)[0],
             'input_type': 'tensor',
             'note': 'Tensor input detected - using legacy reconstruction mode'
         }
 
-    def analyze_patterns(self, queries: List[str]) -> Dict[str, Any]:
+    def reconstruction_errors(self, batch: Any) -> List[float]:
         """
-        Analyze patterns across multiple queries for batch processing.
+        Reconstruction error of every entry along the leading (batch) axis, in one call.
 
         Args:
-            queries: List of query strings to analyze
+            batch: NumPy array, torch tensor, buffer-protocol object or nested
+                sequences, shaped (batch, ...)
 
         Returns:
-            Dict with aggregate pattern analysis
+            One ``abs(mean) % 1.0`` per batch entry, over all of that entry's values
+
+        Raises:
+            ValueError: If the input cannot be read as a numeric array
         """
-        if not queries:
-            return {'error': 'No queries provided'}
+        return self._reduce_tensor(batch, batched=True)
 
-        individual_analyses = [self._analyze_query_patterns(q) for q in queries]
+    def _reduce_tensor(self, tensor: Any, batched: bool) -> List[float]:
+        """Deterministic reconstruction error(s), reduced in native code when numpy is available."""
+        try:
+            data = _tensor_data(tensor)
+            values = _numeric_array(data) if np is not None else None
+            if values is None:
+                entries = list(data) if batched else [data]
+                return [abs(_python_mean(entry)) % 1.0 for entry in entries]
+
+            if values.dtype.kind not in 'biuf':
+                raise TypeError(f"non-numeric dtype {values.dtype}")
+            if not batched:
+                mean = values.mean(dtype=np.float64) if values.size else 0.0
+                return [float(abs(mean) % 1.0)]
+            if values.ndim == 0:
+                raise ValueError("batch input needs a leading batch axis")
+            if not len(values):
+                return []
+            flat = values.reshape(len(values), -1)
+            means = flat.mean(axis=1, dtype=np.float64) if flat.shape[1] else np.zeros(len(flat))
+            return (np.abs(means) % 1.0).tolist()
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Cannot reduce tensor input of type {type(tensor).__name__}: {e}") from e
+
+    def analyze_patterns(self, queries: Iterable[Union[str, AnalyzedText]], include_individual: bool = True,
+                         workers: int = 1, chunk_size: int = 256,
+                         max_pending_chunks: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Analyze patterns across multiple queries for batch processing.
 
-        # Aggregate results deterministically
-        question_types = Counter(analysis['question_type'] for analysis in individual_analyses)
-        avg_complexity = sum(a['complexity_score'] for a in individual_analyses) / len(individual_analyses)
+        Queries are consumed lazily and folded into a PatternAggregate as they
+        are analyzed, so with ``include_individual=False`` memory stays flat
+        however many queries there are. With ``workers > 1`` chunks are
+        analyzed in a process pool and the partial aggregates merged in input
+        order; the average complexity may then differ from the serial one in
+        the last bits of the float sum.
 
-        # Find most common structural elements
-        all_elements = []
-        for analysis in individual_analyses:
-            all_elements.extend(analysis['structural_elements'])
-        common_elements = Counter(all_elements).most_common(3)
+        Args:
+            queries: Iterable of queries, raw or already analyzed (e.g. iter_query_log())
+            include_individual: Keep every per-query analysis under 'individual_analyses'
+            workers: Worker processes; 1 or fewer analyzes in this process
+            chunk_size: Queries sent to a worker per task
+            max_pending_chunks: Chunks in flight at once (defaults to 2 * workers)
 
-        return {
-            'total_queries': len(queries),
+        Returns:
+            Dict with aggregate pattern analysis
+        """
+        if workers <= 1:
+            aggregate = PatternAggregate(include_individual)
+            for query in queries:
+                aggregate.add(self._analyze_query_patterns(query))
+        else:
+            aggregate = self._aggregate_in_pool(queries, include_individual, workers, chunk_size,
+                                                max_pending_chunks or 2 * workers)
+
+        if not aggregate.total:
+            return {'error': 'No queries provided'}
+        return aggregate.to_dict()
+
+    def _aggregate_in_pool(self, queries: Iterable[Union[str, AnalyzedText]], include_individual: bool,
+                           workers: int, chunk_size: int, max_pending: int) -> 'PatternAggregate':
+        aggregate = PatternAggregate(include_individual)
+        chunks = chunked((AnalyzedText.of(query).text for query in queries), chunk_size)
+        for partial in map_chunks(functools.partial(_aggregate_pattern_chunk, include_individual=include_individual),
+                                  chunks, workers, max_pending, _init_pattern_worker,
+                                  (self.input_dim, self.latent_dim), quiet_loggers=(__name__,)):
+            aggregate.merge(partial)
+        return aggregate
+
+class PatternAggregate:
+    """
+    Running totals behind analyze_patterns. Analyses are added one at a time
+    and partial aggregates from workers are merged in input order, which keeps
+    Counter tie-breaking identical to a single pass over the whole batch.
+    """
+
+    def __init__(self, include_individual: bool = True):
+        self.total = 0
+        self.complexity_sum = 0.0
+        self.question_types: Counter = Counter()
+        self.structural_elements: Counter = Counter()
+        self.individual_analyses: Optional[List[Dict[str, Any]]] = [] if include_individual else None
+
+    def add(self, analysis: Dict[str, Any]):
+        self.total += 1
+        self.complexity_sum += analysis['complexity_score']
+        self.question_types[analysis['question_type']] += 1
+        self.structural_elements.update(analysis['structural_elements'])
+        if self.individual_analyses is not None:
+            self.individual_analyses.append(analysis)
+
+    def merge(self, other: 'PatternAggregate'):
+        """Fold in the aggregate of the queries that follow this one's."""
+        self.total += other.total
+        self.complexity_sum += other.complexity_sum
+        self.question_types.update(other.question_types)
+        self.structural_elements.update(other.structural_elements)
+        if self.individual_analyses is not None and other.individual_analyses is not None:
+            self.individual_analyses.extend(other.individual_analyses)
+
+    def to_dict(self) -> Dict[str, Any]:
+        question_types = self.question_types
+        result = {
+            'total_queries': self.total,
             'dominant_question_type': question_types.most_common(1)[0][0] if question_types else 'UNKNOWN',
-            'average_complexity': avg_complexity,
-            'common_structural_elements': [elem for elem, _ in common_elements],
-            'pattern_distribution': dict(question_types),
-            'individual_analyses': individual_analyses
+            'average_complexity': self.complexity_sum / self.total if self.total else 0.0,
+            'common_structural_elements': [elem for elem, _ in self.structural_elements.most_common(3)],
+            'pattern_distribution': dict(question_types)
         }
+        if self.individual_analyses is not None:
+            result['individual_analyses'] = self.individual_analyses
+        return result
+
+def iter_query_log(path: Union[str, os.PathLike], field: str = 'query') -> Iterator[str]:
+    """
+    Lazily read queries from a JSONL log for analyze_patterns.
+
+    Each line is either a JSON string or an object whose ``field`` holds the
+    query. Blank lines are ignored; malformed lines and records without a
+    string ``field`` are skipped and counted in one warning at the end.
+    """
+    skipped = 0
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                skipped += 1
+                continue
+            if isinstance(record, dict):
+                record = record.get(field)
+            if isinstance(record, str):
+                yield record
+            else:
+                skipped += 1
+    if skipped:
+        logger.warning(f"Skipped {skipped} unreadable records in query log {path}")
+
+def _tensor_data(tensor: Any) -> Any:
+    """Unwrap torch-style tensors (zero-copy for CPU tensors) and raw buffers."""
+    if hasattr(tensor, 'numpy'):
+        if hasattr(tensor, 'detach'):
+            tensor = tensor.detach()
+        if hasattr(tensor, 'cpu'):
+            tensor = tensor.cpu()
+        return tensor.numpy()
+    if isinstance(tensor, (list, tuple)) or (np is not None and isinstance(tensor, np.ndarray)):
+        return tensor
+    try:
+        view = memoryview(tensor)
+    except TypeError:
+        return tensor
+    return view if np is not None else view.tolist()
+
+def _numeric_array(data: Any) -> Optional['np.ndarray']:
+    """``data`` as an array, or None for ragged nested sequences that only the Python path can reduce."""
+    try:
+        return np.asarray(data)
+    except ValueError:
+        if isinstance(data, (list, tuple)):
+            return None
+        raise
+
+def _python_mean(data: Any) -> float:
+    """Mean of every value in arbitrarily nested sequences; 0.0 when empty."""
+    total = 0.0
+    count = 0
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, (list, tuple)):
+            stack.extend(reversed(item))
+        elif hasattr(item, 'numpy'):
+            stack.append(list(item.numpy()))
+        else:
+            total += float(item)
+            count += 1
+    return total / max(count, 1)
+
+# Per-process detector for analyze_patterns, built once by the pool initializer
+_worker_detector: Optional[AbstractPatternDetector] = None
+
+def _init_pattern_worker(input_dim: int, latent_dim: int):
+    global _worker_detector
+    _worker_detector = AbstractPatternDetector(input_dim, latent_dim)
+
+def _aggregate_pattern_chunk(chunk: List[str], include_individual: bool) -> PatternAggregate:
+    aggregate = PatternAggregate(include_individual)
+    for query in chunk:
+        aggregate.add(_worker_detector._analyze_query_patterns(query))
+    return aggregate
@@ -1,15 +1,39 @@
+import hashlib
+import json
 import logging
 import re
-from typing import Dict, List, Optional
+import threading
+from collections import OrderedDict
+from itertools import chain, repeat
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from ..text_analysis import AnalyzedText
+from ..text_analysis.analyzed_text import WORD_PATTERN
+
+try:
+    import numpy as np
+except ImportError:  # batch scoring falls back to the scalar path
+    np = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Negators this many tokens or fewer before an emotion word flip its score
+NEGATION_WINDOW = 3
+
 class EmotionLexicon:
-    """Deterministic lexicon for emotion detection based on word patterns."""
+    """
+    Deterministic lexicon for emotion detection based on word patterns.
 
-    def __init__(self):
-        self.emotion_words = {
+    The keyword lists are compiled into a single word -> [(emotion, weight)]
+    index plus intensifier and negator sets, so scoring costs one hash lookup
+    per token however large the lexicon is.
+    """
+
+    def __init__(self, emotion_words: Optional[Dict[str, Union[List[str], Dict[str, float]]]] = None,
+                 intensifiers: Optional[Iterable[str]] = None, negators: Optional[Iterable[str]] = None):
+        self.emotion_words = emotion_words if emotion_words is not None else {
             "JOY": ["happy", "joy", "delight", "ecstatic", "thrilled", "excited", "cheerful", "glad"],
             "SADNESS": ["sad", "unhappy", "depressed", "sorrow", "grief", "melancholy", "blue", "down"],
             "ANGER": ["angry", "furious", "mad", "rage", "irritated", "annoyed", "frustrated", "outraged"],
@@ -19,26 +43,74 @@ class EmotionLexicon:
             "POSITIVE": ["good", "great", "excellent", "wonderful", "fantastic", "amazing", "awesome", "brilliant"],
             "NEGATIVE": ["bad", "terrible", "awful", "horrible", "dreadful", "atrocious", "abysmal", "vile"]
         }
-        self.intensifiers = ["very", "extremely", "so", "really", "incredibly", "absolutely", "totally"]
-        self.negators = ["not", "no", "never", "none", "neither", "nor"]
+        self.intensifiers = list(intensifiers) if intensifiers is not None else \
+            ["very", "extremely", "so", "really", "incredibly", "absolutely", "totally"]
+        self.negators = list(negators) if negators is not None else ["not", "no", "never", "none", "neither", "nor"]
+        self.compile()
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> 'EmotionLexicon':
+        """
+        Load a lexicon from a JSON file.
+
+        The file holds an ``emotions`` object mapping each emotion either to a
+        keyword list (weight 1.0) or to a ``{word: weight}`` object, plus
+        optional ``intensifiers`` and ``negators`` lists that default to the
+        built-in ones.
 
-    def detect_emotions(self, text: str) -> Dict[str, float]:
+        Args:
+            path: Path to the JSON lexicon
+
+        Returns:
+            A compiled EmotionLexicon
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        lexicon = cls(data["emotions"], data.get("intensifiers"), data.get("negators"))
+        logger.info(f"Loaded emotion lexicon from {path}: {len(lexicon.word_index)} words "
+                    f"across {len(lexicon.emotion_words)} emotions")
+        return lexicon
+
+    def compile(self):
+        """Rebuild the lookup structures; call after editing the word lists in place."""
+        word_index: Dict[str, List[Tuple[str, float]]] = {}
+        for emotion, keywords in self.emotion_words.items():
+            weighted = keywords.items() if isinstance(keywords, dict) else ((word, 1.0) for word in keywords)
+            for word, weight in weighted:
+                entries = word_index.setdefault(word.lower(), [])
+                # Listing a word twice under one emotion still counts it once
+                if all(existing != emotion for existing, _ in entries):
+                    entries.append((emotion, float(weight)))
+        self.word_index = word_index
+        self.intensifier_set = frozenset(word.lower() for word in self.intensifiers)
+        self.negator_set = frozenset(word.lower() for word in self.negators)
+        self._batch_tables = None
+
+    def detect_emotions(self, text: Union[str, AnalyzedText]) -> Dict[str, float]:
         """Detect emotions in text and return scores."""
-        text_lower = text.lower()
         scores = {emotion: 0.0 for emotion in self.emotion_words}
+        word_index = self.word_index
+        intensifiers = self.intensifier_set
+        negators = self.negator_set
 
-        words = re.findall(r'\b\w+\b', text_lower)
-        for i, word in enumerate(words):
-            for emotion, keywords in self.emotion_words.items():
-                if word in keywords:
-                    score = 1.0
-                    # Check for intensifiers before the word
-                    if i > 0 and words[i-1] in self.intensifiers:
+        previous = None
+        last_negator = -NEGATION_WINDOW - 1
+        for i, word in enumerate(AnalyzedText.of(text).tokens):
+            entries = word_index.get(word)
+            if entries is not None:
+                # Intensifier directly before the word, negator within the window before it
+                intensified = previous in intensifiers
+                negated = i - last_negator <= NEGATION_WINDOW
+                for emotion, weight in entries:
+                    score = weight
+                    if intensified:
                         score *= 1.5
-                    # Check for negators
-                    if any(neg in words[max(0, i-3):i] for neg in self.negators):
+                    if negated:
                         score *= -0.5
                     scores[emotion] += score
+            if word in negators:
+                last_negator = i
+            previous = word
 
         # Normalize scores
         total = sum(abs(s) for s in scores.values())
@@ -47,6 +119,113 @@ class EmotionLexicon:
 
         return scores
 
+    def _build_batch_tables(self) -> Dict[str, Any]:
+        """Array form of the lexicon: token ids, per-id flags and CSR emotion entries."""
+        emotions = list(self.emotion_words)
+        column = {emotion: j for j, emotion in enumerate(emotions)}
+        # Id 0 stands for every token the lexicon does not know
+        vocabulary = {word: i for i, word in enumerate(
+            dict.fromkeys([*self.word_index, *self.intensifier_set, *self.negator_set]), start=1)}
+        size = len(vocabulary) + 1
+
+        entry_count = np.zeros(size, dtype=np.int64)
+        entry_emotion = []
+        entry_weight = []
+        entry_start = np.zeros(size, dtype=np.int64)
+        for word, entries in self.word_index.items():
+            word_id = vocabulary[word]
+            entry_start[word_id] = len(entry_emotion)
+            entry_count[word_id] = len(entries)
+            for emotion, weight in entries:
+                entry_emotion.append(column[emotion])
+                entry_weight.append(weight)
+
+        is_intensifier = np.zeros(size, dtype=bool)
+        is_intensifier[[vocabulary[word] for word in self.intensifier_set]] = True
+        is_negator = np.zeros(size, dtype=bool)
+        is_negator[[vocabulary[word] for word in self.negator_set]] = True
+
+        return {
+            'emotions': emotions,
+            'vocabulary': vocabulary,
+            'entry_count': entry_count,
+            'entry_start': entry_start,
+            'entry_emotion': np.array(entry_emotion, dtype=np.int64),
+            'entry_weight': np.array(entry_weight, dtype=np.float64),
+            'is_intensifier': is_intensifier,
+            'is_negator': is_negator,
+        }
+
+    def detect_emotions_batch(self, token_lists: Sequence[List[str]]) -> 'np.ndarray':
+        """
+        Vectorized ``detect_emotions`` over many tokenized messages.
+
+        Tokens are mapped to lexicon ids once, then intensifiers, the negation
+        window, score accumulation and normalization run as array operations
+        across the whole batch. Row ``i`` holds the normalized scores of
+        message ``i`` in ``emotion_words`` order and equals the scalar result.
+
+        Args:
+            token_lists: Lowercased tokens of each message
+
+        Returns:
+            Array of shape (messages, emotions)
+
+        Raises:
+            RuntimeError: if NumPy is not installed
+        """
+        if np is None:
+            raise RuntimeError("detect_emotions_batch requires numpy")
+        if self._batch_tables is None:
+            self._batch_tables = self._build_batch_tables()
+        tables = self._batch_tables
+        messages = len(token_lists)
+        emotion_count = len(tables['emotions'])
+
+        counts = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=messages)
+        total_tokens = int(counts.sum())
+        ids = np.fromiter(map(tables['vocabulary'].get, chain.from_iterable(token_lists), repeat(0)),
+                          dtype=np.int64, count=total_tokens)
+
+        position = np.arange(total_tokens)
+        message = np.repeat(np.arange(messages), counts)
+        message_start = np.repeat(np.cumsum(counts) - counts, counts)
+
+        # Intensifier immediately before the token, within the same message
+        previous_intensifier = np.zeros(total_tokens, dtype=bool)
+        previous_intensifier[1:] = tables['is_intensifier'][ids[:-1]]
+        intensified = previous_intensifier & (position > message_start)
+
+        # Most recent negator strictly before each token, within the same message
+        last_negator = np.maximum.accumulate(np.where(tables['is_negator'][ids], position, -1)) \
+            if total_tokens else position
+        previous_negator = np.full(total_tokens, -1, dtype=np.int64)
+        previous_negator[1:] = last_negator[:-1]
+        negated = (previous_negator >= message_start) & (position - previous_negator <= NEGATION_WINDOW)
+
+        # Expand every emotion-word hit into its (emotion, weight) entries
+        hits = np.flatnonzero(tables['entry_count'][ids])
+        per_hit = tables['entry_count'][ids[hits]]
+        first_entry = np.cumsum(per_hit) - per_hit
+        entry = np.repeat(tables['entry_start'][ids[hits]], per_hit) + \
+            (np.arange(int(per_hit.sum())) - np.repeat(first_entry, per_hit))
+        score = tables['entry_weight'][entry]
+        score = np.where(np.repeat(intensified[hits], per_hit), score * 1.5, score)
+        score = np.where(np.repeat(negated[hits], per_hit), score * -0.5, score)
+
+        # bincount adds in input order, matching the scalar per-emotion sums
+        bins = np.repeat(message[hits], per_hit) * emotion_count + tables['entry_emotion'][entry]
+        scores = np.bincount(bins, weights=score, minlength=messages * emotion_count)
+        scores = scores.reshape(messages, emotion_count)
+
+        # Sum magnitudes column by column to keep the scalar addition order
+        total = np.zeros(messages)
+        for j in range(emotion_count):
+            total = total + np.abs(scores[:, j])
+        nonzero = total > 0
+        scores[nonzero] = scores[nonzero] / total[nonzero, None]
+        return scores
+
 class ContextProcessor:
     """Processes contextual nuances in text."""
 
@@ -57,8 +236,10 @@ class ContextProcessor:
             "ellipsis": r'\.\.\.+'
         }
 
-    def analyze_context(self, text: str) -> Dict[str, float]:
+    def analyze_context(self, text: Union[str, AnalyzedText]) -> Dict[str, float]:
         """Analyze contextual elements like punctuation and structure."""
+        analyzed = AnalyzedText.of(text)
+        text = analyzed.text
         context_scores = {
             "intensity_modifier": 1.0,
             "sarcasm_indicator": 0.0,
@@ -82,8 +263,7 @@ class ContextProcessor:
             context_scores["urgency"] += 0.3
 
         # Repeated words (emphasis)
-        words = re.findall(r'\b\w+\b', text.lower())
-        if len(words) != len(set(words)):
+        if len(analyzed.tokens) != len(analyzed.token_counts):
             context_scores["intensity_modifier"] *= 1.2
 
         return context_scores
@@ -91,30 +271,64 @@ class ContextProcessor:
 class EmotionalAnalyzer:
     """Main emotional analysis processor with contextual nuance."""
 
-    def __init__(self):
+    def __init__(self, lexicon: Optional[EmotionLexicon] = None, history_cache_size: int = 1024):
         logger.info("Initializing Emotional Analyzer with deterministic, local processing.")
-        self.lexicon = EmotionLexicon()
+        self.lexicon = lexicon if lexicon is not None else EmotionLexicon()
         self.context_processor = ContextProcessor()
+        # Primary emotion of recently seen messages, keyed by message digest, so
+        # conversation history is not re-scored on every turn
+        self.history_cache_size = history_cache_size
+        self.history_cache: OrderedDict = OrderedDict()
+        self.history_hits = 0
+        self.history_misses = 0
+        self.history_lock = threading.Lock()
+
+    @staticmethod
+    def _message_key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+    def _remember_emotion(self, key: bytes, emotion: str):
+        with self.history_lock:
+            self.history_cache[key] = emotion
+            self.history_cache.move_to_end(key)
+            while len(self.history_cache) > self.history_cache_size:
+                self.history_cache.popitem(last=False)
+
+    def _history_emotion(self, message: Union[str, AnalyzedText]) -> str:
+        """Primary emotion of a previous message, analyzed at most once while cached."""
+        key = self._message_key(AnalyzedText.of(message).text)
+        with self.history_lock:
+            emotion = self.history_cache.get(key)
+            if emotion is not None:
+                self.history_cache.move_to_end(key)
+                self.history_hits += 1
+                return emotion
+            self.history_misses += 1
+        emotion = self.analyze(message)["emotion"]
+        self._remember_emotion(key, emotion)
+        return emotion
 
-    def analyze(self, text: str, context: Optional[List[str]] = None) -> Dict[str, any]:
+    def analyze(self, text: Union[str, AnalyzedText], context: Optional[List[str]] = None) -> Dict[str, any]:
         """
         Analyze emotional content with contextual nuance.
 
         Args:
-            text: The text to analyze
+            text: The text to analyze, raw or already analyzed
             context: Optional list of previous messages for context
 
         Returns:
             Dict with emotion, intensity, confidence, and additional insights
         """
+        analyzed = AnalyzedText.of(text)
+        text = analyzed.text
         if not text.strip():
             return {"emotion": "NEUTRAL", "intensity": 0.0, "confidence": 1.0, "source": "Empty Input"}
 
         # Lexical emotion detection
-        emotion_scores = self.lexicon.detect_emotions(text)
+        emotion_scores = self.lexicon.detect_emotions(analyzed)
 
         # Contextual analysis
-        context_scores = self.context_processor.analyze_context(text)
+        context_scores = self.context_processor.analyze_context(analyzed)
 
         # Apply context modifiers
         for emotion in emotion_scores:
@@ -134,13 +348,18 @@ class EmotionalAnalyzer:
         # Contextual insights from history (if provided)
         historical_insight = ""
         if context:
-            prev_emotions = [self.analyze(prev)["emotion"] for prev in context[-3:]]  # Last 3 messages
+            prev_emotions = [self._history_emotion(prev) for prev in context[-3:]]  # Last 3 messages
             if prev_emotions and primary_emotion != "NEUTRAL":
                 if all(e == primary_emotion for e in prev_emotions):
                     historical_insight = f"Consistent {primary_emotion.lower()} tone detected in recent context."
                 elif any(e in ["ANGER", "SADNESS"] for e in prev_emotions):
                     historical_insight = "Emotional escalation detected from previous interactions."
 
+        # The primary emotion does not depend on context, so this message is
+        # already scored when it shows up in the next turn's history
+        if self.history_cache_size > 0:
+            self._remember_emotion(self._message_key(text), primary_emotion)
+
         result = {
             "emotion": primary_emotion,
             "intensity": min(intensity, 1.0),  # Cap at 1.0
@@ -153,7 +372,86 @@ class EmotionalAnalyzer:
         logger.info(f"Emotional analysis complete for text: '{text[:30]}' -> {primary_emotion} (intensity: {intensity:.2f})")
         return result
 
-    def get_emotion_profile(self, text: str) -> Dict[str, float]:
+    def analyze_batch(self, texts: Iterable[Union[str, AnalyzedText]]) -> List[Dict[str, Any]]:
+        """
+        Analyze many independent messages at once.
+
+        With NumPy available, lexical scoring, context modifiers, primary
+        emotion and confidence are computed as array operations over the whole
+        batch; otherwise each message goes through ``analyze``. Either way each
+        result equals ``analyze(text)`` for that message.
+
+        Args:
+            texts: Messages to analyze, raw or already analyzed
+
+        Returns:
+            List of analysis dicts in input order
+        """
+        if np is None:
+            return [self.analyze(text) for text in texts]
+
+        # Plain strings skip AnalyzedText; per-message view caching only pays
+        # off when several modules share the text
+        batch = [text.text if isinstance(text, AnalyzedText) else text for text in texts]
+        token_lists = [WORD_PATTERN.findall(text.lower()) for text in batch]
+
+        emotions = list(self.lexicon.emotion_words)
+        scores = self.lexicon.detect_emotions_batch(token_lists)
+
+        # Context modifiers, applied in the same order as analyze_context
+        patterns = self.context_processor.punctuation_patterns
+        exclamation = re.compile(patterns["exclamation"]).search
+        question = re.compile(patterns["question"]).search
+        ellipsis = re.compile(patterns["ellipsis"]).search
+        flags = np.array([
+            (exclamation(text) is not None,
+             question(text) is not None,
+             ellipsis(text) is not None,
+             text.isupper() and len(text) > 5,
+             len(tokens) != len(set(tokens)))
+            for text, tokens in zip(batch, token_lists)
+        ], dtype=bool).reshape(len(batch), 5)
+        modifier = np.ones(len(batch))
+        for column, factor in enumerate((1.3, 0.8, 0.9, 1.4, 1.2)):
+            modifier = np.where(flags[:, column], modifier * factor, modifier)
+        scores = scores * modifier[:, None]
+
+        primary = np.argmax(scores, axis=1)
+        intensity = scores[np.arange(len(batch)), primary]
+        top_two = -np.sort(-scores, axis=1)[:, :2]
+        if top_two.shape[1] > 1:
+            confidence = np.where(top_two[:, 0] > 0, top_two[:, 0] / (top_two[:, 0] + top_two[:, 1] + 0.1), 0.5)
+        else:
+            confidence = np.full(len(batch), 0.5)
+
+        results = []
+        for i, text in enumerate(batch):
+            if not text.strip():
+                results.append({"emotion": "NEUTRAL", "intensity": 0.0, "confidence": 1.0, "source": "Empty Input"})
+                continue
+            results.append({
+                "emotion": emotions[primary[i]],
+                "intensity": min(float(intensity[i]), 1.0),
+                "confidence": float(confidence[i]),
+                "source": "Deterministic Lexical Analysis",
+                "contextual_modifier": float(modifier[i]),
+                "insights": "No significant contextual insights."
+            })
+
+        logger.info(f"Batch emotional analysis complete for {len(batch)} messages")
+        return results
+
+    def get_history_cache_stats(self) -> Dict[str, int]:
+        """Hit/miss counters for the conversation-history emotion cache."""
+        with self.history_lock:
+            return {
+                "size": len(self.history_cache),
+                "max_size": self.history_cache_size,
+                "hits": self.history_hits,
+                "misses": self.history_misses
+            }
+
+    def get_emotion_profile(self, text: Union[str, AnalyzedText]) -> Dict[str, float]:
         """Get full emotion profile for advanced analysis."""
         return self.lexicon.detect_emotions(text)
 
@@ -1,5 +1,6 @@
 import logging
-from typing import Dict, List, Any, Optional
+from itertools import product
+from typing import Dict, List, Any, Optional, Tuple
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -25,9 +26,7 @@ class CoherenceEngine:
         Returns:
             Dict with coherence_score, flags, and recommendations
         """
-        reasoning = next((out for out in cognitive_outputs if 'type' in out), {})
-        emotion = next((out for out in cognitive_outputs if 'emotion' in out), {})
-        pattern = next((out for out in cognitive_outputs if 'question_type' in out), {})
+        reasoning, emotion, pattern, emotion_labels = _partition_outputs(cognitive_outputs)
 
         # Calculate coherence metrics
         reasoning_confidence = reasoning.get('confidence', 0.5)
@@ -55,8 +54,7 @@ class CoherenceEngine:
         # Contextual consistency check
         context_consistent = True
         if context_history:
-            prev_emotions = [emotion.get('emotion', 'NEUTRAL') for emotion in cognitive_outputs if 'emotion' in emotion]
-            if len(set(prev_emotions)) > 2:  # Too many different emotions
+            if len(set(emotion_labels)) > 2:  # Too many different emotions
                 context_consistent = False
                 flags.append("EMOTIONAL_INCONSISTENCY")
 
@@ -89,14 +87,97 @@ class ResponseSynthesizer:
     Implements Principles 3, 4: Adaptive Communication & Holistic Analysis.
     """
 
+    QUESTION_OPENINGS = ('WHAT', 'HOW', 'WHY', 'EXPLANATORY', 'COMPUTATIONAL')
+    EMOTION_BUCKETS = {
+        'POSITIVE': 'POSITIVE', 'NEGATIVE': 'NEGATIVE',
+        'JOY': 'ENTHUSIASTIC', 'SURPRISE': 'ENTHUSIASTIC',
+        'SADNESS': 'SOMBER', 'FEAR': 'SOMBER'
+    }
+    EXPERTISE_LEVELS = ('expert', 'novice')
+
     def __init__(self):
         self.adaptation_rules = {
             "SIMPLE": {"complexity": "low", "style": "direct", "detail_level": "minimal"},
             "MODERATE": {"complexity": "medium", "style": "structured", "detail_level": "balanced"},
             "COMPLEX": {"complexity": "high", "style": "comprehensive", "detail_level": "detailed"}
         }
+        self.templates = self._compile_templates()
         logger.info("Response Synthesizer initialized for adaptive, deterministic response generation.")
 
+    def _compile_templates(self) -> Dict[tuple, Tuple[str, str]]:
+        """
+        Precompute the fixed text of every response shape.
+
+        Keys are (complexity level, question type, emotion bucket, logical
+        connectives, structural elements, low coherence, uncertain reasoning,
+        expertise); values are the opening sentence and the joined fragments
+        that follow the reasoning content. Only the reasoning sentence depends
+        on request data, so synthesis is a lookup plus a join.
+        """
+        templates = {}
+        for complexity_level in self.adaptation_rules:
+            for question_type in self.QUESTION_OPENINGS + (None,):
+                opening = self._opening(complexity_level, question_type)
+                for emotion_bucket in (None,) + tuple(dict.fromkeys(self.EMOTION_BUCKETS.values())):
+                    for flags in product((False, True), repeat=4):
+                        for expertise in self.EXPERTISE_LEVELS + (None,):
+                            key = (complexity_level, question_type, emotion_bucket) + flags + (expertise,)
+                            fragments = self._closing_fragments(complexity_level, emotion_bucket, *flags, expertise)
+                            templates[key] = (opening, " ".join(fragments))
+        return templates
+
+    def _opening(self, complexity_level: str, question_type: Optional[str]) -> str:
+        """Opening based on question type."""
+        adaptation = self.adaptation_rules[complexity_level]
+        if question_type in ('WHAT', 'HOW', 'WHY'):
+            return f"Addressing your {question_type.lower()} inquiry with {adaptation['style']} analysis."
+        elif question_type == 'EXPLANATORY':
+            return f"Providing a {adaptation['detail_level']} explanation based on detected patterns."
+        elif question_type == 'COMPUTATIONAL':
+            return "Processing your computational request with deterministic precision."
+        return "Analyzing your query through integrated cognitive processing."
+
+    def _closing_fragments(self, complexity_level: str, emotion_bucket: Optional[str], logical_connectives: bool,
+                           structural_elements: bool, low_coherence: bool, uncertain_reasoning: bool,
+                           expertise: Optional[str]) -> List[str]:
+        """Fragments that follow the reasoning content, in response order."""
+        detailed = self.adaptation_rules[complexity_level]['detail_level'] == 'detailed'
+        fragments = []
+
+        # Emotional integration
+        if emotion_bucket == 'POSITIVE':
+            if complexity_level == "COMPLEX":
+                fragments.append("Your positive engagement enhances the depth of this analysis.")
+            else:
+                fragments.append("I sense positive sentiment in your query.")
+        elif emotion_bucket == 'NEGATIVE':
+            fragments.append("I detect negative sentiment - please provide more context if needed.")
+        elif emotion_bucket == 'ENTHUSIASTIC':
+            fragments.append("Your enthusiastic tone is noted and incorporated into the response.")
+        elif emotion_bucket == 'SOMBER':
+            fragments.append("Acknowledging the emotional context of your inquiry.")
+
+        # Pattern insights for complex responses
+        if complexity_level in ("MODERATE", "COMPLEX"):
+            if logical_connectives:
+                fragments.append("Recognizing the logical structure in your query for systematic processing.")
+            if structural_elements:
+                fragments.append("Your structured approach facilitates precise analysis.")
+
+        # Coherence-based adjustments
+        if low_coherence:
+            fragments.append("To ensure clarity, could you provide additional context?")
+        if uncertain_reasoning and detailed:
+            fragments.append("Note: This analysis carries some uncertainty due to reasoning confidence levels.")
+
+        # User adaptation
+        if expertise == 'expert' and complexity_level == "SIMPLE":
+            fragments.append("Given your expertise, I've kept this concise - expand if you need technical details.")
+        elif expertise == 'novice' and complexity_level == "COMPLEX":
+            fragments.append("I've included detailed explanation for clarity.")
+
+        return fragments
+
     def synthesize_response(self, cognitive_outputs: List[Dict[str, Any]], coherence_assessment: Dict[str, Any],
                           user_context: Optional[Dict[str, Any]] = None) -> str:
         """
@@ -110,9 +191,7 @@ class ResponseSynthesizer:
         Returns:
             Synthesized response string
         """
-        reasoning = next((out for out in cognitive_outputs if 'type' in out), {})
-        emotion = next((out for out in cognitive_outputs if 'emotion' in out), {})
-        pattern = next((out for out in cognitive_outputs if 'question_type' in out), {})
+        reasoning, emotion, pattern, _ = _partition_outputs(cognitive_outputs)
 
         # Determine response complexity based on pattern and coherence
         pattern_complexity = pattern.get('complexity_score', 0.0)
@@ -125,80 +204,75 @@ class ResponseSynthesizer:
         else:
             complexity_level = "SIMPLE"
 
-        adaptation = self.adaptation_rules[complexity_level]
-
-        # Build response components
-        response_parts = []
-
-        # Opening based on question type
         question_type = pattern.get('question_type', 'GENERAL')
-        if question_type in ['WHAT', 'HOW', 'WHY']:
-            response_parts.append(f"Addressing your {question_type.lower()} inquiry with {adaptation['style']} analysis.")
-        elif question_type == 'EXPLANATORY':
-            response_parts.append(f"Providing a {adaptation['detail_level']} explanation based on detected patterns.")
-        elif question_type == 'COMPUTATIONAL':
-            response_parts.append("Processing your computational request with deterministic precision.")
-        else:
-            response_parts.append("Analyzing your query through integrated cognitive processing.")
+        emotion_type = emotion.get('emotion', 'NEUTRAL')
+        emotion_bucket = None
+        if emotion.get('intensity', 0.0) > 0.6 and isinstance(emotion_type, str):
+            emotion_bucket = self.EMOTION_BUCKETS.get(emotion_type)
+        logical_connectives = structural_elements = False
+        if complexity_level != "SIMPLE":
+            logical_connectives = pattern.get('cognitive_patterns', {}).get('logical_connectives', 0) > 0
+            structural_elements = bool(pattern.get('structural_elements'))
+        expertise = user_context.get('expertise_level', 'general') if user_context else None
+        flags = coherence_assessment.get('flags', [])
 
-        # Core reasoning content
-        if reasoning.get('type') == 'Deductive Reasoning':
+        opening, closing = self.templates[(
+            complexity_level,
+            question_type if question_type in self.QUESTION_OPENINGS else None,
+            emotion_bucket,
+            logical_connectives,
+            structural_elements,
+            "LOW_COHERENCE" in flags,
+            "UNCERTAIN_REASONING" in flags,
+            expertise if expertise in self.EXPERTISE_LEVELS else None
+        )]
+
+        content = self._reasoning_content(reasoning, complexity_level == "COMPLEX")
+        final_response = opening
+        if content:
+            final_response += " " + content
+        if closing:
+            final_response += " " + closing
+        logger.info(f"Response synthesized: complexity={complexity_level}, length={len(final_response)}")
+        return final_response
+
+    @staticmethod
+    def _reasoning_content(reasoning: Dict[str, Any], detailed: bool) -> Optional[str]:
+        """Core reasoning sentence, the only part of a response built from request data."""
+        reasoning_type = reasoning.get('type')
+        if reasoning_type == 'Deductive Reasoning':
             conclusion = reasoning.get('conclusion', 'unclear')
-            if adaptation['detail_level'] == 'detailed':
+            if detailed:
                 premises = reasoning.get('premises', 'not specified')
-                response_parts.append(f"Through deductive reasoning from premises '{premises}', the conclusion is: {conclusion}.")
-            else:
-                response_parts.append(f"The logical conclusion is: {conclusion}.")
-        elif reasoning.get('type') == 'Inductive Reasoning':
+                return f"Through deductive reasoning from premises '{premises}', the conclusion is: {conclusion}."
+            return f"The logical conclusion is: {conclusion}."
+        elif reasoning_type == 'Inductive Reasoning':
             observation = reasoning.get('observation', 'input analyzed')
-            if adaptation['detail_level'] == 'detailed':
-                response_parts.append(f"Based on inductive analysis of '{observation}', here's the synthesized understanding.")
-            else:
-                response_parts.append(f"Analysis of your input reveals: {observation[:100]}...")
-
-        # Emotional integration
-        emotion_type = emotion.get('emotion', 'NEUTRAL')
-        emotion_intensity = emotion.get('intensity', 0.0)
-
-        if emotion_intensity > 0.6:
-            if emotion_type == 'POSITIVE':
-                if complexity_level == "COMPLEX":
-                    response_parts.append("Your positive engagement enhances the depth of this analysis.")
-                else:
-                    response_parts.append("I sense positive sentiment in your query.")
-            elif emotion_type == 'NEGATIVE':
-                response_parts.append("I detect negative sentiment - please provide more context if needed.")
-            elif emotion_type in ['JOY', 'SURPRISE']:
-                response_parts.append("Your enthusiastic tone is noted and incorporated into the response.")
-            elif emotion_type in ['SADNESS', 'FEAR']:
-                response_parts.append("Acknowledging the emotional context of your inquiry.")
+            if detailed:
+                return f"Based on inductive analysis of '{observation}', here's the synthesized understanding."
+            return f"Analysis of your input reveals: {observation[:100]}..."
+        return None
 
-        # Pattern insights for complex responses
-        if complexity_level in ["MODERATE", "COMPLEX"]:
-            cognitive_patterns = pattern.get('cognitive_patterns', {})
-            if cognitive_patterns.get('logical_connectives', 0) > 0:
-                response_parts.append("Recognizing the logical structure in your query for systematic processing.")
-            if pattern.get('structural_elements'):
-                response_parts.append("Your structured approach facilitates precise analysis.")
+def _partition_outputs(cognitive_outputs: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Any],
+                                                                         Dict[str, Any], List[Any]]:
+    """
+    Pick the first reasoning, emotion and pattern output in one pass.
 
-        # Coherence-based adjustments
-        flags = coherence_assessment.get('flags', [])
-        if "LOW_COHERENCE" in flags:
-            response_parts.append("To ensure clarity, could you provide additional context?")
-        if "UNCERTAIN_REASONING" in flags and adaptation['detail_level'] == 'detailed':
-            response_parts.append("Note: This analysis carries some uncertainty due to reasoning confidence levels.")
-
-        # User adaptation (if context provided)
-        if user_context:
-            expertise = user_context.get('expertise_level', 'general')
-            if expertise == 'expert' and complexity_level == "SIMPLE":
-                response_parts.append("Given your expertise, I've kept this concise - expand if you need technical details.")
-            elif expertise == 'novice' and complexity_level == "COMPLEX":
-                response_parts.append("I've included detailed explanation for clarity.")
-
-        final_response = " ".join(response_parts)
-        logger.info(f"Response synthesized: complexity={complexity_level}, length={len(final_response)}")
-        return final_response
+    Returns:
+        (reasoning, emotion, pattern, every emotion label); missing outputs are {}
+    """
+    reasoning = emotion = pattern = None
+    emotion_labels = []
+    for out in cognitive_outputs:
+        if reasoning is None and 'type' in out:
+            reasoning = out
+        if 'emotion' in out:
+            emotion_labels.append(out['emotion'])
+            if emotion is None:
+                emotion = out
+        if pattern is None and 'question_type' in out:
+            pattern = out
+    return reasoning or {}, emotion or {}, pattern or {}, emotion_labels
 
 class EntropyMatrixHarmonizer:
     """
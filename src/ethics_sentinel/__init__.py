@@ -1,5 +1,10 @@
 # src/ethics_sentinel/__init__.py
 
-from .ethical_guard import EthicsSentinel, EthicalRules, ContentFilter
+from .ethical_guard import EthicsSentinel, EthicalRules, ContentFilter, StreamValidator
+from .audit_log import AuditLogWriter
+from .rule_scanner import EthicsRuleSet, IncrementalRuleScanner, RuleMatch, RuleScanResult
 
-__all__ = ["EthicsSentinel", "EthicalRules", "ContentFilter"]
+__all__ = [
+    "EthicsSentinel", "EthicalRules", "ContentFilter", "StreamValidator",
+    "EthicsRuleSet", "IncrementalRuleScanner", "RuleMatch", "RuleScanResult", "AuditLogWriter"
+]
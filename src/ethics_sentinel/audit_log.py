@@ -0,0 +1,172 @@
+"""Append-only JSONL audit log written off the request path.
+
+Violations are handed to a bounded queue and a single background thread
+writes them in batches, fsyncing at most every ``fsync_interval`` seconds
+and rotating the file once it would exceed ``max_bytes``. Callers never
+block on disk: if the queue is full the entry is dropped and counted.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+logger = logging.getLogger(__name__)
+
+class AuditLogWriter:
+    """Background, batched, size-rotated JSONL writer."""
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                 fsync_interval: float = 1.0, batch_size: int = 256, queue_size: int = 10000):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.fsync_interval = fsync_interval
+        self.batch_size = batch_size
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.written = 0
+        self.dropped = 0
+        self.rotations = 0
+        self.write_errors = 0
+        self._closed = False
+        self._dirty = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._open()
+        self._last_fsync = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="ethics-audit-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+        logger.info(f"Ethics audit log writing to {self.path}")
+
+    def write(self, entry: Dict[str, Any]) -> bool:
+        """Queue an entry without blocking. Returns False if it had to be dropped."""
+        if self._closed:
+            self.dropped += 1
+            return False
+        try:
+            self.queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _open(self):
+        self._file = open(self.path, 'ab')
+        self._size = self._file.tell()
+
+    def _run(self):
+        while True:
+            try:
+                entry = self.queue.get(timeout=self.fsync_interval)
+            except queue.Empty:
+                self._sync()
+                if self._closed:
+                    # close() could not queue its sentinel into a full queue; it is drained now
+                    break
+                continue
+            if entry is None:
+                break
+            batch = [entry]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    entry = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+            self._write_batch(batch)
+            if stop:
+                break
+        self._sync(force=True)
+
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        data = b''.join(json.dumps(entry, ensure_ascii=False, default=str).encode('utf-8') + b'\n'
+                        for entry in batch)
+        try:
+            if self._file.closed:
+                # A failed rotation or reopen left no file; try again rather than lose every later batch
+                self._open()
+            if self._size and self._size + len(data) > self.max_bytes:
+                try:
+                    self._rotate()
+                except OSError as e:
+                    # Keep the entries: they go to the current file, which rotation is retried on
+                    self.write_errors += 1
+                    logger.error(f"Could not rotate ethics audit log {self.path}: {e}")
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data)
+            self._dirty = True
+            self.written += len(batch)
+        except OSError as e:
+            self.write_errors += 1
+            logger.error(f"Could not write ethics audit log {self.path}: {e}")
+        self._sync()
+
+    def _sync(self, force: bool = False):
+        if not self._dirty or (not force and time.monotonic() - self._last_fsync < self.fsync_interval):
+            return
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._dirty = False
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not fsync ethics audit log {self.path}: {e}")
+        self._last_fsync = time.monotonic()
+
+    def _rotate(self):
+        """
+        Shift audit.jsonl -> audit.jsonl.1 -> ... and start a fresh file. If
+        shifting fails, the current file is reopened and appended to instead.
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._dirty = False
+        try:
+            if self.backup_count > 0:
+                for index in range(self.backup_count - 1, 0, -1):
+                    source = self.path.with_name(f"{self.path.name}.{index}")
+                    if source.exists():
+                        os.replace(source, self.path.with_name(f"{self.path.name}.{index + 1}"))
+                os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+            else:
+                os.remove(self.path)
+            self.rotations += 1
+        finally:
+            self._open()
+
+    def close(self, timeout: float = 5.0):
+        """Drain queued entries, fsync and close the file."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            # The writer stops by itself once the queue is drained and idle
+            logger.warning("Ethics audit queue full at close; waiting for the writer to drain it")
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning(f"Ethics audit writer still draining {self.queue.qsize()} entries at close")
+        else:
+            self._file.close()
+        atexit.unregister(self.close)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "written": self.written,
+            "dropped": self.dropped,
+            "pending": self.queue.qsize(),
+            "rotations": self.rotations,
+            "write_errors": self.write_errors
+        }
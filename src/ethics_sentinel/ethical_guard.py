@@ -1,6 +1,15 @@
 import logging
-import re
-from typing import List, Dict, Any
+import os
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Union
+
+from ..text_analysis import AnalyzedText
+from .audit_log import AuditLogWriter
+from .rule_scanner import EthicsRuleSet, IncrementalRuleScanner, RuleMatch, RuleScanResult
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -28,104 +37,235 @@ class EthicalRules:
         "weapons", "crime", "fraud", "deception"
     ]
 
+    # Basic profanity list (expandable), matched as whole words only
+    PROFANITY = [
+        "fuck", "shit", "damn", "bitch", "asshole",
+        "cunt", "dick", "pussy"
+    ]
+
+    @classmethod
+    def category_rules(cls) -> Dict[str, Dict[str, List[str]]]:
+        """Built-in rules in the category -> {keywords, words} form EthicsRuleSet compiles."""
+        return {
+            "harm_principle": {"keywords": cls.HARM_PRINCIPLES},
+            "bias": {"keywords": cls.BIAS_INDICATORS},
+            "inappropriate_content": {"keywords": cls.INAPPROPRIATE_CONTENT, "words": cls.PROFANITY},
+            "sensitive_topics": {"keywords": cls.SENSITIVE_TOPICS}
+        }
+
 class ContentFilter:
-    """Handles content filtering based on ethical rules."""
+    """
+    Handles content filtering based on ethical rules.
 
-    def __init__(self):
+    All categories are compiled into one EthicsRuleSet and checked in a single
+    scan. With ``rules_path`` set, rules come from that JSON file and are
+    reloaded when it changes (checked at most every ``reload_interval``
+    seconds); a file that fails to load leaves the current rules in place.
+    """
+
+    def __init__(self, rules_path: Optional[Union[str, Path]] = None, reload_interval: float = 5.0):
         self.rules = EthicalRules()
+        self.rules_path = Path(rules_path) if rules_path else None
+        self.reload_interval = reload_interval
+        self.rule_set = EthicsRuleSet(EthicalRules.category_rules())
+        self._rules_mtime: Optional[float] = None
+        self._last_reload_check = 0.0
+        if self.rules_path is not None:
+            self.reload_rules()
 
-    def check_harm_principle(self, text: str) -> bool:
+    def reload_rules(self) -> bool:
+        """Recompile rules from ``rules_path``. Returns True if new rules are active."""
+        if self.rules_path is None:
+            return False
+        self._last_reload_check = time.monotonic()
+        try:
+            mtime = os.stat(self.rules_path).st_mtime
+            rule_set = EthicsRuleSet.from_file(self.rules_path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not load ethics rules from {self.rules_path}: {e}")
+            return False
+        self.rule_set = rule_set
+        self._rules_mtime = mtime
+        logger.info(f"Loaded {rule_set.term_count} ethics rule terms across "
+                    f"{len(rule_set.categories)} categories from {self.rules_path}")
+        return True
+
+    def _maybe_reload(self):
+        if self.rules_path is None or time.monotonic() - self._last_reload_check < self.reload_interval:
+            return
+        self._last_reload_check = time.monotonic()
+        try:
+            mtime = os.stat(self.rules_path).st_mtime
+        except OSError:
+            return
+        if mtime != self._rules_mtime:
+            self.reload_rules()
+
+    def current_rule_set(self) -> EthicsRuleSet:
+        """The active compiled rules, picking up file changes first."""
+        self._maybe_reload()
+        return self.rule_set
+
+    def scan(self, text: Union[str, AnalyzedText]) -> RuleScanResult:
+        """Scan text once against every rule category."""
+        return self.current_rule_set().scan(text)
+
+    def check_harm_principle(self, text: Union[str, AnalyzedText]) -> bool:
         """Check if text violates no-harm principle."""
-        lower_text = text.lower()
-        return any(keyword in lower_text for keyword in self.rules.HARM_PRINCIPLES)
+        return self.scan(text).has("harm_principle")
 
-    def check_bias(self, text: str) -> bool:
+    def check_bias(self, text: Union[str, AnalyzedText]) -> bool:
         """Check for biased or discriminatory content."""
-        lower_text = text.lower()
-        return any(keyword in lower_text for keyword in self.rules.BIAS_INDICATORS)
+        return self.scan(text).has("bias")
 
-    def check_appropriateness(self, text: str) -> bool:
+    def check_appropriateness(self, text: Union[str, AnalyzedText]) -> bool:
         """Check for inappropriate or offensive content."""
-        lower_text = text.lower()
-        # Basic profanity check (expandable)
-        profanity_patterns = [
-            r'\b(fuck|shit|damn|bitch|asshole)\b',
-            r'\b(cunt|dick|pussy)\b'
-        ]
-        for pattern in profanity_patterns:
-            if re.search(pattern, lower_text, re.IGNORECASE):
-                return True
-        return any(keyword in lower_text for keyword in self.rules.INAPPROPRIATE_CONTENT)
-
-    def check_sensitive_topics(self, text: str) -> bool:
+        return self.scan(text).has("inappropriate_content")
+
+    def check_sensitive_topics(self, text: Union[str, AnalyzedText]) -> bool:
         """Check for sensitive or restricted topics."""
-        lower_text = text.lower()
-        return any(keyword in lower_text for keyword in self.rules.SENSITIVE_TOPICS)
+        return self.scan(text).has("sensitive_topics")
+
+class StreamValidator:
+    """
+    Validates a response as it is streamed, chunk by chunk.
+
+    Scanner state is carried across chunks, so terms split between chunks
+    are still caught, and each character is scanned a bounded number of
+    times. The first chunk that completes a violation blocks the stream:
+    ``feed`` returns False from then on and the violation is logged once.
+    """
+
+    PREVIEW_CHARS = 101  # enough for the log's 100-character preview and its ellipsis
+
+    def __init__(self, sentinel: 'EthicsSentinel'):
+        self.sentinel = sentinel
+        self.scanner = IncrementalRuleScanner(sentinel.content_filter.current_rule_set())
+        self.matches: List[RuleMatch] = []
+        self.violations: List[str] = []
+        self.blocked = False
+        self.finished = False
+        self._preview = ""
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Validate the next chunk.
+
+        Returns:
+            True if the stream is still clean and the chunk may be emitted
+        """
+        if self.blocked or self.finished:
+            return not self.blocked
+        if len(self._preview) < self.PREVIEW_CHARS:
+            self._preview = (self._preview + chunk)[:self.PREVIEW_CHARS]
+        return self._check(self.scanner.feed(chunk))
+
+    def finish(self) -> bool:
+        """
+        Close the stream, deciding any whole word that ended it.
+
+        Returns:
+            True if the complete response passed validation
+        """
+        if not self.blocked and not self.finished:
+            self.finished = True
+            return self._check(self.scanner.finish())
+        self.finished = True
+        return not self.blocked
+
+    def _check(self, found: List[RuleMatch]) -> bool:
+        if not found:
+            return True
+        self.matches.extend(found)
+        hit = {match.category for match in found}
+        self.violations = [category for category in self.scanner.rule_set.categories if category in hit]
+        self.blocked = True
+        self.sentinel._log_violation("response_stream", self._preview, self.violations)
+        logger.warning(f"ETHICAL VIOLATION DETECTED in streamed response at offset "
+                       f"{found[0].start}: {self.violations}. Stopping stream.")
+        return False
 
 class EthicsSentinel:
     """Main ethical guardrails system ensuring no-harm principle and content safety."""
 
-    def __init__(self):
-        self.content_filter = ContentFilter()
-        self.violation_log: List[Dict[str, Any]] = []
+    def __init__(self, rules_path: Optional[Union[str, Path]] = None,
+                 audit_log_path: Optional[Union[str, Path]] = None, recent_size: int = 100):
+        self.content_filter = ContentFilter(rules_path)
+        # Recent violations only; the full history goes to the audit log
+        self.violation_log: deque = deque(maxlen=recent_size)
+        self.total_violations = 0
+        self.violations_by_type: Counter = Counter()
+        self.violations_by_category: Counter = Counter()
+        self.log_lock = threading.Lock()
+        self.audit_log = AuditLogWriter(audit_log_path) if audit_log_path else None
         logger.info("Ethics Sentinel v3.0 is active. Monitoring all chatbot operations with comprehensive ethical guardrails.")
 
-    def validate_request(self, prompt: str) -> bool:
+    def validate_request(self, prompt: Union[str, AnalyzedText]) -> bool:
         """Validate user input against ethical guidelines."""
-        violations = []
-
-        if self.content_filter.check_harm_principle(prompt):
-            violations.append("harm_principle")
-        if self.content_filter.check_bias(prompt):
-            violations.append("bias")
-        if self.content_filter.check_appropriateness(prompt):
-            violations.append("inappropriate_content")
-        if self.content_filter.check_sensitive_topics(prompt):
-            violations.append("sensitive_topics")
+        analyzed = AnalyzedText.of(prompt)
+        violations = self.content_filter.scan(analyzed).categories
 
         if violations:
-            self._log_violation("request", prompt, violations)
+            self._log_violation("request", analyzed.text, violations)
             logger.warning(f"ETHICAL VIOLATION DETECTED in request: {violations}")
             return False
         return True
 
-    def validate_response(self, response_data: str) -> bool:
+    def validate_response(self, response_data: Union[str, AnalyzedText]) -> bool:
         """Validate generated response against ethical guidelines."""
-        violations = []
-
-        if self.content_filter.check_harm_principle(response_data):
-            violations.append("harm_principle")
-        if self.content_filter.check_bias(response_data):
-            violations.append("bias")
-        if self.content_filter.check_appropriateness(response_data):
-            violations.append("inappropriate_content")
-        if self.content_filter.check_sensitive_topics(response_data):
-            violations.append("sensitive_topics")
+        analyzed = AnalyzedText.of(response_data)
+        violations = self.content_filter.scan(analyzed).categories
 
         if violations:
-            self._log_violation("response", response_data, violations)
+            self._log_violation("response", analyzed.text, violations)
             logger.warning(f"ETHICAL VIOLATION DETECTED in response generation: {violations}. Blocking output.")
             return False
         return True
 
+    def stream_validator(self) -> StreamValidator:
+        """Start incremental validation of a streamed response."""
+        return StreamValidator(self)
+
     def _log_violation(self, violation_type: str, content: str, violations: List[str]):
         """Log ethical violations for auditing."""
         entry = {
             "type": violation_type,
             "violations": violations,
             "content_preview": content[:100] + "..." if len(content) > 100 else content,
-            "timestamp": "current_time"  # In real implementation, use datetime
+            "timestamp": datetime.now().isoformat()
         }
-        self.violation_log.append(entry)
+        with self.log_lock:
+            self.violation_log.append(entry)
+            self.total_violations += 1
+            self.violations_by_type[violation_type] += 1
+            self.violations_by_category.update(violations)
+            if self.audit_log is not None:
+                self.audit_log.write(entry)
 
     def get_violation_summary(self) -> Dict[str, Any]:
         """Get summary of violations for monitoring."""
-        return {
-            "total_violations": len(self.violation_log),
-            "recent_violations": self.violation_log[-10:] if self.violation_log else []
-        }
+        with self.log_lock:
+            recent = list(self.violation_log)[-10:]
+            summary = {
+                "total_violations": self.total_violations,
+                "recent_violations": recent,
+                "by_type": dict(self.violations_by_type),
+                "by_category": dict(self.violations_by_category)
+            }
+        if self.audit_log is not None:
+            summary["audit_log"] = self.audit_log.get_stats()
+        return summary
 
     def reset_violation_log(self):
-        """Reset the violation log (for testing or maintenance)."""
-        self.violation_log.clear()
+        """Reset the in-memory violation log and counters (the audit log is append-only)."""
+        with self.log_lock:
+            self.violation_log.clear()
+            self.total_violations = 0
+            self.violations_by_type.clear()
+            self.violations_by_category.clear()
         logger.info("Violation log reset.")
+
+    def close(self):
+        """Flush and close the audit log, if any."""
+        if self.audit_log is not None:
+            self.audit_log.close()
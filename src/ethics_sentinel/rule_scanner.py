@@ -0,0 +1,189 @@
+"""Compiled ethics rule sets scanned in a single pass.
+
+Every term of every rule category is compiled into one LiteralScanner, so a
+text is lowercased once and scanned once however many categories and terms
+there are. Each category holds ``keywords``, which match anywhere (the
+historical ``keyword in text.lower()`` check), and ``words``, which only match
+as whole words (``\\b...\\b``).
+"""
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple, Union
+
+from ..text_analysis import AnalyzedText
+from ..text_analysis.analyzed_text import word_boundary_at
+from ..text_analysis.literal_scanner import CASE_UNSAFE, LiteralScanner
+
+logger = logging.getLogger(__name__)
+
+class RuleMatch:
+    """One rule hit: the category, the term and its span in the lowercased text."""
+
+    __slots__ = ('category', 'term', 'start', 'end', 'whole_word')
+
+    def __init__(self, category: str, term: str, start: int, end: int, whole_word: bool = False):
+        self.category = category
+        self.term = term
+        self.start = start
+        self.end = end
+        self.whole_word = whole_word
+
+    def to_dict(self) -> Dict[str, Union[str, int]]:
+        return {"category": self.category, "term": self.term, "start": self.start, "end": self.end}
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, RuleMatch) and \
+            (self.category, self.term, self.start, self.end) == (other.category, other.term, other.start, other.end)
+
+    def __repr__(self) -> str:
+        return f"RuleMatch({self.category!r}, {self.term!r}, {self.start}, {self.end})"
+
+class RuleScanResult:
+    """Every rule match in one text, with the violated categories in rule-set order."""
+
+    def __init__(self, matches: List[RuleMatch], category_order: List[str]):
+        self.matches = matches
+        hit = {match.category for match in matches}
+        self.categories = [category for category in category_order if category in hit]
+
+    def has(self, category: str) -> bool:
+        return category in self.categories
+
+    def __bool__(self) -> bool:
+        return bool(self.matches)
+
+class EthicsRuleSet:
+    """
+    Immutable, compiled form of a category -> {keywords, words} rule mapping.
+    Rebuild a new instance to change rules; readers never see a half-built set.
+    """
+
+    def __init__(self, categories: Dict[str, Dict[str, Iterable[str]]]):
+        self.categories = list(categories)
+        # term -> [(category, whole_word)], in category order
+        self.term_rules: Dict[str, List[Tuple[str, bool]]] = {}
+        self.word_fallbacks: Dict[str, Pattern] = {}
+        for category, rules in categories.items():
+            words = [term.lower() for term in rules.get("words", ()) if term]
+            for term in rules.get("keywords", ()):
+                if term:
+                    self._add(term.lower(), category, False)
+            for term in words:
+                self._add(term, category, True)
+            if words:
+                self.word_fallbacks[category] = re.compile(
+                    r'\b(?:' + '|'.join(re.escape(term) for term in words) + r')\b', re.IGNORECASE)
+        self.scanner = LiteralScanner(self.term_rules)
+        self.max_term_length = self.scanner.max_length
+
+    def _add(self, term: str, category: str, whole_word: bool):
+        rules = self.term_rules.setdefault(term, [])
+        if (category, whole_word) not in rules:
+            rules.append((category, whole_word))
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> 'EthicsRuleSet':
+        """
+        Load rules from a JSON file of the form
+        ``{"category": {"keywords": [...], "words": [...]}, ...}``.
+        Categories are reported in file order.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or not all(isinstance(rules, dict) for rules in data.values()):
+            raise ValueError(f"Ethics rule file {path} must map each category to keywords/words lists")
+        return cls(data)
+
+    @property
+    def term_count(self) -> int:
+        return len(self.term_rules)
+
+    def scan(self, text: Union[str, AnalyzedText]) -> RuleScanResult:
+        """Scan the lowercased text once and report every match of every category."""
+        return RuleScanResult(self.match_lower(AnalyzedText.of(text).lower), self.categories)
+
+    def match_lower(self, lower: str) -> List[RuleMatch]:
+        """
+        Every match in already-lowercased text, ordered by start offset. The
+        ends of ``lower`` count as word boundaries.
+        """
+        # re.IGNORECASE lets a few non-ASCII letters stand in for ASCII ones
+        # inside whole words; defer to the regex for those rare texts.
+        regex_words = not lower.isascii() and CASE_UNSAFE.search(lower) is not None
+
+        matches = []
+        for start, term in self.scanner.finditer(lower):
+            end = start + len(term)
+            for category, whole_word in self.term_rules[term]:
+                if whole_word and (regex_words or not self._whole_word_at(lower, start, end)):
+                    continue
+                matches.append(RuleMatch(category, term, start, end, whole_word))
+
+        if regex_words:
+            for category, pattern in self.word_fallbacks.items():
+                matches.extend(RuleMatch(category, match.group(0), match.start(), match.end(), True)
+                               for match in pattern.finditer(lower))
+            matches.sort(key=lambda match: (match.start, match.end))
+
+        return matches
+
+    @staticmethod
+    def _whole_word_at(text: str, start: int, end: int) -> bool:
+        """True when ``\\b`` holds at both ends of ``text[start:end]``."""
+        return word_boundary_at(text, start) and word_boundary_at(text, end)
+
+class IncrementalRuleScanner:
+    """
+    Scans text that arrives in chunks, reporting each match exactly once.
+
+    Only the last ``max_term_length + 1`` lowercased characters are carried
+    between chunks: enough for a term to straddle the boundary and for the
+    character before a whole word. Each chunk is scanned together with that
+    tail, so total work stays linear in the stream length. A whole word ending
+    exactly at the end of the data so far is held back until the next chunk
+    (or ``finish``) shows whether a word character follows it.
+    """
+
+    def __init__(self, rule_set: EthicsRuleSet):
+        self.rule_set = rule_set
+        self.length = 0  # lowercased characters consumed so far
+        self._tail = ''
+        # Matches ending at or before these offsets have been decided
+        self._decided_keywords = 0
+        self._decided_words = 0
+
+    def feed(self, chunk: str) -> List[RuleMatch]:
+        """Consume the next chunk and return matches that became certain, with stream offsets."""
+        lower = chunk.lower()
+        if not lower:
+            return []
+        window = self._tail + lower
+        base = self.length - len(self._tail)
+        self.length += len(lower)
+
+        found = self._collect(window, base, pending_words=True)
+        self._decided_keywords = self.length
+        self._decided_words = self.length - 1
+        keep = self.rule_set.max_term_length + 1
+        self._tail = window[-keep:]
+        return found
+
+    def finish(self) -> List[RuleMatch]:
+        """Resolve whole words held back at the end of the stream."""
+        found = self._collect(self._tail, self.length - len(self._tail), pending_words=False)
+        self._decided_words = self.length
+        return found
+
+    def _collect(self, window: str, base: int, pending_words: bool) -> List[RuleMatch]:
+        found = []
+        for match in self.rule_set.match_lower(window):
+            end = base + match.end
+            if match.whole_word:
+                if end <= self._decided_words or (pending_words and end == self.length):
+                    continue
+            elif end <= self._decided_keywords:
+                continue
+            found.append(RuleMatch(match.category, match.term, base + match.start, end, match.whole_word))
+        return found
@@ -1,5 +1,13 @@
 # src/memory_trace_manager/__init__.py
 
+from .backends import MemoryBackend, Neo4jBackend
+from .concept_index import ConceptIndex
+from .concepts import ConceptExtractor
 from .memory_graph import MemoryTraceManager
+from .persistence import WriteBehindWriter
+from .pool import SessionPool
+from .retention import RetentionScheduler
+from .sqlite_backend import SQLiteGraphBackend
 
-__all__ = ['MemoryTraceManager']
+__all__ = ['MemoryTraceManager', 'WriteBehindWriter', 'MemoryBackend', 'Neo4jBackend', 'SQLiteGraphBackend',
+           'ConceptIndex', 'SessionPool', 'ConceptExtractor', 'RetentionScheduler']
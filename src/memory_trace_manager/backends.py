@@ -0,0 +1,395 @@
+"""Storage backends behind MemoryTraceManager.
+
+A backend persists interaction rows and answers the recall and context
+queries built on them. Neo4jBackend keeps the graph in Neo4j; the embedded
+SQLiteGraphBackend (see sqlite_backend.py) keeps the same
+User/Interaction/Concept/MENTIONS model in one local file for deployments
+without a graph server.
+
+An interaction row is a dict with ``user_id``, ``interaction_id``,
+``user_message``, ``assistant_response``, ``timestamp`` (ISO string) and
+``mentions``, a list of ``{'concept': ..., 'source': 'user'|'assistant'}``.
+
+Interactions past the retention window are compacted into per-user,
+per-period summaries (see retention.py): an InteractionSummary linked from
+its User by HAS_SUMMARY and to each Concept by SUMMARIZES, whose
+``frequency`` counts the mentions it replaced.
+"""
+import logging
+from typing import Any, Dict, Iterator, List, Optional
+
+from .pool import SessionPool
+from .retention import batch_report, summarize
+
+logger = logging.getLogger(__name__)
+
+# Writes whole interactions in one statement: the user, the interaction, its
+# HAS_INTERACTION link and every MENTIONS link, for a list of interactions.
+# Concepts are UNWOUND instead of costing one round trip each. Everything is
+# MERGEd, so retrying a batch whose commit outcome was unknown (a lost
+# acknowledgement or a timeout after commit) does not write it twice.
+# Interaction ids are second-resolution, so the microsecond timestamp joins
+# the id (an index seek) to tell apart turns of the same second.
+STORE_INTERACTIONS_QUERY = """
+    UNWIND $interactions AS row
+    MERGE (u:User {id: row.user_id})
+    SET u.last_interaction = row.timestamp
+    MERGE (i:Interaction {id: row.interaction_id, timestamp: row.timestamp})
+    ON CREATE SET i.user_message = row.user_message,
+                  i.assistant_response = row.assistant_response,
+                  i.user_id = row.user_id
+    MERGE (u)-[:HAS_INTERACTION]->(i)
+    WITH i, row
+    UNWIND row.mentions AS mention
+    MERGE (c:Concept {name: mention.concept})
+    MERGE (i)-[:MENTIONS {source: mention.source}]->(c)
+    """
+
+# Recall queries take the concepts as a parameter, so every concept set shares
+# one query text and one cached plan; lookups start from index seeks on
+# User.id and Concept.name.
+RECALL_BY_CONCEPTS_QUERY = """
+    MATCH (u:User {id: $user_id})-[:HAS_INTERACTION]->(i:Interaction)-[:MENTIONS]->(c:Concept)
+    WHERE c.name IN $concepts
+    RETURN i.user_message as message, i.assistant_response as response,
+           i.timestamp as timestamp, count(c) as relevance_score
+    ORDER BY relevance_score DESC, i.timestamp DESC
+    LIMIT $limit
+    """
+
+RECENT_INTERACTIONS_QUERY = """
+    MATCH (u:User {id: $user_id})-[:HAS_INTERACTION]->(i:Interaction)
+    RETURN i.user_message as message, i.assistant_response as response,
+           i.timestamp as timestamp, 1 as relevance_score
+    ORDER BY i.timestamp DESC
+    LIMIT $limit
+    """
+
+# A user's latest interactions with their mentions, returned oldest first in
+# the row format used for writes
+USER_INTERACTIONS_QUERY = """
+    MATCH (u:User {id: $user_id})-[:HAS_INTERACTION]->(i:Interaction)
+    WITH i ORDER BY i.timestamp DESC LIMIT $limit
+    OPTIONAL MATCH (i)-[m:MENTIONS]->(c:Concept)
+    WITH i, collect(CASE WHEN c IS NULL THEN null ELSE {concept: c.name, source: m.source} END) as mentions
+    RETURN i.id as interaction_id, i.user_message as user_message,
+           i.assistant_response as assistant_response, i.timestamp as timestamp, mentions
+    ORDER BY i.timestamp
+    """
+
+# Backfill: page through every interaction's texts, then swap its MENTIONS
+# links. Pages resume from the last timestamp seen, a range seek on the
+# timestamp index returning rows in index order, so each page costs its own
+# size rather than a scan and sort of the whole graph. Rows sharing the
+# boundary timestamp are re-read and skipped by key on the client.
+INTERACTION_TEXTS_QUERY = """
+    MATCH (i:Interaction)
+    WHERE i.timestamp >= $after
+    RETURN elementId(i) as key, i.timestamp as timestamp,
+           i.user_message as user_message, i.assistant_response as assistant_response
+    ORDER BY i.timestamp
+    LIMIT $limit
+    """
+
+REPLACE_MENTIONS_QUERY = """
+    UNWIND $rows AS row
+    MATCH (i:Interaction) WHERE elementId(i) = row.key
+    FOREACH (m IN [(i)-[r:MENTIONS]->() | r] | DELETE m)
+    WITH i, row
+    UNWIND row.mentions AS mention
+    MERGE (c:Concept {name: mention.concept})
+    CREATE (i)-[:MENTIONS {source: mention.source}]->(c)
+    """
+
+# User totals count compacted interactions through their summaries
+USER_STATS_QUERY = """
+    MATCH (u:User {id: $user_id})
+    OPTIONAL MATCH (u)-[:HAS_INTERACTION]->(i:Interaction)
+    WITH u, count(i) as retained
+    OPTIONAL MATCH (u)-[:HAS_SUMMARY]->(s:InteractionSummary)
+    WITH u, retained, sum(s.interaction_count) as compacted
+    RETURN u.last_interaction as last_interaction, retained + compacted as interaction_count
+    """
+
+USER_CONCEPTS_QUERY = """
+    MATCH (u:User {id: $user_id})
+    CALL {
+        WITH u
+        MATCH (u)-[:HAS_INTERACTION]->(:Interaction)-[:MENTIONS]->(c:Concept)
+        RETURN c.name as concept, count(c) as frequency
+        UNION ALL
+        WITH u
+        MATCH (u)-[:HAS_SUMMARY]->(:InteractionSummary)-[m:SUMMARIZES]->(c:Concept)
+        RETURN c.name as concept, m.frequency as frequency
+    }
+    RETURN concept, sum(frequency) as frequency
+    ORDER BY frequency DESC
+    LIMIT $limit
+    """
+
+# Compaction: the oldest interactions before $cutoff (a range seek on the
+# timestamp index), then their summaries merged in and the raw nodes deleted
+COMPACTION_BATCH_QUERY = """
+    MATCH (i:Interaction)
+    WHERE i.timestamp < $cutoff
+    WITH i ORDER BY i.timestamp LIMIT $limit
+    OPTIONAL MATCH (i)-[:MENTIONS]->(c:Concept)
+    RETURN elementId(i) as key, i.user_id as user_id, i.timestamp as timestamp,
+           size(coalesce(i.user_message, '')) + size(coalesce(i.assistant_response, '')) as text_chars,
+           collect(c.name) as concepts
+    """
+
+MERGE_SUMMARIES_QUERY = """
+    UNWIND $summaries AS row
+    MERGE (u:User {id: row.user_id})
+    MERGE (u)-[:HAS_SUMMARY]->(s:InteractionSummary {user_id: row.user_id, period: row.period})
+    ON CREATE SET s.interaction_count = 0, s.first_timestamp = row.first_timestamp,
+                  s.last_timestamp = row.last_timestamp
+    SET s.interaction_count = s.interaction_count + row.interaction_count,
+        s.first_timestamp = CASE WHEN row.first_timestamp < s.first_timestamp
+                                 THEN row.first_timestamp ELSE s.first_timestamp END,
+        s.last_timestamp = CASE WHEN row.last_timestamp > s.last_timestamp
+                                THEN row.last_timestamp ELSE s.last_timestamp END
+    WITH s, row
+    UNWIND row.concepts AS concept
+    MERGE (c:Concept {name: concept.concept})
+    MERGE (s)-[m:SUMMARIZES]->(c)
+    ON CREATE SET m.frequency = 0
+    SET m.frequency = m.frequency + concept.frequency
+    """
+
+DELETE_INTERACTIONS_QUERY = """
+    UNWIND $keys AS key
+    MATCH (i:Interaction) WHERE elementId(i) = key
+    DETACH DELETE i
+    """
+
+# Idempotent schema bootstrap. User and Concept nodes are MERGEd, so they get
+# uniqueness constraints (which are also indexes). Interaction ids are only
+# second-resolution and may repeat, so they get a plain index.
+SCHEMA_STATEMENTS = (
+    "CREATE CONSTRAINT user_id IF NOT EXISTS FOR (u:User) REQUIRE u.id IS UNIQUE",
+    "CREATE CONSTRAINT concept_name IF NOT EXISTS FOR (c:Concept) REQUIRE c.name IS UNIQUE",
+    "CREATE INDEX interaction_id IF NOT EXISTS FOR (i:Interaction) ON (i.id)",
+    "CREATE INDEX interaction_timestamp IF NOT EXISTS FOR (i:Interaction) ON (i.timestamp)",
+    "CREATE INDEX interaction_summary_period IF NOT EXISTS FOR (s:InteractionSummary) ON (s.user_id, s.period)",
+)
+
+def _store_interactions(tx, interactions: List[Dict[str, Any]]):
+    tx.run(STORE_INTERACTIONS_QUERY, interactions=interactions).consume()
+
+def _replace_mentions(tx, rows: List[Dict[str, Any]]):
+    tx.run(REPLACE_MENTIONS_QUERY, rows=rows).consume()
+
+def _merge_summaries(tx, summaries: List[Dict[str, Any]]):
+    tx.run(MERGE_SUMMARIES_QUERY, summaries=summaries).consume()
+
+def _compact_batch(tx, cutoff: str, period: str, limit: int) -> Dict[str, Any]:
+    rows = [record.data() for record in tx.run(COMPACTION_BATCH_QUERY, cutoff=cutoff, limit=limit)]
+    summaries = summarize(rows, period)
+    if rows:
+        _merge_summaries(tx, summaries)
+        tx.run(DELETE_INTERACTIONS_QUERY, keys=[row['key'] for row in rows]).consume()
+    return batch_report(rows, summaries)
+
+def _load_interactions(tx, user_id: str, limit: int) -> List[Dict[str, Any]]:
+    return [{'user_id': user_id, **record.data()}
+            for record in tx.run(USER_INTERACTIONS_QUERY, user_id=user_id, limit=limit)]
+
+class MemoryBackend:
+    """
+    Interface shared by memory storage backends. Recall results are dicts
+    with ``message``, ``response``, ``timestamp`` and ``relevance_score``,
+    most relevant (then most recent) first.
+    """
+
+    name = 'abstract'
+
+    def ensure_schema(self) -> bool:
+        raise NotImplementedError
+
+    def write_interactions(self, interactions: List[Dict[str, Any]]):
+        raise NotImplementedError
+
+    def recall_by_concepts(self, user_id: str, concepts: List[str], limit: int) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def recent_interactions(self, user_id: str, limit: int) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def load_interactions(self, user_id: str, limit: int) -> List[Dict[str, Any]]:
+        """The user's latest ``limit`` interaction rows, with mentions, oldest first."""
+        raise NotImplementedError
+
+    def iter_interaction_texts(self, batch_size: int = 500) -> Iterator[List[Dict[str, Any]]]:
+        """Batches of ``{'key', 'user_message', 'assistant_response'}`` covering every stored interaction."""
+        raise NotImplementedError
+
+    def replace_mentions(self, rows: List[Dict[str, Any]]):
+        """Swap the MENTIONS of each ``{'key', 'mentions'}`` row's interaction for the given ones."""
+        raise NotImplementedError
+
+    def compact_interactions(self, cutoff: str, period: str, batch_size: int = 1000) -> Dict[str, Any]:
+        """
+        Fold up to ``batch_size`` of the oldest interactions timestamped
+        before ``cutoff`` into their user and period summaries and delete
+        them, in one transaction.
+
+        Returns:
+            The batch's ``interactions``, ``mentions``, ``summaries`` and ``text_chars``
+            counts and the ``users`` it touched; no interactions once nothing is left
+        """
+        raise NotImplementedError
+
+    def merge_summaries(self, summaries: List[Dict[str, Any]]):
+        """Add summary rows (as produced by retention.summarize) onto the stored ones."""
+        raise NotImplementedError
+
+    def user_stats(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        ``last_interaction`` and ``interaction_count`` of a user, counting
+        compacted interactions too, or None for an unknown user.
+        """
+        raise NotImplementedError
+
+    def user_concepts(self, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """The user's most mentioned concepts, summaries included, as ``{'name', 'frequency'}`` dicts."""
+        raise NotImplementedError
+
+    def add_concept(self, concept: str, properties: Dict[str, Any]):
+        raise NotImplementedError
+
+    def create_relationship(self, concept1: str, relationship: str, concept2: str):
+        raise NotImplementedError
+
+    def related(self, concept: str) -> List[Dict[str, Any]]:
+        """Every relationship touching ``concept``, in either direction."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class Neo4jBackend(MemoryBackend):
+    """
+    Memory graph kept in Neo4j, reached through an already connected driver.
+    Reads borrow sessions from ``read_pool`` when one is given, which may
+    wrap a different driver (a read replica); writes always use ``driver``.
+    """
+
+    name = 'neo4j'
+
+    def __init__(self, driver, read_pool: Optional[SessionPool] = None):
+        self.driver = driver
+        self.read_pool = read_pool
+
+    def _read_session(self):
+        return self.read_pool.session() if self.read_pool else self.driver.session()
+
+    def get_pool_stats(self) -> Optional[Dict[str, Any]]:
+        return self.read_pool.get_stats() if self.read_pool else None
+
+    def ensure_schema(self) -> bool:
+        try:
+            with self.driver.session() as session:
+                for statement in SCHEMA_STATEMENTS:
+                    session.run(statement).consume()
+        except Exception as e:
+            logger.error(f"Could not bootstrap the memory graph schema: {e}")
+            return False
+        logger.info("Memory graph schema ensured")
+        return True
+
+    def write_interactions(self, interactions: List[Dict[str, Any]]):
+        """Persist interaction rows in one explicit write transaction and one round trip."""
+        with self.driver.session() as session:
+            session.execute_write(_store_interactions, interactions)
+
+    def _records(self, query: str, **parameters) -> List[Dict[str, Any]]:
+        with self._read_session() as session:
+            return [
+                {
+                    'message': record['message'],
+                    'response': record['response'],
+                    'timestamp': record['timestamp'],
+                    'relevance_score': record['relevance_score']
+                }
+                for record in session.run(query, **parameters)
+            ]
+
+    def recall_by_concepts(self, user_id: str, concepts: List[str], limit: int) -> List[Dict[str, Any]]:
+        return self._records(RECALL_BY_CONCEPTS_QUERY, user_id=user_id, concepts=concepts, limit=limit)
+
+    def recent_interactions(self, user_id: str, limit: int) -> List[Dict[str, Any]]:
+        return self._records(RECENT_INTERACTIONS_QUERY, user_id=user_id, limit=limit)
+
+    def load_interactions(self, user_id: str, limit: int) -> List[Dict[str, Any]]:
+        with self._read_session() as session:
+            return list(session.execute_read(_load_interactions, user_id, limit))
+
+    def iter_interaction_texts(self, batch_size: int = 500) -> Iterator[List[Dict[str, Any]]]:
+        after, seen = '', set()
+        while True:
+            # Over-fetch by the rows already seen at the boundary, so a page always holds new ones
+            with self.driver.session() as session:
+                records = [record.data() for record in
+                           session.run(INTERACTION_TEXTS_QUERY, after=after, limit=batch_size + len(seen))]
+            batch = [row for row in records if not (row['timestamp'] == after and row['key'] in seen)]
+            if not batch:
+                return
+            last = batch[-1]['timestamp']
+            if last != after:
+                after, seen = last, set()
+            seen.update(row['key'] for row in batch if row['timestamp'] == last)
+            yield batch
+
+    def replace_mentions(self, rows: List[Dict[str, Any]]):
+        with self.driver.session() as session:
+            session.execute_write(_replace_mentions, rows)
+
+    def compact_interactions(self, cutoff: str, period: str, batch_size: int = 1000) -> Dict[str, Any]:
+        with self.driver.session() as session:
+            return session.execute_write(_compact_batch, cutoff, period, batch_size)
+
+    def merge_summaries(self, summaries: List[Dict[str, Any]]):
+        with self.driver.session() as session:
+            session.execute_write(_merge_summaries, summaries)
+
+    def user_stats(self, user_id: str) -> Optional[Dict[str, Any]]:
+        with self._read_session() as session:
+            record = session.run(USER_STATS_QUERY, user_id=user_id).single()
+        if not record:
+            return None
+        return {'last_interaction': record['last_interaction'], 'interaction_count': record['interaction_count']}
+
+    def user_concepts(self, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        with self._read_session() as session:
+            result = session.run(USER_CONCEPTS_QUERY, user_id=user_id, limit=limit)
+            return [{'name': r['concept'], 'frequency': r['frequency']} for r in result]
+
+    def add_concept(self, concept: str, properties: Dict[str, Any]):
+        with self.driver.session() as session:
+            session.run("MERGE (c:Concept {name: $concept}) SET c += $properties",
+                        concept=concept, properties=properties)
+
+    def create_relationship(self, concept1: str, relationship: str, concept2: str):
+        with self.driver.session() as session:
+            query = (
+                "MATCH (a:Concept {name: $concept1}) "
+                "MATCH (b:Concept {name: $concept2}) "
+                "MERGE (a)-[r:%s]->(b)" % relationship.upper()
+            )
+            session.run(query, concept1=concept1, concept2=concept2)
+
+    def related(self, concept: str) -> List[Dict[str, Any]]:
+        with self._read_session() as session:
+            result = session.run("MATCH (c:Concept {name: $concept})-[r]-(related) "
+                                 "RETURN type(r) as relationship, related.name as related_concept",
+                                 concept=concept)
+            return [{"relationship": record["relationship"], "concept": record["related_concept"]} for record in result]
+
+    def close(self):
+        if self.read_pool:
+            self.read_pool.close()
+            if self.read_pool.driver is not self.driver:
+                self.read_pool.driver.close()
+        self.driver.close()
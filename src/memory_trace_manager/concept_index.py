@@ -0,0 +1,237 @@
+"""Per-user inverted concept index answering recall without a database query.
+
+Each user's recent interactions get compact integer ids, assigned in
+insertion order. Every concept maps to an ``array('I')`` posting list of the
+ids that mention it, one entry per mention. A concept mentioned by both the
+user and the assistant therefore counts twice, exactly as the count over
+MENTIONS links does in the graph query. Concepts themselves are interned to
+integers shared by all users.
+
+The index only covers a user's most recent ``window`` interactions. Older ids
+fall below the user's floor, and the dead prefixes of the posting lists are
+trimmed in bulk once enough of them have piled up. Message and response
+texts longer than ``max_text_chars`` are not held in memory. Such an
+interaction still ranks normally, but when it comes out on top the caller
+falls back to the store.
+"""
+import heapq
+import logging
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Rough CPython cost of one held interaction beyond its texts: the entry
+# tuple, its dict slot and the timestamp string.
+ENTRY_OVERHEAD_BYTES = 200
+POSTING_OVERHEAD_BYTES = 80
+
+class _UserPostings:
+    __slots__ = ('postings', 'entries', 'next_id', 'floor', 'stale', 'text_bytes', 'truncated')
+
+    def __init__(self):
+        self.postings: Dict[int, array] = {}
+        # local id -> (message, response, timestamp); texts are None when over budget
+        self.entries: Dict[int, tuple] = {}
+        self.next_id = 0
+        self.floor = 0
+        self.stale = 0
+        self.text_bytes = 0
+        # True once the user has history older than the window
+        self.truncated = False
+
+class ConceptIndex:
+    """
+    Inverted index from concept to interaction, per user, kept next to the
+    store by MemoryTraceManager. Users are held in LRU order and at most
+    ``max_users`` of them stay loaded. An evicted user is reloaded from the
+    store on their next request.
+    """
+
+    def __init__(self, window: int = 1000, max_users: int = 10000, max_text_chars: int = 4000):
+        self.window = window
+        self.max_users = max_users
+        self.max_text_chars = max_text_chars
+        self.users: "OrderedDict[str, _UserPostings]" = OrderedDict()
+        self.concept_ids: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.fallbacks = 0
+        self.loads = 0
+        self.user_evictions = 0
+
+    def __contains__(self, user_id: str) -> bool:
+        with self.lock:
+            return user_id in self.users
+
+    def load(self, user_id: str, rows: Iterable[Dict[str, Any]]) -> bool:
+        """
+        Build one user's postings from stored interaction rows, oldest first,
+        in the row format used for writes. A user who is already loaded is
+        kept as is: a concurrent load may have won the race and indexed newer
+        rows since, which an older snapshot would lose. Call discard() first
+        to force a rebuild.
+
+        Returns:
+            False when the user was already loaded and ``rows`` were ignored
+        """
+        user = _UserPostings()
+        with self.lock:
+            if user_id in self.users:
+                self.users.move_to_end(user_id)
+                return False
+            for row in rows:
+                self._add(user, row)
+            user.truncated = user.truncated or len(user.entries) >= self.window
+            self.users[user_id] = user
+            self.users.move_to_end(user_id)
+            self.loads += 1
+            while len(self.users) > self.max_users:
+                self.users.popitem(last=False)
+                self.user_evictions += 1
+            return True
+
+    def add(self, row: Dict[str, Any]) -> bool:
+        """Index one new interaction row. Returns False when its user is not loaded."""
+        with self.lock:
+            user = self.users.get(row['user_id'])
+            if user is None:
+                return False
+            self.users.move_to_end(row['user_id'])
+            self._add(user, row)
+            return True
+
+    def _add(self, user: _UserPostings, row: Dict[str, Any]):
+        local_id = user.next_id
+        user.next_id += 1
+        message, response = row['user_message'], row['assistant_response']
+        if len(message) + len(response) > self.max_text_chars:
+            message = response = None
+        else:
+            user.text_bytes += len(message) + len(response)
+        user.entries[local_id] = (message, response, row['timestamp'])
+        concept_ids = self.concept_ids
+        for mention in row['mentions']:
+            concept_id = concept_ids.setdefault(mention['concept'], len(concept_ids))
+            posting = user.postings.get(concept_id)
+            if posting is None:
+                posting = user.postings[concept_id] = array('I')
+            posting.append(local_id)
+
+        while len(user.entries) > self.window:
+            evicted = user.entries.pop(user.floor)
+            if evicted[0] is not None:
+                user.text_bytes -= len(evicted[0]) + len(evicted[1])
+            user.floor += 1
+            user.stale += 1
+            user.truncated = True
+        if user.stale > self.window // 2:
+            self._compact(user)
+
+    @staticmethod
+    def _compact(user: _UserPostings):
+        for concept_id, posting in list(user.postings.items()):
+            cut = bisect_left(posting, user.floor)
+            if cut == len(posting):
+                del user.postings[concept_id]
+            elif cut:
+                del posting[:cut]
+        user.stale = 0
+
+    def _records(self, user: _UserPostings, ranked: List[tuple]) -> Optional[List[Dict[str, Any]]]:
+        if not ranked:
+            return []
+        message, response, timestamp = user.entries[ranked[0][1]]
+        if message is None:
+            # Top hit's texts are not held; let the store answer
+            self.fallbacks += 1
+            return None
+        self.hits += 1
+        records = [{'message': message, 'response': response, 'timestamp': timestamp,
+                    'relevance_score': ranked[0][0]}]
+        for score, local_id in ranked[1:]:
+            message, response, timestamp = user.entries[local_id]
+            records.append({'message': message, 'response': response, 'timestamp': timestamp,
+                            'relevance_score': score})
+        return records
+
+    def recall_by_concepts(self, user_id: str, concepts: Iterable[str], limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Top ``limit`` interactions by number of mentions of ``concepts``, then
+        by recency, in the shape MemoryBackend.recall_by_concepts returns.
+        Returns None when the store has to answer instead: the user is not
+        loaded, the top hit's texts are not held, or nothing in the window
+        matched but the user has older history. Only the top record is
+        guaranteed to carry texts.
+        """
+        with self.lock:
+            user = self.users.get(user_id)
+            if user is None:
+                return None
+            self.users.move_to_end(user_id)
+            scores: Counter = Counter()
+            floor = user.floor
+            for concept in set(concepts):
+                concept_id = self.concept_ids.get(concept)
+                posting = user.postings.get(concept_id) if concept_id is not None else None
+                if posting:
+                    start = bisect_left(posting, floor) if posting[0] < floor else 0
+                    scores.update(posting[start:] if start else posting)
+            if not scores and user.truncated:
+                self.fallbacks += 1
+                return None
+            entries = user.entries
+            ranked = heapq.nlargest(limit, scores.items(),
+                                    key=lambda item: (item[1], entries[item[0]][2]))
+            return self._records(user, [(score, local_id) for local_id, score in ranked])
+
+    def recent_interactions(self, user_id: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """Latest ``limit`` interactions with a relevance of 1, or None as for recall_by_concepts."""
+        with self.lock:
+            user = self.users.get(user_id)
+            if user is None:
+                return None
+            self.users.move_to_end(user_id)
+            entries = user.entries
+            ranked = heapq.nlargest(limit, entries, key=lambda local_id: entries[local_id][2])
+            return self._records(user, [(1, local_id) for local_id in ranked])
+
+    def discard(self, user_ids: Iterable[str]):
+        """Drop these users' postings, e.g. after their stored history changed; they reload on next use."""
+        with self.lock:
+            for user_id in user_ids:
+                self.users.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.users.clear()
+            self.concept_ids.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            interactions = sum(len(user.entries) for user in self.users.values())
+            posting_lists = sum(len(user.postings) for user in self.users.values())
+            posting_bytes = sum(posting.itemsize * len(posting)
+                                for user in self.users.values() for posting in user.postings.values())
+            text_bytes = sum(user.text_bytes for user in self.users.values())
+            total = (posting_bytes + posting_lists * POSTING_OVERHEAD_BYTES + text_bytes +
+                     interactions * ENTRY_OVERHEAD_BYTES)
+            return {
+                "users": len(self.users),
+                "max_users": self.max_users,
+                "interactions": interactions,
+                "window": self.window,
+                "concepts": len(self.concept_ids),
+                "posting_lists": posting_lists,
+                "posting_bytes": posting_bytes,
+                "text_bytes": text_bytes,
+                "approx_bytes": total,
+                "bytes_per_interaction": total / interactions if interactions else 0.0,
+                "hits": self.hits,
+                "fallbacks": self.fallbacks,
+                "loads": self.loads,
+                "user_evictions": self.user_evictions
+            }
@@ -0,0 +1,126 @@
+"""Concept extraction for memory linking.
+
+A concept is a lowercased whitespace token with the punctuation ``.,!?;:``
+stripped from both ends, at least ``min_length`` characters long and not a
+stopword. Optionally, runs of two or three consecutive concepts inside one
+clause (punctuation ends a clause) become phrase concepts such as
+``"graph databases"``.
+
+Unigram extraction de-duplicates the raw tokens first and only strips the
+few that carry punctuation, so no per-word list of candidates is built. A
+chat turn extracts the user's message twice, once to recall and once to
+store, so recent results are memoized.
+"""
+import functools
+import logging
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+PUNCTUATION = '.,!?;:'
+
+DEFAULT_STOPWORDS = frozenset([
+    'that', 'this', 'with', 'from', 'they', 'have', 'been', 'were', 'what', 'when', 'where', 'how', 'why', 'who'
+])
+
+def load_stopwords(path: Union[str, Path]) -> frozenset:
+    """
+    Read a stopword file: one word per line, blank lines and ``#`` comments
+    ignored, matched case-insensitively.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        words = (line.split('#', 1)[0].strip().lower() for line in f)
+        return frozenset(word for word in words if word)
+
+class ConceptExtractor:
+    """
+    Reusable, immutable concept extractor.
+
+    Args:
+        stopwords: Words never treated as concepts
+        min_length: Shortest concept, in characters
+        max_ngram: 1 for single words; 2 or 3 to add phrase concepts of up to that many words
+        max_concepts: Keep only this many concepts per text, highest weight first
+        cache_size: Recently extracted texts remembered; 0 disables the memo
+    """
+
+    def __init__(self, stopwords: Iterable[str] = DEFAULT_STOPWORDS, min_length: int = 4,
+                 max_ngram: int = 1, max_concepts: Optional[int] = None, cache_size: int = 256):
+        if not 1 <= max_ngram <= 3:
+            raise ValueError(f"max_ngram must be 1, 2 or 3, got {max_ngram}")
+        self.stopwords = frozenset(stopwords)
+        self.min_length = min_length
+        self.max_ngram = max_ngram
+        self.max_concepts = max_concepts
+        self._extract = functools.lru_cache(maxsize=cache_size)(self._concepts) if cache_size else self._concepts
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], **kwargs) -> 'ConceptExtractor':
+        """Extractor using the stopwords in ``path`` instead of the built-in list."""
+        stopwords = load_stopwords(path)
+        logger.info(f"Loaded {len(stopwords)} concept stopwords from {path}")
+        return cls(stopwords, **kwargs)
+
+    def _is_concept(self, word: str) -> bool:
+        return len(word) >= self.min_length and word not in self.stopwords
+
+    def extract(self, text: str) -> List[str]:
+        """Distinct concepts of ``text``; unordered unless ``max_concepts`` ranks them."""
+        return list(self._extract(text))
+
+    def _concepts(self, text: str) -> Tuple[str, ...]:
+        if self.max_ngram > 1 or self.max_concepts is not None:
+            return tuple(concept for concept, _ in self.extract_weighted(text))
+        words = set(text.lower().split())
+        punctuated = [word for word in words if word[0] in PUNCTUATION or word[-1] in PUNCTUATION]
+        if punctuated:
+            words.difference_update(punctuated)
+            words.update([word.strip(PUNCTUATION) for word in punctuated])
+        min_length, stopwords = self.min_length, self.stopwords
+        return tuple(word for word in words if len(word) >= min_length and word not in stopwords)
+
+    def cache_info(self):
+        """Hit and miss counts of the extraction memo, or None when it is disabled."""
+        return self._extract.cache_info() if self._extract is not self._concepts else None
+
+    def extract_weighted(self, text: str) -> List[Tuple[str, int]]:
+        """
+        Concepts with their weights, highest first (ties in order of first
+        occurrence). A word weighs its number of occurrences; a phrase weighs
+        its occurrences times its length in words, so a phrase seen as often
+        as its words outranks them.
+        """
+        weights: Counter = Counter()
+        run: List[str] = []
+        for token in text.lower().split():
+            word = token.strip(PUNCTUATION)
+            if not self._is_concept(word):
+                run = []
+                continue
+            if token[0] in PUNCTUATION:
+                run = []
+            run.append(word)
+            weights[word] += 1
+            for n in range(2, min(self.max_ngram, len(run)) + 1):
+                weights[' '.join(run[-n:])] += n
+            if token[-1] in PUNCTUATION:
+                run = []
+        ranked = sorted(weights.items(), key=lambda item: -item[1])
+        return ranked[:self.max_concepts] if self.max_concepts is not None else ranked
+
+    def extract_batch(self, texts: Iterable[str]) -> List[List[str]]:
+        """
+        ``extract`` over many texts, e.g. when backfilling stored interactions.
+        Repeated texts in the batch are extracted once, bypassing the memo so
+        a bulk pass does not evict the live chat's entries.
+        """
+        seen: Dict[str, Tuple[str, ...]] = {}
+        results = []
+        for text in texts:
+            concepts = seen.get(text)
+            if concepts is None:
+                concepts = seen[text] = self._concepts(text)
+            results.append(list(concepts))
+        return results
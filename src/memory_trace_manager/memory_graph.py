@@ -1,9 +1,22 @@
 import neo4j
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional
 from datetime import datetime, timedelta
 import hashlib
 import json
+import random
+import threading
+from contextlib import contextmanager
+
+from ..response_cache import LRUTTLCache
+
+from .backends import MemoryBackend, Neo4jBackend
+from .concept_index import ConceptIndex
+from .concepts import ConceptExtractor
+from .persistence import WriteBehindWriter
+from .pool import SessionPool
+from .retention import PERIODS, RetentionScheduler
+from .sqlite_backend import SQLiteGraphBackend
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -11,114 +24,347 @@ logger = logging.getLogger(__name__)
 class MemoryTraceManager:
     """
     Graph-based memory management system for historical context and proactive memory utilization.
-    Manages conversation traces, user interactions, and semantic relationships in a Neo4j graph database.
+    Manages conversation traces, user interactions, and semantic relationships in a Neo4j graph database,
+    or in an embedded SQLite graph (``fallback_path``) when Neo4j is unreachable.
     """
 
-    def __init__(self, uri="bolt://neo4j:7687", user="neo4j", password="password"):
-        logger.info("Initializing Memory Trace Manager. Connecting to graph database.")
+    def __init__(self, uri="bolt://neo4j:7687", user="neo4j", password="password",
+                 cache_expiry: timedelta = timedelta(hours=1), max_cache_size: int = 1000,
+                 max_cache_bytes: Optional[int] = None, write_behind: bool = False,
+                 flush_interval: float = 1.0, max_write_batch: int = 500, write_queue_size: int = 10000,
+                 write_overflow: str = 'drop_oldest', backend: Optional[MemoryBackend] = None,
+                 fallback_path: Optional[str] = None, concept_index: bool = True,
+                 index_window: int = 1000, index_max_users: int = 10000, max_pool_size: int = 50,
+                 acquire_timeout: float = 60.0, read_uri: Optional[str] = None, reconnect: bool = True,
+                 reconnect_initial: float = 1.0, reconnect_max: float = 60.0,
+                 concept_extractor: Optional[ConceptExtractor] = None, retention: Optional[timedelta] = None,
+                 retention_period: str = 'month', compaction_interval: float = 3600.0,
+                 compaction_batch: int = 1000):
+        if retention_period not in PERIODS:
+            raise ValueError(f"retention_period must be one of {PERIODS}, got {retention_period!r}")
+        self.concept_extractor = concept_extractor or ConceptExtractor()
+        self.uri = uri
+        self.auth = (user, password)
+        self.read_uri = read_uri
+        self.max_pool_size = max_pool_size
+        self.acquire_timeout = acquire_timeout
+        self.reconnect_initial = reconnect_initial
+        self.reconnect_max = reconnect_max
+        self.reconnect_attempts = 0
+        self.reconnected_at: Optional[str] = None
+        self._stop = threading.Event()
+        self._reconnect_thread = None
+        # Held by _adopt while it copies the embedded fallback, and by every
+        # write that lands in the fallback, so none is lost in the handover
+        self._handover_lock = threading.Lock()
+
+        self.driver = None
+        if backend is not None:
+            logger.info(f"Initializing Memory Trace Manager on the {backend.name} backend.")
+            self.backend: Optional[MemoryBackend] = backend
+        else:
+            logger.info("Initializing Memory Trace Manager. Connecting to graph database.")
+            try:
+                self.backend = self._connect()
+                self.driver = self.backend.driver
+                logger.info("Successfully connected to Neo4j.")
+            except Exception as e:
+                self.backend = None
+                if fallback_path:
+                    logger.warning(f"Could not connect to Neo4j: {e}. Using the embedded graph at {fallback_path}.")
+                    self.backend = SQLiteGraphBackend(fallback_path)
+                else:
+                    logger.error(f"Could not connect to Neo4j: {e}. Memory functions will be disabled.")
+                if reconnect:
+                    self._reconnect_thread = threading.Thread(target=self._reconnect_loop,
+                                                              name="memory-reconnect", daemon=True)
+                    self._reconnect_thread.start()
+
+        # Proactive memory cache for frequently accessed memories: O(1) LRU
+        # with lazy expiry and an optional byte budget
+        self.cache_expiry = cache_expiry
+        self.max_cache_size = max_cache_size
+        self.memory_cache = LRUTTLCache(max_entries=max_cache_size, ttl=cache_expiry.total_seconds(),
+                                        max_bytes=max_cache_bytes)
+
+        # Opt-in write-behind: interactions are persisted by a background
+        # worker, many requests sharing one bulk transaction. Created up front
+        # so a backend that only appears on reconnect gets it too.
+        self.writer = None
+        if write_behind:
+            self.writer = WriteBehindWriter(self._write_interactions, flush_interval, max_write_batch,
+                                            queue_size=write_queue_size, overflow=write_overflow)
+
+        # In-process inverted index over each user's recent interactions, so
+        # concept recall is answered without a round trip to the store
+        self.concept_index = None
+        if concept_index:
+            self.concept_index = ConceptIndex(window=index_window, max_users=index_max_users)
+
+        # Interactions older than the retention window are periodically
+        # folded into per-period summaries and deleted, so per-user history
+        # (and the queries walking it) stops growing with the deployment's age
+        self.retention = retention
+        self.retention_period = retention_period
+        self.compaction_batch = compaction_batch
+        self.retention_scheduler = None
+        if retention is not None:
+            self.retention_scheduler = RetentionScheduler(self.compact, compaction_interval)
+
+    def _connect(self) -> Neo4jBackend:
+        """Open the pooled driver (and optional read replica driver) and check it answers."""
+        driver = neo4j.GraphDatabase.driver(self.uri, auth=self.auth, max_connection_pool_size=self.max_pool_size,
+                                            connection_acquisition_timeout=self.acquire_timeout)
         try:
-            self.driver = neo4j.GraphDatabase.driver(uri, auth=(user, password))
-            self.driver.verify_connectivity()
-            logger.info("Successfully connected to Neo4j.")
-        except Exception as e:
-            logger.error(f"Could not connect to Neo4j: {e}. Memory functions will be disabled.")
-            self.driver = None
+            driver.verify_connectivity()
+        except Exception:
+            driver.close()
+            raise
+        read_driver = driver
+        if self.read_uri:
+            try:
+                read_driver = neo4j.GraphDatabase.driver(self.read_uri, auth=self.auth,
+                                                         max_connection_pool_size=self.max_pool_size,
+                                                         connection_acquisition_timeout=self.acquire_timeout)
+                read_driver.verify_connectivity()
+            except Exception as e:
+                logger.warning(f"Read replica {self.read_uri} unavailable ({e}); reading from {self.uri}.")
+                read_driver = driver
+        # Read access lets a routing (neo4j://) driver send recalls to followers
+        read_pool = SessionPool(read_driver, self.max_pool_size, self.acquire_timeout,
+                                default_access_mode=neo4j.READ_ACCESS)
+        return Neo4jBackend(driver, read_pool)
+
+    def _reconnect_loop(self):
+        """
+        Retry Neo4j with jittered exponential backoff until it answers and
+        takes over memory, or the manager closes.
+        """
+        delay = self.reconnect_initial
+        while not self._stop.wait(random.uniform(delay / 2, delay)):
+            self.reconnect_attempts += 1
+            try:
+                backend = self._connect()
+            except Exception as e:
+                logger.debug(f"Neo4j still unreachable after {self.reconnect_attempts} attempts: {e}")
+                delay = min(delay * 2, self.reconnect_max)
+                continue
+            try:
+                backend.ensure_schema()
+                self._adopt(backend)
+            except Exception as e:
+                logger.warning(f"Neo4j answered but taking over memory failed ({e}); "
+                               f"keeping the current backend and retrying.")
+                backend.close()
+                delay = min(delay * 2, self.reconnect_max)
+                continue
+            return
 
-        # Proactive memory cache for frequently accessed memories
-        self.memory_cache = {}
-        self.cache_expiry = timedelta(hours=1)
-        self.max_cache_size = 1000
+    def _adopt(self, backend: Neo4jBackend):
+        """
+        Switch to a freshly connected backend. Interactions kept in the
+        embedded fallback meanwhile are copied over first, so recall keeps
+        them, and the switch only happens once the copy succeeded; if it
+        fails, the fallback stays live and the copy is retried later (writes
+        skip interactions already stored). The fallback is then emptied, so a
+        later outage does not copy them twice.
+        """
+        with self._handover_lock:
+            previous = self.backend
+            if isinstance(previous, SQLiteGraphBackend):
+                copied = 0
+                for batch in previous.export_interactions():
+                    backend.write_interactions(batch)
+                    copied += len(batch)
+                summaries = previous.export_summaries()
+                if summaries:
+                    backend.merge_summaries(summaries)
+                logger.info(f"Copied {copied} interactions from the embedded graph to Neo4j.")
+            self.backend, self.driver = backend, backend.driver
+            if isinstance(previous, SQLiteGraphBackend):
+                previous.clear()
+        if previous is not None:
+            previous.close()
+        self.reconnected_at = datetime.now().isoformat()
+        logger.info(f"Reconnected to Neo4j after {self.reconnect_attempts} attempts.")
 
     def close(self):
-        if self.driver:
-            self.driver.close()
+        self._stop.set()
+        if self.retention_scheduler:
+            self.retention_scheduler.close()
+        if self.writer:
+            self.writer.close()
+        if self.backend:
+            self.backend.close()
+
+    def ensure_schema(self) -> bool:
+        """
+        Create the constraints and indexes recall and writes rely on, if missing.
+
+        Returns:
+            True when every statement succeeded, False otherwise (or without a database)
+        """
+        if not self.backend:
+            return False
+        return self.backend.ensure_schema()
+
+    @contextmanager
+    def _writable_backend(self) -> Iterator[MemoryBackend]:
+        """
+        The backend to write to. While that is the embedded fallback, the
+        handover lock is held, so no write lands in it after _adopt copied it.
+        """
+        backend = self.backend
+        if not isinstance(backend, SQLiteGraphBackend):
+            yield backend
+            return
+        with self._handover_lock:
+            yield self.backend
+
+    def _write_interactions(self, interactions: List[Dict[str, Any]]):
+        """Persist interaction rows in one transaction."""
+        with self._writable_backend() as backend:
+            backend.write_interactions(interactions)
 
     def _get_cache_key(self, user_id: str, content: str) -> str:
         """Generate cache key for memory entries"""
         return hashlib.md5(f"{user_id}:{content}".encode()).hexdigest()
 
-    def _is_cache_valid(self, cache_entry: Dict) -> bool:
-        """Check if cache entry is still valid"""
-        return datetime.now() - cache_entry['timestamp'] < self.cache_expiry
+    def get_persistence_stats(self) -> Dict[str, Any]:
+        """Queue depth, drop, retry and flush latency counters of the write-behind worker."""
+        if not self.backend:
+            return {"mode": "disabled", "backend": None}
+        backend = self.backend.name
+        if self.writer is None:
+            return {"mode": "synchronous", "backend": backend}
+        return {"mode": "write_behind", "backend": backend, **self.writer.get_stats()}
+
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """Backend in use, reconnect progress and read session pool utilization and wait times."""
+        get_pool_stats = getattr(self.backend, 'get_pool_stats', None)
+        return {
+            "backend": self.backend.name if self.backend else None,
+            "neo4j_connected": isinstance(self.backend, Neo4jBackend),
+            "reconnecting": bool(self._reconnect_thread and self._reconnect_thread.is_alive()),
+            "reconnect_attempts": self.reconnect_attempts,
+            "reconnected_at": self.reconnected_at,
+            "read_pool": get_pool_stats() if get_pool_stats else None
+        }
 
-    def _manage_cache_size(self):
-        """Proactively manage cache size by removing expired entries"""
-        current_time = datetime.now()
-        valid_entries = {
-            k: v for k, v in self.memory_cache.items()
-            if current_time - v['timestamp'] < self.cache_expiry
+    def get_retention_stats(self) -> Dict[str, Any]:
+        """Retention settings and what scheduled compaction has reclaimed so far."""
+        if self.retention is None:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            "retention_days": self.retention.total_seconds() / 86400,
+            "period": self.retention_period,
+            **self.retention_scheduler.get_stats()
         }
-        self.memory_cache = valid_entries
 
-        # If still too large, remove oldest entries
-        if len(self.memory_cache) > self.max_cache_size:
-            sorted_entries = sorted(self.memory_cache.items(), key=lambda x: x[1]['timestamp'])
-            self.memory_cache = dict(sorted_entries[-self.max_cache_size:])
+    def compact(self, older_than: Optional[timedelta] = None) -> Dict[str, Any]:
+        """
+        Fold interactions older than ``older_than`` (default: the retention
+        window) into per-user, per-period summaries and delete them, one
+        batch of ``compaction_batch`` interactions per transaction.
+
+        Returns:
+            Report of the ``interactions`` and ``mentions`` deleted, ``summaries``
+            written, ``text_chars`` of message text reclaimed and ``batches`` run
+        """
+        report = {'interactions': 0, 'mentions': 0, 'summaries': 0, 'text_chars': 0, 'batches': 0}
+        older_than = older_than if older_than is not None else self.retention
+        if not self.backend or older_than is None:
+            return report
+        cutoff = (datetime.now() - older_than).isoformat()
+        users = set()
+        try:
+            while not self._stop.is_set():
+                with self._writable_backend() as backend:
+                    batch = backend.compact_interactions(cutoff, self.retention_period, self.compaction_batch)
+                if not batch['interactions']:
+                    break
+                report['batches'] += 1
+                for key in ('interactions', 'mentions', 'summaries', 'text_chars'):
+                    report[key] += batch[key]
+                users.update(batch['users'])
+                if batch['interactions'] < self.compaction_batch:
+                    break
+        finally:
+            # Indexed postings may point at deleted interactions; those users reload on next use
+            if self.concept_index and users:
+                self.concept_index.discard(users)
+        if report['interactions']:
+            logger.info(f"Compacted {report['interactions']} interactions older than {cutoff} into "
+                        f"{self.retention_period} summaries, reclaiming {report['text_chars']} chars of text")
+        return report
+
+    def get_index_stats(self) -> Optional[Dict[str, Any]]:
+        """Size, memory and hit counters of the concept index, or None when it is disabled."""
+        return self.concept_index.get_stats() if self.concept_index else None
+
+    def _ensure_indexed(self, user_id: str) -> bool:
+        """Load a user's recent interactions into the concept index on first use."""
+        if user_id in self.concept_index:
+            return True
+        try:
+            # Snapshot the queue first: a row flushed in between is then seen twice, never missed
+            queued = [row for row in self.writer.queued() if row['user_id'] == user_id] if self.writer else []
+            rows = self.backend.load_interactions(user_id, self.concept_index.window)
+        except Exception as e:
+            logger.error(f"Could not load interactions of user {user_id} into the concept index: {e}")
+            return False
+        stored = {(row['interaction_id'], row['timestamp']) for row in rows}
+        rows.extend(row for row in queued if (row['interaction_id'], row['timestamp']) not in stored)
+        # A request that loaded this user meanwhile wins; load() keeps its postings and what it added since
+        self.concept_index.load(user_id, rows)
+        return True
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hit, miss, eviction and size counters of the proactive memory cache."""
+        return self.memory_cache.get_stats()
 
     def store_interaction(self, user_id: str, user_message: str, assistant_response: str):
         """
         Store a conversation interaction in the graph database.
-        Creates nodes for user, message, and response with semantic relationships.
+        Creates nodes for user, message, and response with semantic relationships,
+        all in a single statement (or, in write-behind mode, a later bulk one).
         """
-        if not self.driver:
+        if not self.backend:
             logger.warning("Neo4j not available, interaction not stored.")
             return
 
         timestamp = datetime.now().isoformat()
         interaction_id = f"{user_id}_{int(datetime.now().timestamp())}"
 
-        with self.driver.session() as session:
-            # Create user node if not exists
-            session.run("""
-                MERGE (u:User {id: $user_id})
-                SET u.last_interaction = $timestamp
-                """, user_id=user_id, timestamp=timestamp)
-
-            # Create interaction node
-            session.run("""
-                CREATE (i:Interaction {
-                    id: $interaction_id,
-                    user_message: $user_message,
-                    assistant_response: $assistant_response,
-                    timestamp: $timestamp,
-                    user_id: $user_id
-                })
-                """, interaction_id=interaction_id, user_message=user_message,
-                assistant_response=assistant_response, timestamp=timestamp, user_id=user_id)
-
-            # Link user to interaction
-            session.run("""
-                MATCH (u:User {id: $user_id})
-                MATCH (i:Interaction {id: $interaction_id})
-                CREATE (u)-[:HAS_INTERACTION]->(i)
-                """, user_id=user_id, interaction_id=interaction_id)
-
-            # Extract and link concepts from messages
-            user_concepts = self._extract_concepts(user_message)
-            response_concepts = self._extract_concepts(assistant_response)
-
-            for concept in user_concepts:
-                session.run("""
-                    MERGE (c:Concept {name: $concept})
-                    MATCH (i:Interaction {id: $interaction_id})
-                    CREATE (i)-[:MENTIONS {source: 'user'}]->(c)
-                    """, concept=concept, interaction_id=interaction_id)
-
-            for concept in response_concepts:
-                session.run("""
-                    MERGE (c:Concept {name: $concept})
-                    MATCH (i:Interaction {id: $interaction_id})
-                    CREATE (i)-[:MENTIONS {source: 'assistant'}]->(c)
-                    """, concept=concept, interaction_id=interaction_id)
+        # Extract concepts from messages
+        user_concepts = self._extract_concepts(user_message)
+        response_concepts = self._extract_concepts(assistant_response)
+
+        row = {
+            'user_id': user_id,
+            'interaction_id': interaction_id,
+            'user_message': user_message,
+            'assistant_response': assistant_response,
+            'timestamp': timestamp,
+            'mentions': self._mentions(user_concepts, response_concepts)
+        }
+        # Load the user's history before this row is persisted, so it is indexed once
+        indexed = self.concept_index is not None and self._ensure_indexed(user_id)
+        if self.writer is not None:
+            self.writer.submit(row)
+        else:
+            self._write_interactions([row])
+        if indexed:
+            self.concept_index.add(row)
 
         # Update proactive cache
         cache_key = self._get_cache_key(user_id, user_message)
-        self.memory_cache[cache_key] = {
+        self.memory_cache.put(cache_key, {
             'response': assistant_response,
             'concepts': user_concepts + response_concepts,
             'timestamp': datetime.now()
-        }
-        self._manage_cache_size()
+        })
 
         logger.info(f"Interaction stored for user {user_id}: {len(user_message)} chars -> {len(assistant_response)} chars")
 
@@ -127,146 +373,132 @@ class MemoryTraceManager:
         Recall relevant historical context based on current message.
         Uses semantic similarity and graph relationships for proactive retrieval.
         """
-        if not self.driver:
+        cache_key = self._get_cache_key(user_id, current_message)
+        cached = self.memory_cache.get(cache_key)
+        if not self.backend:
             # Fallback to cache-only recall
-            cache_key = self._get_cache_key(user_id, current_message)
-            if cache_key in self.memory_cache and self._is_cache_valid(self.memory_cache[cache_key]):
-                return self.memory_cache[cache_key]
-            return None
+            return cached
 
         # First check proactive cache
-        cache_key = self._get_cache_key(user_id, current_message)
-        if cache_key in self.memory_cache and self._is_cache_valid(self.memory_cache[cache_key]):
+        if cached is not None:
             logger.info(f"Cache hit for user {user_id}")
-            return self.memory_cache[cache_key]
+            return cached
 
         # Extract concepts from current message
         current_concepts = self._extract_concepts(current_message)
 
-        with self.driver.session() as session:
-            # Find interactions with similar concepts
+        # Find interactions with similar concepts, from the index when it can answer
+        records = None
+        if self.concept_index is not None and self._ensure_indexed(user_id):
             if current_concepts:
-                concept_list = ", ".join(f"'{c}'" for c in current_concepts)
-                result = session.run(f"""
-                    MATCH (u:User {{id: $user_id}})-[:HAS_INTERACTION]->(i:Interaction)-[:MENTIONS]->(c:Concept)
-                    WHERE c.name IN [{concept_list}]
-                    RETURN i.user_message as message, i.assistant_response as response,
-                           i.timestamp as timestamp, count(c) as relevance_score
-                    ORDER BY relevance_score DESC, i.timestamp DESC
-                    LIMIT $limit
-                    """, user_id=user_id, limit=limit)
+                records = self.concept_index.recall_by_concepts(user_id, current_concepts, limit)
+            else:
+                records = self.concept_index.recent_interactions(user_id, limit)
+        if records is None:
+            if current_concepts:
+                records = self.backend.recall_by_concepts(user_id, current_concepts, limit)
             else:
                 # Fallback to recent interactions
-                result = session.run("""
-                    MATCH (u:User {id: $user_id})-[:HAS_INTERACTION]->(i:Interaction)
-                    RETURN i.user_message as message, i.assistant_response as response,
-                           i.timestamp as timestamp, 1 as relevance_score
-                    ORDER BY i.timestamp DESC
-                    LIMIT $limit
-                    """, user_id=user_id, limit=limit)
-
-            records = list(result)
-            if records:
-                # Return most relevant interaction
-                most_relevant = records[0]
-                context = {
-                    'message': most_relevant['message'],
-                    'response': most_relevant['response'],
-                    'timestamp': most_relevant['timestamp'],
-                    'relevance_score': most_relevant['relevance_score'],
-                    'related_interactions': len(records)
-                }
-
-                # Cache for future use
-                self.memory_cache[cache_key] = {
-                    'response': context['response'],
-                    'concepts': current_concepts,
-                    'timestamp': datetime.now(),
-                    'context': context
-                }
-                self._manage_cache_size()
-
-                return context
+                records = self.backend.recent_interactions(user_id, limit)
+
+        if records:
+            # Return most relevant interaction
+            most_relevant = records[0]
+            context = {
+                'message': most_relevant['message'],
+                'response': most_relevant['response'],
+                'timestamp': most_relevant['timestamp'],
+                'relevance_score': most_relevant['relevance_score'],
+                'related_interactions': len(records)
+            }
+
+            # Cache for future use
+            self.memory_cache.put(cache_key, {
+                'response': context['response'],
+                'concepts': current_concepts,
+                'timestamp': datetime.now(),
+                'context': context
+            })
+
+            return context
 
         return None
 
     def _extract_concepts(self, text: str) -> List[str]:
         """
         Extract key concepts from text for semantic linking.
-        Simple keyword extraction - could be enhanced with NLP.
+        Delegates to the configured ConceptExtractor.
         """
-        # Basic concept extraction (can be enhanced with NLP models)
-        words = text.lower().split()
-        concepts = []
+        return self.concept_extractor.extract(text)
 
-        # Filter for potential concepts (noun-like words, >3 chars)
-        for word in words:
-            word = word.strip('.,!?;:')
-            if len(word) > 3 and word not in ['that', 'this', 'with', 'from', 'they', 'have', 'been', 'were', 'what', 'when', 'where', 'how', 'why', 'who']:
-                concepts.append(word)
+    @staticmethod
+    def _mentions(user_concepts: List[str], response_concepts: List[str]) -> List[Dict[str, str]]:
+        return [{'concept': concept, 'source': 'user'} for concept in user_concepts] + \
+               [{'concept': concept, 'source': 'assistant'} for concept in response_concepts]
 
-        return list(set(concepts))  # Remove duplicates
+    def backfill_concepts(self, batch_size: int = 500) -> int:
+        """
+        Re-extract the concepts of every stored interaction with the current
+        extractor and replace their MENTIONS links, one batch per transaction.
+        Run after changing stopwords or enabling phrase concepts.
+
+        Returns:
+            Number of interactions rewritten
+        """
+        if not self.backend:
+            return 0
+        if self.writer:
+            self.writer.flush()
+        extract_batch = self.concept_extractor.extract_batch
+        rewritten = 0
+        for batch in self.backend.iter_interaction_texts(batch_size):
+            user_concepts = extract_batch(row['user_message'] for row in batch)
+            response_concepts = extract_batch(row['assistant_response'] for row in batch)
+            with self._writable_backend() as backend:
+                backend.replace_mentions([
+                    {'key': row['key'], 'mentions': self._mentions(user, response)}
+                    for row, user, response in zip(batch, user_concepts, response_concepts)
+                ])
+            rewritten += len(batch)
+        # Postings were built from the old concepts; users reload on next use
+        if self.concept_index:
+            self.concept_index.clear()
+        logger.info(f"Backfilled concepts of {rewritten} interactions")
+        return rewritten
 
     def get_user_context(self, user_id: str) -> Dict[str, Any]:
         """
         Get comprehensive user context including interaction history and patterns.
         """
-        if not self.driver:
+        if not self.backend:
             return {'interactions': 0, 'concepts': [], 'last_interaction': None}
 
-        with self.driver.session() as session:
-            # Get user stats
-            user_result = session.run("""
-                MATCH (u:User {id: $user_id})
-                OPTIONAL MATCH (u)-[:HAS_INTERACTION]->(i:Interaction)
-                RETURN u.last_interaction as last_interaction, count(i) as interaction_count
-                """, user_id=user_id)
-
-            user_data = user_result.single()
-            if not user_data:
-                return {'interactions': 0, 'concepts': [], 'last_interaction': None}
-
-            # Get most common concepts
-            concept_result = session.run("""
-                MATCH (u:User {id: $user_id})-[:HAS_INTERACTION]->(i:Interaction)-[:MENTIONS]->(c:Concept)
-                RETURN c.name as concept, count(c) as frequency
-                ORDER BY frequency DESC
-                LIMIT 10
-                """, user_id=user_id)
-
-            concepts = [{'name': r['concept'], 'frequency': r['frequency']} for r in concept_result]
-
-            return {
-                'interactions': user_data['interaction_count'],
-                'concepts': concepts,
-                'last_interaction': user_data['last_interaction']
-            }
+        user_data = self.backend.user_stats(user_id)
+        if not user_data:
+            return {'interactions': 0, 'concepts': [], 'last_interaction': None}
+
+        # Get most common concepts
+        concepts = self.backend.user_concepts(user_id, limit=10)
+
+        return {
+            'interactions': user_data['interaction_count'],
+            'concepts': concepts,
+            'last_interaction': user_data['last_interaction']
+        }
 
     def add_memory(self, concept: str, properties: dict):
         """Legacy method for backward compatibility"""
-        if not self.driver: return
-        with self.driver.session() as session:
-            session.run("MERGE (c:Concept {name: $concept}) SET c += $properties",
-                        concept=concept, properties=properties)
+        if not self.backend: return
+        self.backend.add_concept(concept, properties)
         logger.info(f"Memory added: Concept='{concept}'")
 
     def create_relationship(self, concept1: str, relationship: str, concept2: str):
         """Legacy method for backward compatibility"""
-        if not self.driver: return
-        with self.driver.session() as session:
-            query = (
-                "MATCH (a:Concept {name: $concept1}) "
-                "MATCH (b:Concept {name: $concept2}) "
-                "MERGE (a)-[r:%s]->(b)" % relationship.upper()
-            )
-            session.run(query, concept1=concept1, concept2=concept2)
+        if not self.backend: return
+        self.backend.create_relationship(concept1, relationship, concept2)
         logger.info(f"Relationship created: {concept1} -> {relationship} -> {concept2}")
 
     def recall(self, concept: str) -> list:
         """Legacy method for backward compatibility"""
-        if not self.driver: return []
-        with self.driver.session() as session:
-            result = session.run("MATCH (c:Concept {name: $concept})-[r]-(related) "
-                                 "RETURN type(r) as relationship, related.name as related_concept",
-                                 concept=concept)
-            return [{"relationship": record["relationship"], "concept": record["related_concept"]} for record in result]
+        if not self.backend: return []
+        return self.backend.related(concept)
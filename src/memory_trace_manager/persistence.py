@@ -0,0 +1,167 @@
+"""Write-behind persistence of interaction writes, off the request path.
+
+Chat turns hand their interaction rows to a WriteBehindWriter instead of
+writing them inline. A background thread drains the bounded queue every
+``flush_interval`` seconds, or as soon as ``max_batch`` rows are waiting, and
+persists each drained batch with one bulk write. Failed batches are retried
+with jittered exponential backoff; backends skip rows they already hold, so
+a batch that did commit before its failure was reported is not written
+twice. Whatever is still queued is written when the writer is closed.
+"""
+import atexit
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# What submit() does when the queue is full
+OVERFLOW_POLICIES = ('drop', 'drop_oldest', 'block')
+
+class WriteBehindWriter:
+    """
+    Coalesces rows submitted by many requests into periodic bulk writes.
+
+    When ``queue_size`` rows are already waiting, ``overflow`` decides what
+    gives: ``drop`` discards the new row, ``drop_oldest`` discards the oldest
+    queued one, and ``block`` waits up to ``block_timeout`` seconds for room
+    before dropping the new row.
+    """
+
+    def __init__(self, write_batch: Callable[[List[Dict[str, Any]]], None], flush_interval: float = 1.0,
+                 max_batch: int = 500, queue_size: int = 10000, overflow: str = 'drop_oldest',
+                 block_timeout: Optional[float] = 1.0, max_retries: int = 3, retry_backoff: float = 0.2):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        self.write_batch = write_batch
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.pending: Deque[Dict[str, Any]] = deque()
+        self.lock = threading.Lock()
+        self.not_full = threading.Condition(self.lock)
+        self.flush_lock = threading.Lock()
+        self.wakeup = threading.Event()
+
+        self.written = 0
+        self.failed = 0
+        self.dropped = 0
+        self.retries = 0
+        self.batches = 0
+        self.flushes = 0
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self.total_flush_seconds = 0.0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="memory-write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, row: Dict[str, Any]) -> bool:
+        """Queue one row for the next batch. Returns False if the overflow policy dropped it."""
+        with self.lock:
+            if self._closed:
+                self.dropped += 1
+                return False
+            if len(self.pending) >= self.queue_size:
+                if self.overflow == 'drop_oldest':
+                    self.pending.popleft()
+                    self.dropped += 1
+                elif self.overflow == 'block':
+                    self.wakeup.set()
+                    if not self.not_full.wait_for(lambda: len(self.pending) < self.queue_size or self._closed,
+                                                  self.block_timeout) or self._closed:
+                        self.dropped += 1
+                        return False
+                else:
+                    self.dropped += 1
+                    return False
+            self.pending.append(row)
+            full = len(self.pending) >= self.max_batch
+        if full:
+            self.wakeup.set()
+        return True
+
+    def queued(self) -> List[Dict[str, Any]]:
+        """Rows submitted but not yet handed to ``write_batch``, oldest first."""
+        with self.lock:
+            return list(self.pending)
+
+    def flush(self):
+        """Write everything queued so far, in batches of at most ``max_batch`` rows."""
+        with self.flush_lock:
+            while True:
+                with self.lock:
+                    count = min(len(self.pending), self.max_batch)
+                    batch = [self.pending.popleft() for _ in range(count)]
+                    self.not_full.notify_all()
+                if not batch:
+                    return
+                self._write_with_retry(batch)
+
+    def _write_with_retry(self, batch: List[Dict[str, Any]]):
+        start = time.monotonic()
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.write_batch(batch)
+                self.written += len(batch)
+                self.batches += 1
+                break
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.failed += len(batch)
+                    logger.error(f"Write-behind batch of {len(batch)} interactions failed "
+                                 f"after {attempt + 1} attempts: {e}")
+                    break
+                self.retries += 1
+                # Full jitter keeps many writers from retrying in lockstep
+                delay = random.uniform(0, self.retry_backoff * (2 ** attempt))
+                logger.warning(f"Write-behind batch failed ({e}); retrying in {delay:.2f}s")
+                time.sleep(delay)
+        elapsed = time.monotonic() - start
+        self.flushes += 1
+        self.last_flush_seconds = elapsed
+        self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+        self.total_flush_seconds += elapsed
+
+    def _run(self):
+        while not self._closed:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            self.flush()
+
+    def close(self, timeout: float = 5.0):
+        """Stop the background thread and write whatever is still queued."""
+        if self._closed:
+            return
+        with self.lock:
+            self._closed = True
+            self.not_full.notify_all()
+        self.wakeup.set()
+        self._thread.join(timeout)
+        self.flush()
+        atexit.unregister(self.close)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            depth = len(self.pending)
+        return {
+            "queue_depth": depth,
+            "queue_size": self.queue_size,
+            "overflow": self.overflow,
+            "written": self.written,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "retries": self.retries,
+            "batches": self.batches,
+            "last_flush_ms": self.last_flush_seconds * 1000,
+            "max_flush_ms": self.max_flush_seconds * 1000,
+            "avg_flush_ms": self.total_flush_seconds * 1000 / self.flushes if self.flushes else 0.0
+        }
@@ -0,0 +1,104 @@
+"""Bounded pool of reusable Neo4j sessions for read-only recall.
+
+Opening a session per recall costs an object, a connection checkout and a
+bookmark exchange on every request. The pool keeps idle sessions and hands
+them out one caller at a time; sessions are not thread-safe, so a session
+is only ever held by one thread. A semaphore sized to the driver's
+connection pool caps concurrent use, which is also where callers wait when
+the pool is exhausted; that wait is measured and reported.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class PoolExhausted(RuntimeError):
+    """No session became free within the acquisition timeout."""
+
+class SessionPool:
+    """
+    Hands out sessions of ``driver`` opened with ``session_config`` (for
+    example a read access mode, which cluster routing sends to followers).
+    A session that raised is closed instead of returned to the pool.
+    """
+
+    def __init__(self, driver, max_size: int = 50, acquire_timeout: Optional[float] = 60.0,
+                 **session_config):
+        self.driver = driver
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.session_config = session_config
+        self.slots = threading.BoundedSemaphore(max_size)
+        self.lock = threading.Lock()
+        self.idle: List[Any] = []
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.created = 0
+        self.discarded = 0
+        self.acquisitions = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @contextmanager
+    def session(self) -> Iterator[Any]:
+        start = time.monotonic()
+        if not self.slots.acquire(timeout=self.acquire_timeout):
+            with self.lock:
+                self.timeouts += 1
+            raise PoolExhausted(f"No Neo4j session free after {self.acquire_timeout}s "
+                                f"({self.max_size} in use)")
+        waited = time.monotonic() - start
+        with self.lock:
+            self.acquisitions += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            session = self.idle.pop() if self.idle else None
+        healthy = False
+        try:
+            if session is None:
+                session = self.driver.session(**self.session_config)
+                with self.lock:
+                    self.created += 1
+            yield session
+            healthy = True
+        finally:
+            with self.lock:
+                self.in_use -= 1
+                if healthy:
+                    self.idle.append(session)
+                elif session is not None:
+                    self.discarded += 1
+            if not healthy and session is not None:
+                try:
+                    session.close()
+                except Exception as e:
+                    logger.debug(f"Closing a failed session raised: {e}")
+            self.slots.release()
+
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for session in idle:
+            session.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "max_size": self.max_size,
+                "in_use": self.in_use,
+                "idle": len(self.idle),
+                "utilization": self.in_use / self.max_size if self.max_size else 0.0,
+                "peak_in_use": self.peak_in_use,
+                "sessions_created": self.created,
+                "sessions_discarded": self.discarded,
+                "acquisitions": self.acquisitions,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": self.total_wait * 1000 / self.acquisitions if self.acquisitions else 0.0,
+                "max_wait_ms": self.max_wait * 1000
+            }
@@ -0,0 +1,140 @@
+"""Retention of the interaction graph: old turns rolled into summaries.
+
+Every chat turn adds an Interaction with its MENTIONS links, so without
+retention a user's history, and every query that walks it, only grows.
+Compaction takes interactions older than the retention window, oldest
+first and a batch per transaction, folds each batch into one summary per
+user and period (day, ISO week or month) holding the interaction count,
+the first and last timestamps and how often each concept was mentioned,
+and deletes the raw interactions. Summaries are additive, so a period split
+across batches or runs ends up with the same counts.
+
+Summaries keep ``get_user_context`` exact (interaction totals and concept
+frequencies include them); recall only sees the retained interactions.
+"""
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PERIODS = ('day', 'week', 'month')
+
+def period_of(timestamp: str, period: str) -> str:
+    """Period key of an ISO timestamp: ``2024-01-31``, ``2024-W05`` or ``2024-01``."""
+    moment = datetime.fromisoformat(timestamp)
+    if period == 'day':
+        return moment.strftime('%Y-%m-%d')
+    if period == 'week':
+        year, week, _ = moment.isocalendar()
+        return f"{year}-W{week:02d}"
+    return moment.strftime('%Y-%m')
+
+def summarize(rows: Iterable[Dict[str, Any]], period: str) -> List[Dict[str, Any]]:
+    """
+    Fold compacted interactions into summary rows.
+
+    Args:
+        rows: Dicts with ``user_id``, ``timestamp`` and ``concepts``, one concept name per MENTIONS link
+        period: One of PERIODS
+
+    Returns:
+        One dict per user and period with ``user_id``, ``period``, ``interaction_count``,
+        ``first_timestamp``, ``last_timestamp`` and ``concepts`` as ``{'concept', 'frequency'}`` dicts
+    """
+    summaries: Dict[tuple, Dict[str, Any]] = {}
+    frequencies: Dict[tuple, Counter] = {}
+    for row in rows:
+        key = (row['user_id'], period_of(row['timestamp'], period))
+        summary = summaries.get(key)
+        if summary is None:
+            summary = summaries[key] = {
+                'user_id': key[0],
+                'period': key[1],
+                'interaction_count': 0,
+                'first_timestamp': row['timestamp'],
+                'last_timestamp': row['timestamp']
+            }
+            frequencies[key] = Counter()
+        summary['interaction_count'] += 1
+        summary['first_timestamp'] = min(summary['first_timestamp'], row['timestamp'])
+        summary['last_timestamp'] = max(summary['last_timestamp'], row['timestamp'])
+        frequencies[key].update(row['concepts'])
+    for key, summary in summaries.items():
+        summary['concepts'] = [{'concept': concept, 'frequency': frequency}
+                               for concept, frequency in frequencies[key].most_common()]
+    return list(summaries.values())
+
+def batch_report(rows: List[Dict[str, Any]], summaries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """What one compacted batch removed, in the shape backends return from ``compact_interactions``."""
+    return {
+        'interactions': len(rows),
+        'mentions': sum(len(row['concepts']) for row in rows),
+        'summaries': len(summaries),
+        'text_chars': sum(row['text_chars'] or 0 for row in rows),
+        'users': sorted({row['user_id'] for row in rows})
+    }
+
+class RetentionScheduler:
+    """
+    Runs ``compact`` in a background thread once at start and then every
+    ``interval`` seconds, keeping the last report and running totals.
+    ``compact`` returns a report with ``interactions``, ``mentions``,
+    ``summaries`` and ``text_chars`` counts.
+    """
+
+    def __init__(self, compact: Callable[[], Dict[str, Any]], interval: float = 3600.0):
+        self.compact = compact
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.runs = 0
+        self.errors = 0
+        self.last_run_at: Optional[str] = None
+        self.last_report: Optional[Dict[str, Any]] = None
+        self.totals = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="memory-retention", daemon=True)
+        self._thread.start()
+
+    def run_once(self) -> Optional[Dict[str, Any]]:
+        start = time.monotonic()
+        try:
+            report = self.compact()
+        except Exception as e:
+            with self.lock:
+                self.errors += 1
+            logger.error(f"Memory compaction failed: {e}")
+            return None
+        report = {**report, 'seconds': time.monotonic() - start}
+        with self.lock:
+            self.runs += 1
+            self.last_run_at = datetime.now().isoformat()
+            self.last_report = report
+            self.totals.update({key: report[key] for key in ('interactions', 'mentions', 'summaries', 'text_chars')})
+        return report
+
+    def _run(self):
+        while True:
+            self.run_once()
+            if self._stop.wait(self.interval):
+                return
+
+    def close(self, timeout: float = 5.0):
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "interval_seconds": self.interval,
+                "runs": self.runs,
+                "errors": self.errors,
+                "last_run_at": self.last_run_at,
+                "last_run": self.last_report,
+                "total_interactions_compacted": self.totals['interactions'],
+                "total_mentions_deleted": self.totals['mentions'],
+                "total_text_chars_reclaimed": self.totals['text_chars']
+            }
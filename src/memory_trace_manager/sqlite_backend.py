@@ -0,0 +1,436 @@
+"""Embedded memory graph in a single SQLite file.
+
+Nodes and relationships of the Neo4j model map onto tables: ``users``,
+``interactions`` (whose ``user_id`` column is the HAS_INTERACTION link),
+``concepts``, ``mentions``, ``concept_relationships`` for the legacy
+concept-to-concept links, and ``summaries`` with ``summary_concepts`` for
+compacted interactions. Each batch of interaction rows is one transaction
+on the single write connection. The file runs in WAL mode and every thread
+reads through its own read-only connection, so recall and context queries
+proceed while a batch is being written.
+"""
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from .backends import MemoryBackend
+from .retention import batch_report, summarize
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS users (
+        id TEXT PRIMARY KEY,
+        last_interaction TEXT
+    );
+    CREATE TABLE IF NOT EXISTS interactions (
+        pk INTEGER PRIMARY KEY,
+        id TEXT NOT NULL,
+        user_id TEXT NOT NULL REFERENCES users (id),
+        user_message TEXT,
+        assistant_response TEXT,
+        timestamp TEXT
+    );
+    CREATE INDEX IF NOT EXISTS interactions_user_timestamp ON interactions (user_id, timestamp);
+    CREATE INDEX IF NOT EXISTS interactions_id ON interactions (id);
+    CREATE INDEX IF NOT EXISTS interactions_timestamp ON interactions (timestamp);
+    CREATE TABLE IF NOT EXISTS concepts (
+        pk INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE,
+        properties TEXT NOT NULL DEFAULT '{}'
+    );
+    CREATE TABLE IF NOT EXISTS mentions (
+        interaction INTEGER NOT NULL REFERENCES interactions (pk),
+        concept INTEGER NOT NULL REFERENCES concepts (pk),
+        source TEXT
+    );
+    CREATE INDEX IF NOT EXISTS mentions_interaction ON mentions (interaction);
+    CREATE INDEX IF NOT EXISTS mentions_concept ON mentions (concept);
+    CREATE TABLE IF NOT EXISTS concept_relationships (
+        source INTEGER NOT NULL REFERENCES concepts (pk),
+        type TEXT NOT NULL,
+        target INTEGER NOT NULL REFERENCES concepts (pk),
+        PRIMARY KEY (source, type, target)
+    );
+    CREATE INDEX IF NOT EXISTS concept_relationships_target ON concept_relationships (target);
+    CREATE TABLE IF NOT EXISTS summaries (
+        pk INTEGER PRIMARY KEY,
+        user_id TEXT NOT NULL REFERENCES users (id),
+        period TEXT NOT NULL,
+        interaction_count INTEGER NOT NULL,
+        first_timestamp TEXT,
+        last_timestamp TEXT,
+        UNIQUE (user_id, period)
+    );
+    CREATE TABLE IF NOT EXISTS summary_concepts (
+        summary INTEGER NOT NULL REFERENCES summaries (pk),
+        concept INTEGER NOT NULL REFERENCES concepts (pk),
+        frequency INTEGER NOT NULL,
+        PRIMARY KEY (summary, concept)
+    );
+    CREATE INDEX IF NOT EXISTS summary_concepts_concept ON summary_concepts (concept);
+"""
+
+# Concepts arrive as one JSON array parameter, so the statement text (and its
+# prepared plan) is the same for every concept set, as with $concepts in Cypher.
+# Rows group on the returned columns, like Cypher's implicit grouping keys.
+RECALL_BY_CONCEPTS_SQL = """
+    SELECT i.user_message, i.assistant_response, i.timestamp, COUNT(*) AS relevance_score
+    FROM concepts c
+    JOIN mentions m ON m.concept = c.pk
+    JOIN interactions i ON i.pk = m.interaction
+    WHERE c.name IN (SELECT value FROM json_each(?)) AND i.user_id = ?
+    GROUP BY i.user_message, i.assistant_response, i.timestamp
+    ORDER BY relevance_score DESC, i.timestamp DESC
+    LIMIT ?
+"""
+
+RECENT_INTERACTIONS_SQL = """
+    SELECT user_message, assistant_response, timestamp, 1
+    FROM interactions
+    WHERE user_id = ?
+    ORDER BY timestamp DESC
+    LIMIT ?
+"""
+
+# Mentions of retained interactions plus the counts kept by summaries
+USER_CONCEPTS_SQL = """
+    SELECT c.name, SUM(counted.n) AS frequency
+    FROM (
+        SELECT m.concept, COUNT(*) AS n
+        FROM interactions i JOIN mentions m ON m.interaction = i.pk
+        WHERE i.user_id = ?1
+        GROUP BY m.concept
+        UNION ALL
+        SELECT sc.concept, sc.frequency
+        FROM summaries s JOIN summary_concepts sc ON sc.summary = s.pk
+        WHERE s.user_id = ?1
+    ) counted
+    JOIN concepts c ON c.pk = counted.concept
+    GROUP BY c.pk
+    ORDER BY frequency DESC, c.name
+    LIMIT ?2
+"""
+
+# Undirected, like (c)-[r]-(related): concept links both ways, plus the
+# MENTIONS and SUMMARIZES links from interactions and summaries, which have
+# no name.
+RELATED_SQL = """
+    SELECT r.type, t.name FROM concept_relationships r JOIN concepts t ON t.pk = r.target
+    WHERE r.source = (SELECT pk FROM concepts WHERE name = ?1)
+    UNION ALL
+    SELECT r.type, s.name FROM concept_relationships r JOIN concepts s ON s.pk = r.source
+    WHERE r.target = (SELECT pk FROM concepts WHERE name = ?1)
+    UNION ALL
+    SELECT 'MENTIONS', NULL FROM mentions
+    WHERE concept = (SELECT pk FROM concepts WHERE name = ?1)
+    UNION ALL
+    SELECT 'SUMMARIZES', NULL FROM summary_concepts
+    WHERE concept = (SELECT pk FROM concepts WHERE name = ?1)
+"""
+
+class SQLiteGraphBackend(MemoryBackend):
+    """
+    Memory graph in a local SQLite file, for hosts without a reachable Neo4j.
+    Writes share one connection behind a lock; reads use a read-only
+    connection per thread. Pass ``':memory:'`` for a throwaway store, where
+    reads share the write connection too.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = str(path)
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.readers = threading.local()
+        self.reader_connections: List[sqlite3.Connection] = []
+        self.readers_lock = threading.Lock()
+        self.ensure_schema()
+        logger.info(f"Embedded memory graph opened at {self.path}")
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """This thread's read-only connection (the locked write connection for an in-memory store)."""
+        if self.path == ':memory:':
+            with self.lock:
+                yield self.connection
+            return
+        reader = getattr(self.readers, 'connection', None)
+        if reader is None:
+            # Only ever used by this thread, but close() may run on another
+            reader = sqlite3.connect(f"{Path(self.path).resolve().as_uri()}?mode=ro", uri=True,
+                                     check_same_thread=False)
+            self.readers.connection = reader
+            with self.readers_lock:
+                self.reader_connections.append(reader)
+        yield reader
+
+    def ensure_schema(self) -> bool:
+        try:
+            with self.lock:
+                self.connection.executescript(SCHEMA)
+        except sqlite3.Error as e:
+            logger.error(f"Could not create the embedded memory graph schema: {e}")
+            return False
+        return True
+
+    def write_interactions(self, interactions: List[Dict[str, Any]]):
+        """
+        Persist interaction rows in one transaction. Rows already stored
+        (same id and timestamp) are skipped, as Neo4jBackend MERGEs them.
+        """
+        with self.lock, self.connection:
+            for row in interactions:
+                self.connection.execute(
+                    "INSERT INTO users (id, last_interaction) VALUES (?, ?) "
+                    "ON CONFLICT (id) DO UPDATE SET last_interaction = excluded.last_interaction",
+                    (row['user_id'], row['timestamp'])
+                )
+                if self.connection.execute("SELECT 1 FROM interactions WHERE id = ? AND timestamp = ?",
+                                           (row['interaction_id'], row['timestamp'])).fetchone():
+                    continue
+                interaction = self.connection.execute(
+                    "INSERT INTO interactions (id, user_id, user_message, assistant_response, timestamp) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (row['interaction_id'], row['user_id'], row['user_message'],
+                     row['assistant_response'], row['timestamp'])
+                ).lastrowid
+                mentions = row['mentions']
+                if not mentions:
+                    continue
+                self.connection.executemany("INSERT OR IGNORE INTO concepts (name) VALUES (?)",
+                                            [(mention['concept'],) for mention in mentions])
+                self.connection.executemany(
+                    "INSERT INTO mentions (interaction, concept, source) "
+                    "SELECT ?, pk, ? FROM concepts WHERE name = ?",
+                    [(interaction, mention['source'], mention['concept']) for mention in mentions]
+                )
+
+    def _records(self, sql: str, parameters: tuple) -> List[Dict[str, Any]]:
+        with self._reader() as reader:
+            rows = reader.execute(sql, parameters).fetchall()
+        return [{'message': message, 'response': response, 'timestamp': timestamp, 'relevance_score': score}
+                for message, response, timestamp, score in rows]
+
+    def recall_by_concepts(self, user_id: str, concepts: List[str], limit: int) -> List[Dict[str, Any]]:
+        return self._records(RECALL_BY_CONCEPTS_SQL, (json.dumps(list(concepts)), user_id, limit))
+
+    def recent_interactions(self, user_id: str, limit: int) -> List[Dict[str, Any]]:
+        return self._records(RECENT_INTERACTIONS_SQL, (user_id, limit))
+
+    def load_interactions(self, user_id: str, limit: int) -> List[Dict[str, Any]]:
+        with self._reader() as reader:
+            interactions = reader.execute(
+                "SELECT pk, id, user_message, assistant_response, timestamp FROM interactions "
+                "WHERE user_id = ? ORDER BY timestamp DESC LIMIT ?", (user_id, limit)
+            ).fetchall()
+            mentions: Dict[int, List[Dict[str, Any]]] = {pk: [] for pk, *_ in interactions}
+            if interactions:
+                for pk, name, source in reader.execute(
+                        "SELECT m.interaction, c.name, m.source FROM mentions m JOIN concepts c ON c.pk = m.concept "
+                        "WHERE m.interaction IN (SELECT value FROM json_each(?))", (json.dumps(list(mentions)),)):
+                    mentions[pk].append({'concept': name, 'source': source})
+        return [
+            {
+                'user_id': user_id,
+                'interaction_id': interaction_id,
+                'user_message': message,
+                'assistant_response': response,
+                'timestamp': timestamp,
+                'mentions': mentions[pk]
+            }
+            for pk, interaction_id, message, response, timestamp in reversed(interactions)
+        ]
+
+    def export_interactions(self, batch_size: int = 500) -> Iterator[List[Dict[str, Any]]]:
+        """Every stored interaction row, oldest first, in batches, e.g. to hand over to another backend."""
+        after = 0
+        while True:
+            with self.lock:
+                batch = self.connection.execute(
+                    "SELECT pk, id, user_id, user_message, assistant_response, timestamp FROM interactions "
+                    "WHERE pk > ? ORDER BY pk LIMIT ?", (after, batch_size)
+                ).fetchall()
+                if not batch:
+                    return
+                mentions: Dict[int, List[Dict[str, Any]]] = {row[0]: [] for row in batch}
+                for pk, name, source in self.connection.execute(
+                        "SELECT m.interaction, c.name, m.source FROM mentions m JOIN concepts c ON c.pk = m.concept "
+                        "WHERE m.interaction BETWEEN ? AND ?", (batch[0][0], batch[-1][0])):
+                    mentions[pk].append({'concept': name, 'source': source})
+            after = batch[-1][0]
+            yield [
+                {
+                    'user_id': user_id,
+                    'interaction_id': interaction_id,
+                    'user_message': message,
+                    'assistant_response': response,
+                    'timestamp': timestamp,
+                    'mentions': mentions[pk]
+                }
+                for pk, interaction_id, user_id, message, response, timestamp in batch
+            ]
+
+    def iter_interaction_texts(self, batch_size: int = 500) -> Iterator[List[Dict[str, Any]]]:
+        after = 0
+        while True:
+            with self._reader() as reader:
+                batch = reader.execute(
+                    "SELECT pk, user_message, assistant_response FROM interactions WHERE pk > ? ORDER BY pk LIMIT ?",
+                    (after, batch_size)
+                ).fetchall()
+            if not batch:
+                return
+            after = batch[-1][0]
+            yield [{'key': pk, 'user_message': message, 'assistant_response': response}
+                   for pk, message, response in batch]
+
+    def replace_mentions(self, rows: List[Dict[str, Any]]):
+        with self.lock, self.connection:
+            self.connection.executemany("DELETE FROM mentions WHERE interaction = ?", [(row['key'],) for row in rows])
+            self.connection.executemany("INSERT OR IGNORE INTO concepts (name) VALUES (?)",
+                                        [(mention['concept'],) for row in rows for mention in row['mentions']])
+            self.connection.executemany(
+                "INSERT INTO mentions (interaction, concept, source) SELECT ?, pk, ? FROM concepts WHERE name = ?",
+                [(row['key'], mention['source'], mention['concept']) for row in rows for mention in row['mentions']]
+            )
+
+    def compact_interactions(self, cutoff: str, period: str, batch_size: int = 1000) -> Dict[str, Any]:
+        with self.lock, self.connection:
+            batch = self.connection.execute(
+                "SELECT pk, user_id, timestamp, "
+                "COALESCE(length(user_message), 0) + COALESCE(length(assistant_response), 0) "
+                "FROM interactions WHERE timestamp < ? ORDER BY timestamp LIMIT ?", (cutoff, batch_size)
+            ).fetchall()
+            pks = json.dumps([row[0] for row in batch])
+            concepts: Dict[int, List[str]] = {row[0]: [] for row in batch}
+            if batch:
+                for pk, name in self.connection.execute(
+                        "SELECT m.interaction, c.name FROM mentions m JOIN concepts c ON c.pk = m.concept "
+                        "WHERE m.interaction IN (SELECT value FROM json_each(?))", (pks,)):
+                    concepts[pk].append(name)
+            rows = [{'user_id': user_id, 'timestamp': timestamp, 'text_chars': text_chars, 'concepts': concepts[pk]}
+                    for pk, user_id, timestamp, text_chars in batch]
+            summaries = summarize(rows, period)
+            if rows:
+                self._merge_summaries(summaries)
+                self.connection.execute("DELETE FROM mentions WHERE interaction IN (SELECT value FROM json_each(?))",
+                                        (pks,))
+                self.connection.execute("DELETE FROM interactions WHERE pk IN (SELECT value FROM json_each(?))",
+                                        (pks,))
+        return batch_report(rows, summaries)
+
+    def merge_summaries(self, summaries: List[Dict[str, Any]]):
+        with self.lock, self.connection:
+            self._merge_summaries(summaries)
+
+    def _merge_summaries(self, summaries: List[Dict[str, Any]]):
+        for summary in summaries:
+            self.connection.execute("INSERT OR IGNORE INTO users (id) VALUES (?)", (summary['user_id'],))
+            self.connection.execute(
+                "INSERT INTO summaries (user_id, period, interaction_count, first_timestamp, last_timestamp) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (user_id, period) DO UPDATE SET "
+                "interaction_count = interaction_count + excluded.interaction_count, "
+                "first_timestamp = min(first_timestamp, excluded.first_timestamp), "
+                "last_timestamp = max(last_timestamp, excluded.last_timestamp)",
+                (summary['user_id'], summary['period'], summary['interaction_count'],
+                 summary['first_timestamp'], summary['last_timestamp'])
+            )
+            pk = self.connection.execute("SELECT pk FROM summaries WHERE user_id = ? AND period = ?",
+                                         (summary['user_id'], summary['period'])).fetchone()[0]
+            self.connection.executemany("INSERT OR IGNORE INTO concepts (name) VALUES (?)",
+                                        [(concept['concept'],) for concept in summary['concepts']])
+            self.connection.executemany(
+                "INSERT INTO summary_concepts (summary, concept, frequency) "
+                "SELECT ?, pk, ? FROM concepts WHERE name = ? "
+                "ON CONFLICT (summary, concept) DO UPDATE SET frequency = frequency + excluded.frequency",
+                [(pk, concept['frequency'], concept['concept']) for concept in summary['concepts']]
+            )
+
+    def export_summaries(self) -> List[Dict[str, Any]]:
+        """Every stored summary row, e.g. to hand over to another backend."""
+        with self.lock:
+            summaries = self.connection.execute(
+                "SELECT pk, user_id, period, interaction_count, first_timestamp, last_timestamp FROM summaries"
+            ).fetchall()
+            concepts: Dict[int, List[Dict[str, Any]]] = {row[0]: [] for row in summaries}
+            for pk, name, frequency in self.connection.execute(
+                    "SELECT sc.summary, c.name, sc.frequency FROM summary_concepts sc "
+                    "JOIN concepts c ON c.pk = sc.concept ORDER BY sc.summary, sc.frequency DESC"):
+                concepts[pk].append({'concept': name, 'frequency': frequency})
+        return [
+            {
+                'user_id': user_id,
+                'period': period,
+                'interaction_count': count,
+                'first_timestamp': first,
+                'last_timestamp': last,
+                'concepts': concepts[pk]
+            }
+            for pk, user_id, period, count, first, last in summaries
+        ]
+
+    def clear(self):
+        """Delete every user, interaction, summary, concept and relationship."""
+        with self.lock, self.connection:
+            for table in ('concept_relationships', 'mentions', 'summary_concepts', 'summaries', 'interactions',
+                          'concepts', 'users'):
+                self.connection.execute(f"DELETE FROM {table}")
+
+    def user_stats(self, user_id: str) -> Optional[Dict[str, Any]]:
+        with self._reader() as reader:
+            row = reader.execute(
+                "SELECT last_interaction, (SELECT COUNT(*) FROM interactions WHERE user_id = ?1) + "
+                "(SELECT COALESCE(SUM(interaction_count), 0) FROM summaries WHERE user_id = ?1) "
+                "FROM users WHERE id = ?1", (user_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'last_interaction': row[0], 'interaction_count': row[1]}
+
+    def user_concepts(self, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        with self._reader() as reader:
+            rows = reader.execute(USER_CONCEPTS_SQL, (user_id, limit)).fetchall()
+        return [{'name': name, 'frequency': frequency} for name, frequency in rows]
+
+    def add_concept(self, concept: str, properties: Dict[str, Any]):
+        with self.lock, self.connection:
+            row = self.connection.execute("SELECT properties FROM concepts WHERE name = ?", (concept,)).fetchone()
+            merged = {**(json.loads(row[0]) if row else {}), **properties}
+            self.connection.execute(
+                "INSERT INTO concepts (name, properties) VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET properties = excluded.properties",
+                (concept, json.dumps(merged))
+            )
+
+    def create_relationship(self, concept1: str, relationship: str, concept2: str):
+        # Like MATCH ... MATCH ... MERGE: nothing happens unless both concepts exist
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO concept_relationships (source, type, target) "
+                "SELECT a.pk, ?, b.pk FROM concepts a, concepts b WHERE a.name = ? AND b.name = ?",
+                (relationship.upper(), concept1, concept2)
+            )
+
+    def related(self, concept: str) -> List[Dict[str, Any]]:
+        with self._reader() as reader:
+            rows = reader.execute(RELATED_SQL, (concept,)).fetchall()
+        return [{"relationship": relationship, "concept": name} for relationship, name in rows]
+
+    def close(self):
+        with self.readers_lock:
+            readers, self.reader_connections = self.reader_connections, []
+        for reader in readers:
+            reader.close()
+        with self.lock:
+            self.connection.close()
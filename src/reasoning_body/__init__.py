@@ -10,6 +10,7 @@ from .logic_engine import (
     FallacyDetector,
     ArgumentParser
 )
+from .matcher import ReasoningMatcher, ReasoningMatches
 
 __all__ = [
     'ReasoningBody',
@@ -19,5 +20,7 @@ __all__ = [
     'AnalogicalReasoner',
     'CausalReasoner',
     'FallacyDetector',
-    'ArgumentParser'
+    'ArgumentParser',
+    'ReasoningMatcher',
+    'ReasoningMatches'
 ]
@@ -1,11 +1,31 @@
+import json
 import logging
+import os
 import re
-from typing import Dict, List, Any, Optional, Tuple
+from typing import IO, Dict, Iterable, Iterator, List, Any, Optional, Pattern, Sequence, Tuple, Union
 from collections import defaultdict
 
+from ..text_analysis import AnalyzedText
+from ..text_analysis.batching import chunked, map_chunks
+from .matcher import ReasoningMatcher, ReasoningMatches
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+LOGICAL_CONNECTORS = ('and', 'or', 'not', 'if', 'then', 'because', 'therefore', 'however', 'although')
+
+def _findall(pattern: Pattern, anchors: Sequence[str], text: str, matches: Optional[ReasoningMatches]) -> list:
+    """``pattern.findall(text)``, attempted only at anchor offsets when a shared scan is available."""
+    if matches is None:
+        return pattern.findall(text)
+    return matches.findall(pattern, anchors)
+
+def _contains(word: str, text_lower: str, matches: Optional[ReasoningMatches]) -> bool:
+    """``word in text_lower``, answered from the shared scan when available."""
+    if matches is None:
+        return word in text_lower
+    return matches.contains(word)
+
 class DeductiveReasoner:
     """Handles deductive reasoning patterns like syllogisms and logical entailments."""
 
@@ -16,13 +36,25 @@ class DeductiveReasoner:
             'syllogism': re.compile(r'(all|some|no) (.+?) (are|is) (.+?)(?:\.|\s|$)', re.IGNORECASE),
             'hypothetical': re.compile(r'suppose|assume|given that (.+?)(?:\.|\s|$)', re.IGNORECASE)
         }
+        # Literal text every match of each pattern must start with
+        self.pattern_anchors = {
+            'modus_ponens': ('if ',),
+            'modus_tollens': ('if ',),
+            'syllogism': ('all ', 'some ', 'no '),
+            'hypothetical': ('suppose', 'assume', 'given that ')
+        }
+        self.indicator_words = ['therefore', 'thus', 'hence', 'consequently', 'follows that']
 
-    def analyze(self, text: str) -> Dict[str, Any]:
+    def _findall(self, name: str, text: str, matches: Optional[ReasoningMatches]) -> list:
+        return _findall(self.deductive_patterns[name], self.pattern_anchors[name], text, matches)
+
+    def analyze(self, text: Union[str, AnalyzedText], matches: Optional[ReasoningMatches] = None) -> Dict[str, Any]:
         """Analyze text for deductive reasoning patterns."""
-        text_lower = text.lower()
+        analyzed = AnalyzedText.of(text)
+        text, text_lower = analyzed.text, analyzed.lower
 
         # Check for conditional statements
-        conditionals = self.deductive_patterns['modus_ponens'].findall(text)
+        conditionals = self._findall('modus_ponens', text, matches)
         if conditionals:
             return {
                 'type': 'DEDUCTIVE',
@@ -33,7 +65,7 @@ class DeductiveReasoner:
             }
 
         # Check for syllogistic structure
-        syllogisms = self.deductive_patterns['syllogism'].findall(text)
+        syllogisms = self._findall('syllogism', text, matches)
         if syllogisms:
             return {
                 'type': 'DEDUCTIVE',
@@ -44,12 +76,12 @@ class DeductiveReasoner:
             }
 
         # General deductive indicators
-        deductive_words = ['therefore', 'thus', 'hence', 'consequently', 'follows that']
-        if any(word in text_lower for word in deductive_words):
+        indicators = [word for word in self.indicator_words if _contains(word, text_lower, matches)]
+        if indicators:
             return {
                 'type': 'DEDUCTIVE',
                 'subtype': 'GENERAL',
-                'indicators': [word for word in deductive_words if word in text_lower],
+                'indicators': indicators,
                 'confidence': 0.75,
                 'structure': 'Conclusion follows necessarily'
             }
@@ -65,13 +97,24 @@ class InductiveReasoner:
             'enumeration': re.compile(r'(?:first|second|third|next|then|finally) (.+?)(?:\.|\s|$)', re.IGNORECASE),
             'analogy': re.compile(r'(?:like|similar to|just as|analogous to) (.+?)(?:\.|\s|$)', re.IGNORECASE)
         }
+        # Literal text every match of each pattern must start with
+        self.pattern_anchors = {
+            'generalization': ('all ', 'every ', 'most ', 'many '),
+            'enumeration': ('first ', 'second ', 'third ', 'next ', 'then ', 'finally '),
+            'analogy': ('like ', 'similar to ', 'just as ', 'analogous to ')
+        }
+        self.indicator_words = ['because', 'since', 'due to', 'as a result of', 'based on']
+
+    def _findall(self, name: str, text: str, matches: Optional[ReasoningMatches]) -> list:
+        return _findall(self.inductive_patterns[name], self.pattern_anchors[name], text, matches)
 
-    def analyze(self, text: str) -> Dict[str, Any]:
+    def analyze(self, text: Union[str, AnalyzedText], matches: Optional[ReasoningMatches] = None) -> Dict[str, Any]:
         """Analyze text for inductive reasoning patterns."""
-        text_lower = text.lower()
+        analyzed = AnalyzedText.of(text)
+        text, text_lower = analyzed.text, analyzed.lower
 
         # Check for generalizations
-        generalizations = self.inductive_patterns['generalization'].findall(text)
+        generalizations = self._findall('generalization', text, matches)
         if generalizations:
             return {
                 'type': 'INDUCTIVE',
@@ -82,7 +125,7 @@ class InductiveReasoner:
             }
 
         # Check for enumerative induction
-        enumerations = self.inductive_patterns['enumeration'].findall(text)
+        enumerations = self._findall('enumeration', text, matches)
         if len(enumerations) > 2:
             return {
                 'type': 'INDUCTIVE',
@@ -93,12 +136,12 @@ class InductiveReasoner:
             }
 
         # General inductive indicators
-        inductive_words = ['because', 'since', 'due to', 'as a result of', 'based on']
-        if any(word in text_lower for word in inductive_words):
+        indicators = [word for word in self.indicator_words if _contains(word, text_lower, matches)]
+        if indicators:
             return {
                 'type': 'INDUCTIVE',
                 'subtype': 'CAUSAL_INDUCTION',
-                'indicators': [word for word in inductive_words if word in text_lower],
+                'indicators': indicators,
                 'confidence': 0.60,
                 'structure': 'Cause-effect relationships'
             }
@@ -113,13 +156,21 @@ class AbductiveReasoner:
             'explanation': re.compile(r'(?:probably|likely|must be|best explanation) (.+?)(?:\.|\s|$)', re.IGNORECASE),
             'inference': re.compile(r'(?:therefore|so|thus) (.+?) (?:because|since) (.+?)(?:\.|\s|$)', re.IGNORECASE)
         }
+        # Literal text every match of each pattern must start with
+        self.pattern_anchors = {
+            'explanation': ('probably ', 'likely ', 'must be ', 'best explanation '),
+            'inference': ('therefore ', 'so ', 'thus ')
+        }
+
+    def _findall(self, name: str, text: str, matches: Optional[ReasoningMatches]) -> list:
+        return _findall(self.abductive_patterns[name], self.pattern_anchors[name], text, matches)
 
-    def analyze(self, text: str) -> Dict[str, Any]:
+    def analyze(self, text: Union[str, AnalyzedText], matches: Optional[ReasoningMatches] = None) -> Dict[str, Any]:
         """Analyze text for abductive reasoning patterns."""
-        text_lower = text.lower()
+        text = AnalyzedText.of(text).text
 
         # Check for best explanation patterns
-        explanations = self.abductive_patterns['explanation'].findall(text)
+        explanations = self._findall('explanation', text, matches)
         if explanations:
             return {
                 'type': 'ABDUCTIVE',
@@ -130,7 +181,7 @@ class AbductiveReasoner:
             }
 
         # Check for explanatory inferences
-        inferences = self.abductive_patterns['inference'].findall(text)
+        inferences = self._findall('inference', text, matches)
         if inferences:
             return {
                 'type': 'ABDUCTIVE',
@@ -150,11 +201,20 @@ class AnalogicalReasoner:
             'analogy': re.compile(r'(?:like|similar to|just as|analogous to|compared to) (.+?)(?:\.|\s|$)', re.IGNORECASE),
             'metaphor': re.compile(r'(?:is like|is a|as if) (.+?)(?:\.|\s|$)', re.IGNORECASE)
         }
+        # Literal text every match of each pattern must start with
+        self.pattern_anchors = {
+            'analogy': ('like ', 'similar to ', 'just as ', 'analogous to ', 'compared to '),
+            'metaphor': ('is like ', 'is a ', 'as if ')
+        }
+
+    def _findall(self, name: str, text: str, matches: Optional[ReasoningMatches]) -> list:
+        return _findall(self.analogical_patterns[name], self.pattern_anchors[name], text, matches)
 
-    def analyze(self, text: str) -> Dict[str, Any]:
+    def analyze(self, text: Union[str, AnalyzedText], matches: Optional[ReasoningMatches] = None) -> Dict[str, Any]:
         """Analyze text for analogical reasoning patterns."""
-        analogies = self.analogical_patterns['analogy'].findall(text)
-        metaphors = self.analogical_patterns['metaphor'].findall(text)
+        text = AnalyzedText.of(text).text
+        analogies = self._findall('analogy', text, matches)
+        metaphors = self._findall('metaphor', text, matches)
 
         if analogies or metaphors:
             return {
@@ -175,11 +235,20 @@ class CausalReasoner:
             'causation': re.compile(r'(?:because|since|due to|caused by|leads to|results in) (.+?)(?:\.|\s|$)', re.IGNORECASE),
             'correlation': re.compile(r'(?:correlates with|associated with|related to) (.+?)(?:\.|\s|$)', re.IGNORECASE)
         }
+        # Literal text every match of each pattern must start with
+        self.pattern_anchors = {
+            'causation': ('because ', 'since ', 'due to ', 'caused by ', 'leads to ', 'results in '),
+            'correlation': ('correlates with ', 'associated with ', 'related to ')
+        }
 
-    def analyze(self, text: str) -> Dict[str, Any]:
+    def _findall(self, name: str, text: str, matches: Optional[ReasoningMatches]) -> list:
+        return _findall(self.causal_patterns[name], self.pattern_anchors[name], text, matches)
+
+    def analyze(self, text: Union[str, AnalyzedText], matches: Optional[ReasoningMatches] = None) -> Dict[str, Any]:
         """Analyze text for causal reasoning patterns."""
-        causations = self.causal_patterns['causation'].findall(text)
-        correlations = self.causal_patterns['correlation'].findall(text)
+        text = AnalyzedText.of(text).text
+        causations = self._findall('causation', text, matches)
+        correlations = self._findall('correlation', text, matches)
 
         if causations:
             return {
@@ -212,18 +281,27 @@ class FallacyDetector:
             'appeal_to_authority': re.compile(r'(?:experts say|scientists claim|authority says) (.+?)(?:\.|\s|$)', re.IGNORECASE),
             'straw_man': re.compile(r'(?:you claim|they say|opponents argue) (.+?) (?:but really|but actually) (.+?)(?:\.|\s|$)', re.IGNORECASE)
         }
+        # Literal text every match of each pattern must start with
+        self.pattern_anchors = {
+            'ad_hominem': ("you're ", 'you are '),
+            'false_dichotomy': ('either ', 'or ', 'only ', 'must be '),
+            'slippery_slope': ('will lead to ', 'will cause ', 'will result in '),
+            'appeal_to_authority': ('experts say ', 'scientists claim ', 'authority says '),
+            'straw_man': ('you claim ', 'they say ', 'opponents argue ')
+        }
 
-    def detect(self, text: str) -> List[Dict[str, Any]]:
+    def detect(self, text: Union[str, AnalyzedText], matches: Optional[ReasoningMatches] = None) -> List[Dict[str, Any]]:
         """Detect logical fallacies in text."""
+        text = AnalyzedText.of(text).text
         fallacies = []
 
         for fallacy_type, pattern in self.fallacy_patterns.items():
-            matches = pattern.findall(text)
-            if matches:
+            found = _findall(pattern, self.pattern_anchors[fallacy_type], text, matches)
+            if found:
                 fallacies.append({
                     'type': fallacy_type.upper(),
-                    'matches': matches,
-                    'severity': 'HIGH' if len(matches) > 1 else 'MEDIUM'
+                    'matches': found,
+                    'severity': 'HIGH' if len(found) > 1 else 'MEDIUM'
                 })
 
         return fallacies
@@ -238,29 +316,46 @@ class ArgumentParser:
             'qualifiers': ['probably', 'likely', 'possibly', 'maybe', 'perhaps']
         }
 
-    def parse(self, text: str) -> Dict[str, Any]:
+    def parse(self, text: Union[str, AnalyzedText], matches: Optional[ReasoningMatches] = None) -> Dict[str, Any]:
         """Parse argument structure from text."""
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        analyzed = AnalyzedText.of(text)
 
         premises = []
         conclusions = []
         qualifiers = []
 
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
+        if matches is not None:
+            # Sentence indexes holding each kind of indicator, from the shared scan
+            flagged = {kind: matches.sentences_containing(indicators)
+                       for kind, indicators in self.argument_indicators.items()}
+            for index in sorted(set().union(*flagged.values())):
+                sentence = analyzed.sentences[index].strip()
+                if not sentence:
+                    continue
+                if index in flagged['premises']:
+                    premises.append(sentence)
+                if index in flagged['conclusions']:
+                    conclusions.append(sentence)
+                if index in flagged['qualifiers']:
+                    qualifiers.append(sentence)
+        else:
+            for sentence, sentence_lower in zip(analyzed.sentences, analyzed.lower_sentences):
+                sentence = sentence.strip()
+                if not sentence:
+                    continue
+                sentence_lower = sentence_lower.strip()
 
-            # Check for premises
-            if any(indicator in sentence_lower for indicator in self.argument_indicators['premises']):
-                premises.append(sentence)
+                # Check for premises
+                if any(indicator in sentence_lower for indicator in self.argument_indicators['premises']):
+                    premises.append(sentence)
 
-            # Check for conclusions
-            if any(indicator in sentence_lower for indicator in self.argument_indicators['conclusions']):
-                conclusions.append(sentence)
+                # Check for conclusions
+                if any(indicator in sentence_lower for indicator in self.argument_indicators['conclusions']):
+                    conclusions.append(sentence)
 
-            # Check for qualifiers
-            if any(indicator in sentence_lower for indicator in self.argument_indicators['qualifiers']):
-                qualifiers.append(sentence)
+                # Check for qualifiers
+                if any(indicator in sentence_lower for indicator in self.argument_indicators['qualifiers']):
+                    qualifiers.append(sentence)
 
         return {
             'premises': premises,
@@ -286,7 +381,7 @@ class ReasoningBody:
     Integrates multiple reasoning types for comprehensive cognitive processing.
     """
 
-    def __init__(self):
+    def __init__(self, use_matcher: bool = True):
         logger.info("Reasoning Body Initialized with deconstructed reasoning capabilities.")
         self.deductive_reasoner = DeductiveReasoner()
         self.inductive_reasoner = InductiveReasoner()
@@ -295,17 +390,33 @@ class ReasoningBody:
         self.causal_reasoner = CausalReasoner()
         self.fallacy_detector = FallacyDetector()
         self.argument_parser = ArgumentParser()
-
-    def analyze(self, prompt: str) -> Dict[str, Any]:
+        self.matcher = self._build_matcher() if use_matcher else None
+
+    def _build_matcher(self) -> ReasoningMatcher:
+        """Compile every reasoner's anchors and indicator words into one matcher."""
+        literals = []
+        for reasoner in (self.deductive_reasoner, self.inductive_reasoner, self.abductive_reasoner,
+                         self.analogical_reasoner, self.causal_reasoner, self.fallacy_detector):
+            for anchors in reasoner.pattern_anchors.values():
+                literals.extend(anchors)
+        literals.extend(self.deductive_reasoner.indicator_words)
+        literals.extend(self.inductive_reasoner.indicator_words)
+        for indicators in self.argument_parser.argument_indicators.values():
+            literals.extend(indicators)
+        return ReasoningMatcher(literals)
+
+    def analyze(self, prompt: Union[str, AnalyzedText]) -> Dict[str, Any]:
         """
         Perform comprehensive logical analysis on input text.
 
         Args:
-            prompt: The text to analyze
+            prompt: The text to analyze, raw or already analyzed
 
         Returns:
             Dict containing reasoning analysis results
         """
+        analyzed = AnalyzedText.of(prompt)
+        prompt = analyzed.text
         if not prompt.strip():
             return {
                 'primary_reasoning_type': 'NONE',
@@ -315,13 +426,16 @@ class ReasoningBody:
                 'argument_structure': {'premises': [], 'conclusions': [], 'qualifiers': [], 'argument_strength': 'NONE'}
             }
 
+        # One scan for every anchor and indicator, shared by all reasoners
+        matches = self.matcher.scan(analyzed) if self.matcher is not None else None
+
         # Perform analysis with all reasoners
         analyses = {
-            'deductive': self.deductive_reasoner.analyze(prompt),
-            'inductive': self.inductive_reasoner.analyze(prompt),
-            'abductive': self.abductive_reasoner.analyze(prompt),
-            'analogical': self.analogical_reasoner.analyze(prompt),
-            'causal': self.causal_reasoner.analyze(prompt)
+            'deductive': self.deductive_reasoner.analyze(analyzed, matches),
+            'inductive': self.inductive_reasoner.analyze(analyzed, matches),
+            'abductive': self.abductive_reasoner.analyze(analyzed, matches),
+            'analogical': self.analogical_reasoner.analyze(analyzed, matches),
+            'causal': self.causal_reasoner.analyze(analyzed, matches)
         }
 
         # Find the reasoning type with highest confidence
@@ -329,10 +443,10 @@ class ReasoningBody:
         primary_type = best_analysis.get('type', 'UNKNOWN')
 
         # Detect fallacies
-        fallacies = self.fallacy_detector.detect(prompt)
+        fallacies = self.fallacy_detector.detect(analyzed, matches)
 
         # Parse argument structure
-        argument_structure = self.argument_parser.parse(prompt)
+        argument_structure = self.argument_parser.parse(analyzed, matches)
 
         # Calculate overall confidence
         overall_confidence = best_analysis.get('confidence', 0.0)
@@ -346,19 +460,26 @@ class ReasoningBody:
             'all_reasoning_types': {k: v for k, v in analyses.items() if v['type'] != 'UNKNOWN'},
             'fallacies': fallacies,
             'argument_structure': argument_structure,
-            'reasoning_complexity': self._calculate_complexity(prompt),
+            'reasoning_complexity': self._calculate_complexity(analyzed, matches),
             'logical_validity': 'INVALID' if fallacies else 'VALID' if overall_confidence > 0.7 else 'UNCERTAIN'
         }
 
         logger.info(f"Logical analysis complete for prompt: '{prompt[:50]}...' -> {primary_type} (confidence: {overall_confidence:.2f})")
         return result
 
-    def _calculate_complexity(self, text: str) -> str:
+    def _calculate_complexity(self, text: Union[str, AnalyzedText], matches: Optional[ReasoningMatches] = None) -> str:
         """Calculate the complexity level of reasoning in the text."""
-        word_count = len(text.split())
-        sentence_count = len(re.split(r'[.!?]+', text))
-
-        logical_connectors = len(re.findall(r'\b(and|or|not|if|then|because|therefore|however|although)\b', text, re.IGNORECASE))
+        analyzed = AnalyzedText.of(text)
+        text = analyzed.text
+        word_count = len(analyzed.words)
+        sentence_count = len(analyzed.sentences)
+
+        if matches is not None:
+            # Whole-word connectors are exactly the matching lowercase tokens
+            token_counts = analyzed.token_counts
+            logical_connectors = sum(token_counts[word] for word in LOGICAL_CONNECTORS)
+        else:
+            logical_connectors = len(re.findall(r'\b(and|or|not|if|then|because|therefore|however|although)\b', text, re.IGNORECASE))
 
         if logical_connectors >= 3 and sentence_count >= 3:
             return 'HIGH'
@@ -369,9 +490,72 @@ class ReasoningBody:
         else:
             return 'MINIMAL'
 
-    def get_reasoning_profile(self, text: str) -> Dict[str, Any]:
+    def analyze_many(self, documents: Iterable[Union[str, AnalyzedText]], workers: Optional[int] = None,
+                     chunk_size: int = 64, max_pending_chunks: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Analyze a large corpus across a process pool, yielding results in input order.
+
+        Documents are consumed lazily and sent to workers in chunks. Each worker
+        builds one ReasoningBody when it starts and reuses its compiled patterns
+        for every chunk, and at most ``max_pending_chunks`` chunks are in flight
+        at once, so memory stays bounded however long the input is.
+
+        Args:
+            documents: Iterable of texts, raw or already analyzed
+            workers: Worker processes (defaults to the CPU count); 0 or 1 analyzes in this process
+            chunk_size: Documents sent to a worker per task
+            max_pending_chunks: Chunks submitted ahead of the one being yielded (defaults to 2 * workers)
+
+        Returns:
+            Iterator of analysis dicts, one per document, in input order
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        chunks = chunked((AnalyzedText.of(document).text for document in documents), chunk_size)
+
+        if workers <= 1:
+            for chunk in chunks:
+                for document in chunk:
+                    yield self.analyze(document)
+            return
+
+        for results in map_chunks(_analyze_batch_chunk, chunks, workers, max_pending_chunks or 2 * workers,
+                                  _init_batch_worker, (self.matcher is not None,), quiet_loggers=(__name__,)):
+            yield from results
+
+    def analyze_stream(self, documents: Iterable[Union[str, AnalyzedText]],
+                       sink: Optional[Union[str, os.PathLike, IO[str]]] = None,
+                       **options) -> Iterator[Dict[str, Any]]:
+        """
+        Stream analyses of a corpus, optionally writing each one to a JSONL sink.
+
+        Args:
+            documents: Iterable of texts, raw or already analyzed
+            sink: Optional path or text file object receiving one JSON line per result
+            **options: Passed through to ``analyze_many``
+
+        Returns:
+            Iterator of analysis dicts in input order, each yielded after it is written
+        """
+        results = self.analyze_many(documents, **options)
+        if sink is None:
+            yield from results
+            return
+
+        handle = open(sink, 'w', encoding='utf-8') if isinstance(sink, (str, os.PathLike)) else sink
+        try:
+            for result in results:
+                handle.write(json.dumps(result, ensure_ascii=False) + '\n')
+                yield result
+            handle.flush()
+        finally:
+            if handle is not sink:
+                handle.close()
+
+    def get_reasoning_profile(self, text: Union[str, AnalyzedText]) -> Dict[str, Any]:
         """Get a comprehensive reasoning profile for advanced analysis."""
         base_analysis = self.analyze(text)
+        text = AnalyzedText.of(text).text
 
         # Add additional metrics
         profile = {
@@ -400,3 +584,13 @@ class ReasoningBody:
             patterns.append('probabilistic_reasoning')
 
         return patterns
+
+# Per-process ReasoningBody for analyze_many, built once by the pool initializer
+_batch_body: Optional[ReasoningBody] = None
+
+def _init_batch_worker(use_matcher: bool):
+    global _batch_body
+    _batch_body = ReasoningBody(use_matcher=use_matcher)
+
+def _analyze_batch_chunk(chunk: List[str]) -> List[Dict[str, Any]]:
+    return [_batch_body.analyze(document) for document in chunk]
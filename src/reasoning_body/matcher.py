@@ -0,0 +1,81 @@
+"""Compiled single-pass matcher for ReasoningBody's indicators and pattern anchors.
+
+Every reasoner pattern starts with one of a small set of literal anchors
+("if ", "because ", "you claim ", ...) and every indicator check is a plain
+substring test. ReasoningMatcher finds every occurrence of all of those
+literals in a single scan of the lowercased text. Reasoners then read
+indicator presence from the shared result and only attempt their full regex
+at anchor positions, which yields exactly what ``findall`` over the whole text
+would.
+"""
+from bisect import bisect_right
+from heapq import merge
+from typing import Dict, Iterable, List, Optional, Pattern, Sequence, Union
+
+from ..text_analysis import AnalyzedText
+from ..text_analysis.literal_scanner import CASE_UNSAFE, LiteralScanner
+
+
+class ReasoningMatches:
+    """Occurrences of every registered literal in one text."""
+
+    def __init__(self, analyzed: AnalyzedText, positions: Dict[str, List[int]]):
+        self.analyzed = analyzed
+        self.positions = positions
+
+    def contains(self, literal: str) -> bool:
+        """Substring test equivalent to ``literal in text.lower()``."""
+        return bool(self.positions[literal])
+
+    def sentences_containing(self, literals: Sequence[str]) -> set:
+        """Indexes of ``analyzed.lower_sentences`` segments containing any literal."""
+        starts = self.analyzed.sentence_starts
+        return {bisect_right(starts, position) - 1 for literal in literals for position in self.positions[literal]}
+
+    def findall(self, pattern: Pattern, anchors: Sequence[str]) -> list:
+        """
+        Equivalent of ``pattern.findall(text)`` for a pattern that can only
+        start where one of ``anchors`` occurs (case-insensitively).
+        """
+        if len(anchors) == 1:
+            candidates = self.positions[anchors[0]]
+        else:
+            candidates = merge(*(self.positions[anchor] for anchor in anchors))
+
+        text = self.analyzed.text
+        match_at = pattern.match
+        results = []
+        resume = 0
+        for position in candidates:
+            if position < resume:
+                continue
+            match = match_at(text, position)
+            if match:
+                groups = match.groups('')
+                results.append(groups[0] if len(groups) == 1 else groups)
+                resume = match.end()
+        return results
+
+
+class ReasoningMatcher:
+    """
+    Compiles a fixed set of lowercase literals once and locates all of them in
+    one linear pass per text.
+    """
+
+    def __init__(self, literals: Iterable[str]):
+        self.scanner = LiteralScanner(literals)
+        self.literals = self.scanner.literals
+
+    def scan(self, text: Union[str, AnalyzedText]) -> Optional[ReasoningMatches]:
+        """
+        Find every literal occurrence in ``text``.
+
+        Returns None for the rare texts containing characters that make the
+        lowercased offsets unreliable; callers then fall back to full regex scans.
+        """
+        analyzed = AnalyzedText.of(text)
+        if not analyzed.text.isascii() and CASE_UNSAFE.search(analyzed.text):
+            return None
+
+        return ReasoningMatches(analyzed, self.scanner.positions(analyzed.lower))
@@ -0,0 +1,10 @@
+# src/response_cache/__init__.py
+
+from .cache import CacheStore, LRUTTLCache, TieredCache, pickled_size
+from .sqlite_store import SQLiteCacheStore
+from .pipeline import create_response_cache, file_digest, response_cache_key, source_version
+
+__all__ = [
+    "CacheStore", "LRUTTLCache", "TieredCache", "SQLiteCacheStore", "pickled_size",
+    "create_response_cache", "file_digest", "response_cache_key", "source_version"
+]
@@ -0,0 +1,207 @@
+"""In-memory LRU + TTL cache and the store interface every cache tier implements.
+
+Entries live in an OrderedDict kept in recency order, so get, put and
+eviction are O(1). Expired entries are dropped lazily when they are read or
+reach the least-recently-used end; nothing rescans the whole cache on a
+write. A byte budget bounds memory on top of the entry count.
+"""
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+def pickled_size(value: Any) -> int:
+    """Approximate footprint of a cached value: the length of its pickle."""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+class CacheStore:
+    """
+    Interface shared by cache tiers. ``get`` returns None on a miss, so None
+    itself is not a cacheable value.
+    """
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        raise NotImplementedError
+
+    def put(self, key: Hashable, value: Any):
+        raise NotImplementedError
+
+    def delete(self, key: Hashable) -> bool:
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def get_stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class LRUTTLCache(CacheStore):
+    """
+    Thread-safe LRU cache whose entries also expire ``ttl`` seconds after
+    they were stored. Whichever of ``max_entries`` and ``max_bytes`` is hit
+    first evicts from the least recently used end.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 3600.0,
+                 max_bytes: Optional[int] = None, sizer: Callable[[Any], int] = pickled_size,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizer = sizer
+        self.clock = clock
+        # key -> (value, expires_at, size), least recently used first
+        self.entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self.lock:
+            entry = self.entries.get(key)
+            return entry is not None and not self._expired(entry, self.clock())
+
+    def _expired(self, entry: tuple, now: float) -> bool:
+        return entry[1] is not None and now >= entry[1]
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if self._expired(entry, self.clock()):
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any):
+        size = self.sizer(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            with self.lock:
+                self.rejected += 1
+                if key in self.entries:
+                    self._remove(key)
+            return
+        expires_at = self.clock() + self.ttl if self.ttl is not None else None
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (value, expires_at, size)
+            self.total_bytes += size
+            self._evict()
+
+    def _evict(self):
+        now = self.clock()
+        while self.entries and (len(self.entries) > self.max_entries or
+                                (self.max_bytes is not None and self.total_bytes > self.max_bytes)):
+            key, entry = self.entries.popitem(last=False)
+            self.total_bytes -= entry[2]
+            if self._expired(entry, now):
+                self.expirations += 1
+            else:
+                self.evictions += 1
+
+    def _remove(self, key: Hashable):
+        _, _, size = self.entries.pop(key)
+        self.total_bytes -= size
+
+    def delete(self, key: Hashable) -> bool:
+        with self.lock:
+            if key not in self.entries:
+                return False
+            self._remove(key)
+            return True
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry now instead of waiting for lazy expiry. O(n)."""
+        with self.lock:
+            now = self.clock()
+            expired = [key for key, entry in self.entries.items() if self._expired(entry, now)]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+            return len(expired)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "rejected": self.rejected
+            }
+
+class TieredCache(CacheStore):
+    """
+    Memory tier in front of a slower persistent store. Writes go to both; a
+    memory miss that the backing store can serve is promoted, so a restarted
+    process warms up from disk instead of recomputing.
+    """
+
+    def __init__(self, memory: CacheStore, backing: CacheStore):
+        self.memory = memory
+        self.backing = backing
+        self.backing_hits = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        value = self.backing.get(key)
+        if value is not None:
+            self.backing_hits += 1
+            self.memory.put(key, value)
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        self.memory.put(key, value)
+        self.backing.put(key, value)
+
+    def delete(self, key: Hashable) -> bool:
+        in_memory = self.memory.delete(key)
+        return self.backing.delete(key) or in_memory
+
+    def clear(self):
+        self.memory.clear()
+        self.backing.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.memory.get_stats(), "backing_hits": self.backing_hits, "backing": self.backing.get_stats()}
+
+    def close(self):
+        self.memory.close()
+        self.backing.close()
@@ -0,0 +1,75 @@
+"""Content-addressed keys and construction of the cognitive pipeline's response cache.
+
+Reasoning, emotion, pattern detection and synthesis are deterministic in the
+prompt, so their outputs can be reused for a repeated prompt as long as the
+key also covers everything else that shapes them: the enabled modules, the
+depth flag and the code and data versions of each stage.
+"""
+import hashlib
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+from .cache import CacheStore, LRUTTLCache, TieredCache
+from .sqlite_store import SQLiteCacheStore
+
+logger = logging.getLogger(__name__)
+
+def response_cache_key(prompt: str, modules: Iterable[str], enable_depth: bool,
+                       versions: Dict[str, str]) -> str:
+    """
+    Hash of (prompt, enabled modules, depth flag, module versions).
+
+    The prompt is hashed verbatim: every stage reads its case, whitespace and
+    length, so folding any of them would hand back another prompt's analysis.
+    Modules are normalized to a sorted, de-duplicated list.
+    """
+    payload = json.dumps([prompt, sorted(set(modules)), bool(enable_depth), sorted(versions.items())],
+                         ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode('utf-8', 'surrogatepass'), digest_size=20).hexdigest()
+
+def file_digest(path: Union[str, Path]) -> str:
+    """Short content digest of a file, e.g. a module's source or a data file it loads."""
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+
+def source_version(module_name: str) -> str:
+    """
+    Code version of an imported module: a digest over every ``.py`` file of
+    the package it belongs to, so editing any helper of a stage changes it.
+    """
+    module = sys.modules.get(module_name)
+    source = getattr(module, '__file__', None)
+    if not source:
+        return 'unknown'
+    digest = hashlib.blake2b(digest_size=8)
+    for path in sorted(Path(source).parent.glob('*.py')):
+        digest.update(path.name.encode('utf-8'))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+def create_response_cache(max_entries: int = 1024, ttl: Optional[float] = 3600.0,
+                          max_bytes: Optional[int] = 64 * 1024 * 1024,
+                          path: Optional[Union[str, Path]] = None) -> Optional[CacheStore]:
+    """
+    Build the response cache from deployment settings.
+
+    Args:
+        max_entries: In-memory entry limit; 0 disables caching entirely
+        ttl: Seconds an entry stays valid, or None for no expiry
+        max_bytes: In-memory byte budget (pickled size), or None for no budget
+        path: Optional SQLite file for a persistent tier behind the memory one
+
+    Returns:
+        The cache, or None when disabled
+    """
+    if max_entries <= 0:
+        logger.info("Response cache disabled")
+        return None
+    cache: CacheStore = LRUTTLCache(max_entries=max_entries, ttl=ttl, max_bytes=max_bytes)
+    if path:
+        cache = TieredCache(cache, SQLiteCacheStore(path, ttl=ttl))
+    logger.info(f"Response cache enabled: {max_entries} entries, ttl={ttl}s, persistent tier={path or 'none'}")
+    return cache
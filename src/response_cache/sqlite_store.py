@@ -0,0 +1,128 @@
+"""SQLite-backed cache tier that survives restarts.
+
+Values are pickled into a single WAL-mode table keyed by the cache key, with
+wall-clock expiry so entries written before a restart still age out. The file
+holds pickles, so it must only be writable by the service itself.
+"""
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional, Union
+
+from .cache import CacheStore
+
+logger = logging.getLogger(__name__)
+
+class SQLiteCacheStore(CacheStore):
+    """
+    Persistent tier for TieredCache. Reads never write; once the table grows
+    past ``max_entries`` the oldest writes are trimmed in one batched delete,
+    down to ``trim_ratio`` of the cap so the next trims are many puts away.
+    Expired entries are never returned and age out with the oldest writes.
+    """
+
+    def __init__(self, path: Union[str, Path], ttl: Optional[float] = 86400.0, max_entries: int = 100000,
+                 trim_ratio: float = 0.9):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.trim_to = int(max_entries * trim_ratio)
+        self.hits = 0
+        self.misses = 0
+        self.write_errors = 0
+        self.lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL, expires_at REAL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS response_cache_stored ON response_cache (stored_at)")
+        self.connection.commit()
+        self._count = self.connection.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+        logger.info(f"Response cache tier opened at {self.path} with {self._count} entries")
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value FROM response_cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (str(key), time.time())
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        try:
+            value = pickle.loads(row[0])
+        except Exception as e:
+            logger.warning(f"Discarding unreadable response cache entry: {e}")
+            self.delete(key)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            with self.lock:
+                # Update first, so the running count only grows for new keys and stays exact
+                cursor = self.connection.execute(
+                    "UPDATE response_cache SET value = ?, stored_at = ?, expires_at = ? WHERE key = ?",
+                    (data, now, expires_at, str(key))
+                )
+                if not cursor.rowcount:
+                    self.connection.execute(
+                        "INSERT INTO response_cache (key, value, stored_at, expires_at) VALUES (?, ?, ?, ?)",
+                        (str(key), data, now, expires_at)
+                    )
+                    self._count += 1
+                    self._trim()
+                self.connection.commit()
+        except (sqlite3.Error, pickle.PicklingError) as e:
+            self.write_errors += 1
+            logger.error(f"Could not write response cache entry to {self.path}: {e}")
+
+    def _trim(self):
+        if self._count <= self.max_entries:
+            return
+        # Oldest writes first, through the stored_at index; with one ttl per
+        # store the expired entries are among them
+        cursor = self.connection.execute(
+            "DELETE FROM response_cache WHERE key IN "
+            "(SELECT key FROM response_cache ORDER BY stored_at LIMIT ?)", (self._count - self.trim_to,)
+        )
+        self._count -= cursor.rowcount
+
+    def delete(self, key: Hashable) -> bool:
+        with self.lock:
+            cursor = self.connection.execute("DELETE FROM response_cache WHERE key = ?", (str(key),))
+            self.connection.commit()
+            self._count -= cursor.rowcount
+            return cursor.rowcount > 0
+
+    def clear(self):
+        with self.lock:
+            self.connection.execute("DELETE FROM response_cache")
+            self.connection.commit()
+            self._count = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "entries": self._count,
+            "hits": self.hits,
+            "misses": self.misses,
+            "write_errors": self.write_errors
+        }
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
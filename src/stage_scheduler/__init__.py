@@ -0,0 +1,5 @@
+# src/stage_scheduler/__init__.py
+
+from .scheduler import StageScheduler
+
+__all__ = ["StageScheduler"]
@@ -0,0 +1,102 @@
+"""Stage scheduler for fanning independent cognitive modules out concurrently.
+
+The analyzers behind a chat turn (reasoning, emotion, memory recall, pattern
+detection) do not depend on one another, so they can run side by side and be
+joined before synthesis. End-to-end latency then tracks the slowest stage
+instead of the sum of all of them.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class StageScheduler:
+    """
+    Runs named, independent stages on a shared thread pool and records how long
+    each one took. Regex-heavy analyzers are short, and the Neo4j driver
+    releases the GIL while waiting on the network, so threads give real overlap
+    for the I/O-bound recall stage.
+    """
+
+    def __init__(self, max_workers: int = 16, history_size: int = 100):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cognitive-stage")
+        self.history_size = history_size
+        self.stage_history: Dict[str, deque] = {}
+        self.lock = threading.Lock()
+        logger.info(f"Stage scheduler initialized with {max_workers} workers")
+
+    def run(self, stages: Dict[str, Callable[[], Any]],
+            timeout: Optional[float] = None) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """
+        Run all stages concurrently and join their results.
+
+        Args:
+            stages: Mapping of stage name to a zero-argument callable
+            timeout: Optional seconds to wait for the slowest stage
+
+        Returns:
+            Tuple of (results by stage name, durations in seconds by stage name)
+
+        Raises:
+            concurrent.futures.TimeoutError: if the stages outlive ``timeout``
+            Exception: the first stage failure, once every stage has finished
+        """
+        futures = {name: self.executor.submit(self._timed, fn) for name, fn in stages.items()}
+        _, not_done = wait(futures.values(), timeout=timeout)
+        if not_done:
+            for future in not_done:
+                future.cancel()
+            raise FuturesTimeoutError(f"{len(not_done)} stage(s) still running after {timeout:.3f}s")
+
+        results = {}
+        timings = {}
+        for name, future in futures.items():
+            result, duration = future.result()
+            results[name] = result
+            timings[name] = duration
+
+        self._record(timings)
+        return results, timings
+
+    def timed(self, name: str, fn: Callable[[], Any]) -> Tuple[Any, float]:
+        """Run a single sequential stage inline, recording its duration."""
+        result, duration = self._timed(fn)
+        self._record({name: duration})
+        return result, duration
+
+    def _timed(self, fn: Callable[[], Any]) -> Tuple[Any, float]:
+        start = time.perf_counter()
+        try:
+            result = fn()
+        finally:
+            duration = time.perf_counter() - start
+        return result, duration
+
+    def _record(self, timings: Dict[str, float]):
+        with self.lock:
+            for name, duration in timings.items():
+                history = self.stage_history.get(name)
+                if history is None:
+                    history = self.stage_history[name] = deque(maxlen=self.history_size)
+                history.append(duration)
+
+    def get_stage_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Get rolling per-stage latency metrics in milliseconds."""
+        with self.lock:
+            return {
+                name: {
+                    "last_ms": history[-1] * 1000,
+                    "avg_ms": sum(history) / len(history) * 1000,
+                    "max_ms": max(history) * 1000,
+                    "samples": len(history)
+                }
+                for name, history in self.stage_history.items() if history
+            }
+
+    def shutdown(self, wait: bool = True):
+        self.executor.shutdown(wait=wait)
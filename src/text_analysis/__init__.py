@@ -0,0 +1,5 @@
+# src/text_analysis/__init__.py
+
+from .analyzed_text import AnalyzedText
+
+__all__ = ["AnalyzedText"]
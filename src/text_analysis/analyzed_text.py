@@ -0,0 +1,114 @@
+"""Shared, single-pass text preprocessing for the cognitive modules.
+
+An AnalyzedText is built once per request and handed to every analyzer, so the
+lowercased text, word tokens, sentence split and token frequencies are each
+derived at most once instead of once per module.
+"""
+import re
+from collections import Counter
+from functools import cached_property
+from typing import List, Tuple, Union
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
+SENTENCE_BOUNDARY = re.compile(r'[.!?]+')
+
+# Maps every ASCII character outside \w to a space, so that for ASCII text
+# ``translate(...).split()`` yields exactly the ``\b\w+\b`` tokens
+_ASCII_NON_WORD = str.maketrans({
+    chr(code): ' ' for code in range(128) if not (chr(code).isalnum() or chr(code) == '_')
+})
+# Folds every sentence mark onto '.', so boundary runs can be counted with str methods
+_SENTENCE_MARKS = str.maketrans('!?', '..')
+
+def is_word_char(char: str) -> bool:
+    """Same notion of a word character as the ``\\w`` regex class."""
+    return char.isalnum() or char == '_'
+
+def word_boundary_at(text: str, position: int) -> bool:
+    """True when ``\\b`` would match at ``position`` in ``text``."""
+    before = position > 0 and is_word_char(text[position - 1])
+    after = position < len(text) and is_word_char(text[position])
+    return before != after
+
+class AnalyzedText:
+    """
+    Lazily derived views of one input text. Each view is computed on first
+    access and cached, so analyzers only pay for what some module actually
+    reads.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+
+    @classmethod
+    def of(cls, value: Union[str, 'AnalyzedText']) -> 'AnalyzedText':
+        """Return ``value`` unchanged if already analyzed, otherwise wrap it."""
+        if isinstance(value, cls):
+            return value
+        return cls(value)
+
+    @cached_property
+    def lower(self) -> str:
+        """The lowercased text."""
+        return self.text.lower()
+
+    @cached_property
+    def words(self) -> List[str]:
+        """Whitespace-delimited words in original case (``text.split()``)."""
+        return self.text.split()
+
+    @cached_property
+    def lower_words(self) -> List[str]:
+        """Whitespace-delimited words of the lowercased text."""
+        return self.lower.split()
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        """Lowercased ``\\b\\w+\\b`` word tokens."""
+        if self.text.isascii():
+            return self.lower.translate(_ASCII_NON_WORD).split()
+        return WORD_PATTERN.findall(self.lower)
+
+    @cached_property
+    def token_offsets(self) -> List[Tuple[int, int]]:
+        """(start, end) offsets of each token within ``lower``."""
+        return [match.span() for match in WORD_PATTERN.finditer(self.lower)]
+
+    @cached_property
+    def token_counts(self) -> Counter:
+        """Frequency table of ``tokens``."""
+        return Counter(self.tokens)
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        """Raw sentence segments split on ``[.!?]+`` (may include empty edges)."""
+        return SENTENCE_BOUNDARY.split(self.text)
+
+    @cached_property
+    def sentence_count(self) -> int:
+        """``len(sentences)``, counted without materializing the split."""
+        if 'sentences' in self.__dict__ or not self.text.isascii():
+            return len(self.sentences)
+        marks = self.text.translate(_SENTENCE_MARKS)
+        while '..' in marks:
+            marks = marks.replace('..', '.')
+        return marks.count('.') + 1
+
+    @cached_property
+    def lower_sentences(self) -> List[str]:
+        """Sentence segments of ``lower``, aligned one-to-one with ``sentences``."""
+        return SENTENCE_BOUNDARY.split(self.lower)
+
+    @cached_property
+    def sentence_starts(self) -> List[int]:
+        """Start offset of each ``lower_sentences`` segment within ``lower``."""
+        starts = [0]
+        starts.extend(match.end() for match in SENTENCE_BOUNDARY.finditer(self.lower))
+        return starts
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __repr__(self) -> str:
+        preview = self.text if len(self.text) <= 40 else self.text[:40] + '...'
+        return f"AnalyzedText({preview!r})"
@@ -0,0 +1,56 @@
+"""Chunked, bounded fan-out of bulk text analysis to a process pool.
+
+Shared by the analyzers' corpus entry points (ReasoningBody.analyze_many,
+AbstractPatternDetector.analyze_patterns): input is consumed lazily in
+chunks, at most ``max_pending`` chunks are in flight, and results come back
+in input order, so memory stays bounded however long the input is.
+"""
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Sequence, TypeVar
+
+T = TypeVar('T')
+
+def chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split an iterable into lists of at most ``size`` items without materializing it."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _init_worker(quiet_loggers: Sequence[str], initializer: Callable[..., None], initargs: tuple):
+    # Per-item INFO lines from every worker would swamp bulk runs
+    for name in quiet_loggers:
+        logging.getLogger(name).setLevel(logging.WARNING)
+    initializer(*initargs)
+
+def map_chunks(function: Callable[[List[Any]], T], chunks: Iterable[List[Any]], workers: int, max_pending: int,
+               initializer: Callable[..., None], initargs: tuple = (),
+               quiet_loggers: Sequence[str] = ()) -> Iterator[T]:
+    """
+    Apply ``function`` to every chunk in a process pool, yielding results in chunk order.
+
+    Args:
+        function: Module-level function run in a worker on one chunk
+        chunks: Lazily produced chunks, e.g. from chunked()
+        workers: Worker processes
+        max_pending: Chunks submitted ahead of the one being yielded
+        initializer: Module-level function building a worker's per-process state, called with ``initargs``
+        quiet_loggers: Logger names lowered to WARNING in the workers
+    """
+    pending = deque()
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(tuple(quiet_loggers), initializer, initargs))
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(function, chunk))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
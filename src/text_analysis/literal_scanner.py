@@ -0,0 +1,76 @@
+"""Single-pass scanning for many literal strings at once.
+
+The literals are compiled into one trie-shaped regex alternation behind a
+lookahead, so the regex engine reports the longest literal starting at every
+offset in one linear pass over the text. Shorter literals starting at the same
+offset are prefixes of the longest one and are recovered from a precomputed
+prefix table. Together this yields every (possibly overlapping) occurrence,
+like an Aho-Corasick automaton, without a per-character Python loop.
+"""
+import re
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# Characters for which re.IGNORECASE and str.lower() disagree about ASCII
+# letters, or which change length when lowercased. Offsets found in the
+# lowercased text only line up with the original, and case-insensitive regex
+# semantics with plain substring tests, when none are present.
+CASE_UNSAFE = re.compile('[\u0130\u0131\u017f]')
+
+
+def literal_trie(literals: Iterable[str]) -> str:
+    """Build a regex alternation shaped as a trie, preferring the longest literal."""
+    trie: Dict[str, dict] = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 and not terminal else '(?:' + '|'.join(branches) + ')'
+        return body + ('?' if terminal else '')
+
+    return build(trie)
+
+
+class LiteralScanner:
+    """Finds every occurrence of a fixed set of literals in one pass per text."""
+
+    def __init__(self, literals: Iterable[str]):
+        self.literals = sorted(set(literal for literal in literals if literal))
+        self.max_length = max((len(literal) for literal in self.literals), default=0)
+        self._pattern = re.compile('(?=(%s))' % literal_trie(self.literals)) if self.literals else None
+        # Each literal's own prefixes within the set, shortest first
+        self._prefixes = {
+            literal: tuple(sorted((other for other in self.literals if literal.startswith(other)), key=len))
+            for literal in self.literals
+        }
+
+    def finditer(self, text: str, pos: int = 0) -> Iterator[Tuple[int, str]]:
+        """
+        Yield ``(start, literal)`` for every occurrence at or after ``pos``,
+        ordered by start offset and then by length.
+        """
+        if self._pattern is None:
+            return
+        prefixes = self._prefixes
+        for match in self._pattern.finditer(text, pos):
+            start = match.start()
+            for literal in prefixes[match.group(1)]:
+                yield start, literal
+
+    def positions(self, text: str) -> Dict[str, List[int]]:
+        """Start offsets of every occurrence, per literal (empty lists included)."""
+        positions: Dict[str, List[int]] = {literal: [] for literal in self.literals}
+        if self._pattern is None:
+            return positions
+        prefixes = self._prefixes
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            for literal in prefixes[match.group(1)]:
+                positions[literal].append(start)
+        return positions
@@ -1,28 +1,51 @@
 """Lightweight neo4j shim for offline testing.
 
-Provides GraphDatabase.driver(...).session() context manager with a run() method
-that simply records queries in-memory. No networking.
+Provides GraphDatabase.driver(...).session() context manager with run() and
+execute_read/execute_write transaction functions that simply return empty
+results. Driver and session configuration (pool size, access mode, ...) is
+accepted and ignored. No networking.
 """
+READ_ACCESS = "READ"
+WRITE_ACCESS = "WRITE"
+
+class Result(list):
+    def consume(self):
+        return None
+
+    def single(self):
+        return self[0] if self else None
+
+class Transaction:
+    def run(self, query, parameters=None, **kwargs):
+        # Return an iterable of dict-like records; keep simple and empty
+        return Result()
+
 class Session:
     def __enter__(self):
         return self
     def __exit__(self, exc_type, exc, tb):
         return False
-    def run(self, query, **kwargs):
-        # Return an iterable of dict-like records; keep simple and empty
-        return []
+    def run(self, query, parameters=None, **kwargs):
+        return Result()
+    def execute_read(self, transaction_function, *args, **kwargs):
+        return transaction_function(Transaction(), *args, **kwargs)
+    def execute_write(self, transaction_function, *args, **kwargs):
+        return transaction_function(Transaction(), *args, **kwargs)
+    def close(self):
+        return None
 
 class Driver:
-    def __init__(self, uri, auth=None):
+    def __init__(self, uri, auth=None, **config):
         self.uri = uri
+        self.config = config
     def verify_connectivity(self):
         return True
-    def session(self):
+    def session(self, **config):
         return Session()
     def close(self):
         return None
 
 class GraphDatabase:
     @staticmethod
-    def driver(uri, auth=None):
-        return Driver(uri, auth=auth)
+    def driver(uri, auth=None, **config):
+        return Driver(uri, auth=auth, **config)
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from src.memory_trace_manager import ConceptExtractor, MemoryTraceManager, SQLiteGraphBackend
+
+
+def legacy_extract(text):
+    concepts = []
+    for word in text.lower().split():
+        word = word.strip('.,!?;:')
+        if len(word) > 3 and word not in ['that', 'this', 'with', 'from', 'they', 'have', 'been', 'were',
+                                           'what', 'when', 'where', 'how', 'why', 'who']:
+            concepts.append(word)
+    return list(set(concepts))
+
+
+def test_default_extractor_matches_legacy_extraction():
+    rng = random.Random(4)
+    vocab = ["Graph", "graph.", "DATABASES,", "with", "This", "...", "a", "why?", ";store;", "relationships!",
+             "naïve", "ünïcode:", "x" * 12, " ", "tab\there", "new\nline", "When", "données"]
+    extractor = ConceptExtractor()
+    for _ in range(500):
+        text = ' '.join(rng.choices(vocab, k=rng.randint(0, 30)))
+        assert sorted(extractor.extract(text)) == sorted(legacy_extract(text))
+
+
+def test_phrases_stay_inside_clauses_and_are_weighted():
+    extractor = ConceptExtractor(max_ngram=3)
+    weighted = dict(extractor.extract_weighted("Graph databases store data. Graph databases, indexes"))
+    assert weighted["graph databases"] == 4 and weighted["graph databases store"] == 3
+    assert weighted["graph"] == 2 and weighted["store data"] == 2
+    assert "data graph" not in weighted and "databases indexes" not in weighted
+    assert "store data graph" not in weighted
+
+    top = ConceptExtractor(max_ngram=2, max_concepts=2).extract("neural networks learn; neural networks win")
+    assert top == ["neural networks", "neural"]
+    with pytest.raises(ValueError):
+        ConceptExtractor(max_ngram=4)
+
+
+def test_stopwords_from_file_and_batch_mode(tmp_path):
+    path = tmp_path / "stopwords.txt"
+    path.write_text("# common words\nExplain\n\nplease  # politeness\n", encoding='utf-8')
+    extractor = ConceptExtractor.from_file(path)
+    assert extractor.stopwords == frozenset({"explain", "please"})
+    texts = ["Please explain graphs", "graphs again", "Please explain graphs"]
+    assert [sorted(c) for c in extractor.extract_batch(texts)] == [["graphs"], ["again", "graphs"], ["graphs"]]
+
+
+def test_backfill_rewrites_stored_mentions(tmp_path):
+    manager = MemoryTraceManager(backend=SQLiteGraphBackend(tmp_path / "memory.sqlite3"))
+    manager.store_interaction("u1", "Explain graph databases", "Graph databases store relationships")
+    manager.store_interaction("u1", "Tune the cache", "Measure cache latency")
+    manager.concept_extractor = ConceptExtractor(stopwords={"explain"}, max_ngram=2)
+
+    assert manager.backfill_concepts(batch_size=1) == 2
+    concepts = {c['name']: c['frequency'] for c in manager.get_user_context("u1")['concepts']}
+    assert concepts["graph databases"] == 2 and "explain" not in concepts
+    manager.memory_cache.clear()
+    assert manager.recall_relevant("u1", "graph databases?")['response'] == "Graph databases store relationships"
+    manager.close()
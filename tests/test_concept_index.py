@@ -0,0 +1,101 @@
+import random
+from unittest.mock import MagicMock
+
+from src.memory_trace_manager import ConceptIndex, MemoryTraceManager, SQLiteGraphBackend
+
+WORDS = "graph index memory recall cache latency pattern emotion ethics context vector query".split()
+
+
+def _rows(count, users=3, seed=5):
+    rng = random.Random(seed)
+    rows = []
+    for index in range(count):
+        user_id = f"u{rng.randrange(users)}"
+        rows.append({
+            'user_id': user_id,
+            'interaction_id': f"{user_id}_{index}",
+            'user_message': f"message {index}",
+            'assistant_response': f"response {index}",
+            'timestamp': f"2024-01-01T00:{index // 60:02d}:{index % 60:02d}",
+            'mentions': [{'concept': word, 'source': 'user'} for word in set(rng.choices(WORDS, k=3))] +
+                        [{'concept': word, 'source': 'assistant'} for word in set(rng.choices(WORDS, k=4))]
+        })
+    return rows
+
+
+def test_index_recall_matches_store():
+    rows = _rows(400)
+    store = SQLiteGraphBackend(':memory:')
+    store.write_interactions(rows)
+    index = ConceptIndex(window=1000)
+    for user_id in ("u0", "u1", "u2"):
+        index.load(user_id, store.load_interactions(user_id, 1000))
+
+    rng = random.Random(9)
+    for _ in range(200):
+        user_id, concepts, limit = f"u{rng.randrange(3)}", rng.sample(WORDS, rng.randint(1, 4)), rng.randint(1, 8)
+        expected = store.recall_by_concepts(user_id, concepts, limit)
+        found = index.recall_by_concepts(user_id, concepts, limit)
+        assert [(r['timestamp'], r['relevance_score']) for r in found] == \
+            [(r['timestamp'], r['relevance_score']) for r in expected]
+        assert found[0] == expected[0]
+    assert index.recent_interactions("u1", 5) == store.recent_interactions("u1", 5)
+
+
+def test_window_evicts_oldest_and_falls_back_when_history_is_truncated():
+    index = ConceptIndex(window=4)
+    index.load("u0", [])
+    rows = [dict(row, user_id="u0") for row in _rows(12, users=1)]
+    for row in rows:
+        assert index.add(row)
+    stats = index.get_stats()
+    assert stats['interactions'] == 4 and stats['posting_bytes'] <= (4 + 4 // 2) * 7 * 4
+    assert [r['message'] for r in index.recent_interactions("u0", 10)] == \
+        [row['user_message'] for row in reversed(rows[-4:])]
+    assert index.recall_by_concepts("u0", ["no-such-concept"], 5) is None
+    assert index.recall_by_concepts("nobody", ["graph"], 5) is None
+    assert not index.add(dict(rows[0], user_id="nobody"))
+
+
+def test_long_texts_are_ranked_but_not_held():
+    index = ConceptIndex(max_text_chars=20)
+    index.load("u0", [])
+    index.add({'user_id': "u0", 'interaction_id': "a", 'user_message': "x" * 50, 'assistant_response': "",
+               'timestamp': "2024-01-01T00:00:01", 'mentions': [{'concept': "graph", 'source': 'user'}]})
+    assert index.recall_by_concepts("u0", ["graph"], 5) is None
+    assert index.get_stats()['text_bytes'] == 0
+
+
+def test_stale_load_keeps_rows_added_since_the_first_load():
+    rows = [dict(row, user_id="u0") for row in _rows(3, users=1)]
+    index = ConceptIndex()
+    snapshot = rows[:2]
+    assert index.load("u0", snapshot)
+    assert index.add(rows[2])
+    # A second request that missed the first load arrives with the same, now older, snapshot
+    assert not index.load("u0", snapshot)
+    assert [r['message'] for r in index.recent_interactions("u0", 5)] == \
+        [row['user_message'] for row in reversed(rows)]
+    index.discard(["u0"])
+    assert index.load("u0", snapshot)
+    assert index.get_stats()['interactions'] == 2
+
+
+def test_manager_recalls_from_index_without_querying_the_store(tmp_path):
+    path = tmp_path / "memory.sqlite3"
+    manager = MemoryTraceManager(backend=SQLiteGraphBackend(path))
+    manager.store_interaction("u1", "Explain graph databases", "Graph databases store relationships")
+    manager.store_interaction("u1", "Tune cache latency", "Measure the cache hit rate")
+    manager.backend = MagicMock(wraps=manager.backend)
+    manager.memory_cache.clear()
+
+    context = manager.recall_relevant("u1", "graph relationships please")
+    assert context['response'] == "Graph databases store relationships" and context['relevance_score'] == 3
+    manager.backend.recall_by_concepts.assert_not_called()
+    assert manager.get_index_stats()['hits'] == 1
+    manager.close()
+
+    restarted = MemoryTraceManager(backend=SQLiteGraphBackend(path))
+    assert restarted.recall_relevant("u1", "cache latency")['response'] == "Measure the cache hit rate"
+    assert restarted.get_index_stats()['loads'] == 1
+    restarted.close()
@@ -0,0 +1,24 @@
+from src.emotional_analyzer.emotion_processor import EmotionalAnalyzer
+from src.text_analysis import AnalyzedText
+
+MESSAGES = [
+    "I am so happy today!",
+    "not really sad, never angry...",
+    "THIS IS TERRIBLE AND BAD",
+    "happy happy joy? great",
+    "neither good nor bad",
+    "the deploy finished",
+    "",
+    "   ",
+]
+
+
+def test_analyze_batch_matches_scalar_analyze():
+    analyzer = EmotionalAnalyzer()
+    batch = analyzer.analyze_batch(MESSAGES + [AnalyzedText("very very afraid")])
+    expected = [analyzer.analyze(message) for message in MESSAGES + ["very very afraid"]]
+    assert batch == expected
+
+
+def test_analyze_batch_empty():
+    assert EmotionalAnalyzer().analyze_batch([]) == []
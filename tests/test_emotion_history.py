@@ -0,0 +1,14 @@
+from src.emotional_analyzer.emotion_processor import EmotionalAnalyzer
+
+def test_history_context_is_scored_once_per_message():
+    analyzer = EmotionalAnalyzer(history_cache_size=8)
+    uncached = EmotionalAnalyzer(history_cache_size=0)
+    session = ["I am sad", "still sad and down", "so angry now", "furious!", "feeling good", "great day"]
+    for turn, message in enumerate(session):
+        history = session[:turn]
+        assert analyzer.analyze(message, context=history) == uncached.analyze(message, context=history)
+    stats = analyzer.get_history_cache_stats()
+    # Each message was cached when it was first analyzed, so history never re-scores it
+    assert stats["misses"] == 0
+    assert stats["hits"] == sum(min(turn, 3) for turn in range(len(session)))
+    assert stats["size"] <= 8
@@ -0,0 +1,25 @@
+import json
+
+from src.emotional_analyzer.emotion_processor import EmotionLexicon
+
+
+def test_negation_window_and_intensifier():
+    lexicon = EmotionLexicon()
+    assert lexicon.detect_emotions("I am not at all happy")["JOY"] < 0
+    assert lexicon.detect_emotions("not one two three happy")["JOY"] > 0
+    scores = lexicon.detect_emotions("very happy and sad")
+    assert scores["JOY"] == 1.5 / 2.5
+    assert scores["SADNESS"] == 1.0 / 2.5
+
+
+def test_from_file_supports_weights_and_lists(tmp_path):
+    path = tmp_path / "lexicon.json"
+    path.write_text(json.dumps({
+        "emotions": {"JOY": {"stoked": 2.0}, "ANGER": ["livid"]},
+        "negators": ["hardly"]
+    }), encoding="utf-8")
+    lexicon = EmotionLexicon.from_file(path)
+    assert set(lexicon.word_index) == {"stoked", "livid"}
+    assert "very" in lexicon.intensifier_set
+    scores = lexicon.detect_emotions("stoked but hardly livid")
+    assert scores == {"JOY": 2.0 / 2.5, "ANGER": -0.5 / 2.5}
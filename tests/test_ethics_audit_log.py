@@ -0,0 +1,59 @@
+import json
+import time
+from unittest.mock import patch
+
+from src.ethics_sentinel.audit_log import AuditLogWriter
+from src.ethics_sentinel.ethical_guard import EthicsSentinel
+
+
+def test_violations_are_bounded_in_memory_and_written_to_disk(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    sentinel = EthicsSentinel(audit_log_path=path, recent_size=5)
+    for i in range(12):
+        sentinel.validate_request(f"message {i} about fraud")
+    summary = sentinel.get_violation_summary()
+    sentinel.close()
+
+    assert summary["total_violations"] == 12
+    assert summary["by_category"] == {"sensitive_topics": 12}
+    assert len(sentinel.violation_log) == 5
+    assert summary["recent_violations"][-1]["content_preview"] == "message 11 about fraud"
+    entries = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [entry["content_preview"] for entry in entries] == [f"message {i} about fraud" for i in range(12)]
+    assert entries[0]["timestamp"] != "current_time"
+
+
+def test_audit_log_rotates_by_size(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    writer = AuditLogWriter(path, max_bytes=200, backup_count=2, batch_size=1)
+    for i in range(20):
+        writer.write({"n": i, "padding": "x" * 40})
+    writer.close()
+
+    stats = writer.get_stats()
+    assert stats["written"] == 20 and stats["dropped"] == 0 and stats["rotations"] > 0
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["audit.jsonl", "audit.jsonl.1", "audit.jsonl.2"]
+    assert all(p.stat().st_size <= 200 for p in tmp_path.iterdir())
+    last = [json.loads(line)["n"] for line in path.read_text(encoding="utf-8").splitlines()]
+    assert last[-1] == 19
+
+
+def test_failed_rotation_keeps_the_writer_alive(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    writer = AuditLogWriter(path, max_bytes=100, backup_count=1, batch_size=1)
+    with patch('src.ethics_sentinel.audit_log.os.replace', side_effect=PermissionError("locked")):
+        for i in range(5):
+            writer.write({"n": i, "padding": "x" * 40})
+        deadline = time.monotonic() + 5
+        while writer.get_stats()["written"] < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    writer.write({"n": 5})
+    writer.close(timeout=5)
+
+    stats = writer.get_stats()
+    assert not writer._thread.is_alive()
+    # Entries written while rotation failed stayed in the current file, which rotated once it could
+    assert stats["written"] == 6 and stats["write_errors"] >= 1 and stats["rotations"] == 1
+    backup = path.with_name("audit.jsonl.1")
+    assert [json.loads(line)["n"] for line in backup.read_text(encoding="utf-8").splitlines()] == [0, 1, 2, 3, 4]
+    assert [json.loads(line)["n"] for line in path.read_text(encoding="utf-8").splitlines()] == [5]
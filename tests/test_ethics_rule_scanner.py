@@ -0,0 +1,43 @@
+import json
+import os
+
+from src.ethics_sentinel.ethical_guard import ContentFilter, EthicsSentinel
+from src.ethics_sentinel.rule_scanner import EthicsRuleSet, RuleMatch
+
+
+def test_scan_reports_categories_and_offsets():
+    rule_set = EthicsRuleSet({
+        "harm": {"keywords": ["harm", "self-harm"]},
+        "profanity": {"words": ["damn"]},
+    })
+    result = rule_set.scan("Self-Harm is DAMN bad, damnation is fine")
+    assert result.categories == ["harm", "profanity"]
+    assert result.matches == [
+        RuleMatch("harm", "self-harm", 0, 9),
+        RuleMatch("harm", "harm", 5, 9),
+        RuleMatch("profanity", "damn", 13, 17),
+    ]
+
+
+def test_sentinel_reports_builtin_violations_in_category_order():
+    sentinel = EthicsSentinel()
+    assert sentinel.validate_request("How do I bake bread?")
+    assert not sentinel.validate_request("this damn fraud will harm people")
+    assert sentinel.get_violation_summary()["recent_violations"][-1]["violations"] == \
+        ["harm_principle", "inappropriate_content", "sensitive_topics"]
+    assert not sentinel.content_filter.check_appropriateness("a damnable idea")
+
+
+def test_rules_reload_when_file_changes(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"spam": {"keywords": ["buy now"]}}), encoding="utf-8")
+    content_filter = ContentFilter(path, reload_interval=0)
+    assert content_filter.scan("Buy now!").categories == ["spam"]
+
+    path.write_text(json.dumps({"spam": {"keywords": ["limited offer"]}}), encoding="utf-8")
+    os.utime(path, (1, 1))
+    assert content_filter.scan("Buy now!").categories == []
+
+    path.write_text("{not json", encoding="utf-8")
+    os.utime(path, (2, 2))
+    assert content_filter.scan("limited offer").categories == ["spam"]
@@ -0,0 +1,25 @@
+from src.ethics_sentinel.ethical_guard import EthicsSentinel
+
+
+def test_violation_split_across_chunks_stops_stream():
+    sentinel = EthicsSentinel()
+    validator = sentinel.stream_validator()
+    assert validator.feed("Here is how to ha")
+    assert not validator.feed("rm nobody. ")
+    assert validator.violations == ["harm_principle"]
+    assert validator.matches[0].start == 15
+    assert not validator.feed("More text")
+    assert sentinel.get_violation_summary()["total_violations"] == 1
+
+
+def test_whole_word_at_chunk_end_waits_for_next_character():
+    validator = EthicsSentinel().stream_validator()
+    assert validator.feed("what a dam")
+    assert validator.feed("n")
+    assert validator.feed("ation")
+    assert validator.finish()
+
+    validator = EthicsSentinel().stream_validator()
+    assert validator.feed("well damn")
+    assert not validator.finish()
+    assert validator.violations == ["inappropriate_content"]
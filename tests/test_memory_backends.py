@@ -0,0 +1,165 @@
+"""The same memory scenarios against every storage backend.
+
+The embedded SQLite backend always runs; Neo4j joins when NEO4J_URI is set.
+Names carry a per-run tag so a shared Neo4j database is left as it was found.
+"""
+import os
+import threading
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from src.memory_trace_manager import MemoryTraceManager, Neo4jBackend, SQLiteGraphBackend
+
+TAG = uuid.uuid4().hex[:8]
+
+
+def _name(name):
+    return f"{name}-{TAG}"
+
+
+def _row(user, index, message, response, user_concepts, response_concepts=()):
+    return {
+        'user_id': _name(user),
+        'interaction_id': f"{_name(user)}_{index}",
+        'user_message': message,
+        'assistant_response': response,
+        'timestamp': f"2024-01-01T00:00:{index:02d}",
+        'mentions': [{'concept': _name(c), 'source': 'user'} for c in user_concepts] +
+                    [{'concept': _name(c), 'source': 'assistant'} for c in response_concepts]
+    }
+
+
+@pytest.fixture(params=['sqlite', 'neo4j'])
+def backend(request, tmp_path):
+    if request.param == 'sqlite':
+        backend = SQLiteGraphBackend(tmp_path / "memory.sqlite3")
+        yield backend
+        backend.close()
+        return
+    if not os.environ.get("NEO4J_URI"):
+        pytest.skip("NEO4J_URI not set")
+    import neo4j
+    driver = neo4j.GraphDatabase.driver(os.environ["NEO4J_URI"], auth=(
+        os.environ.get("NEO4J_USER", "neo4j"), os.environ.get("NEO4J_PASSWORD", "password")))
+    backend = Neo4jBackend(driver)
+    backend.ensure_schema()
+    yield backend
+    with driver.session() as session:
+        session.run("MATCH (n) WHERE n.id ENDS WITH $tag OR n.name ENDS WITH $tag "
+                    "OR n.user_id ENDS WITH $tag DETACH DELETE n", tag=TAG).consume()
+    backend.close()
+
+
+@pytest.fixture
+def history(backend):
+    backend.write_interactions([
+        _row('alice', 1, "graphs?", "graphs store edges", ['graph'], ['graph', 'edge']),
+        _row('alice', 2, "indexes?", "indexes speed lookups", ['index'], ['lookup']),
+        _row('alice', 3, "graph indexes?", "both", ['graph', 'index']),
+        _row('bob', 4, "graphs for bob", "sure", ['graph']),
+    ])
+    return backend
+
+
+def test_recall_ranks_by_mentions_then_recency(history):
+    records = history.recall_by_concepts(_name('alice'), [_name('graph'), _name('index')], 5)
+    assert [(r['message'], r['relevance_score']) for r in records] == [
+        ("graph indexes?", 2), ("graphs?", 2), ("indexes?", 1)]
+    assert records[0]['response'] == "both" and records[0]['timestamp'] == "2024-01-01T00:00:03"
+    assert [r['message'] for r in history.recall_by_concepts(_name('alice'), [_name('edge')], 1)] == ["graphs?"]
+    assert history.recall_by_concepts(_name('alice'), [_name('missing')], 5) == []
+
+
+def test_recent_interactions_are_scoped_to_the_user(history):
+    assert [(r['message'], r['relevance_score']) for r in history.recent_interactions(_name('alice'), 2)] == [
+        ("graph indexes?", 1), ("indexes?", 1)]
+    assert [r['message'] for r in history.recent_interactions(_name('bob'), 5)] == ["graphs for bob"]
+
+
+def test_user_stats_and_concepts(history):
+    assert history.user_stats(_name('alice')) == {
+        'last_interaction': "2024-01-01T00:00:03", 'interaction_count': 3}
+    assert history.user_stats(_name('nobody')) is None
+    concepts = history.user_concepts(_name('alice'))
+    assert concepts[0] == {'name': _name('graph'), 'frequency': 3}
+    assert sorted((c['name'], c['frequency']) for c in concepts[1:]) == [
+        (_name('edge'), 1), (_name('index'), 2), (_name('lookup'), 1)]
+
+
+def test_legacy_concept_relationships(backend):
+    backend.add_concept(_name('graph'), {'kind': 'structure'})
+    backend.add_concept(_name('edge'), {})
+    backend.create_relationship(_name('graph'), 'has', _name('edge'))
+    backend.create_relationship(_name('graph'), 'has', _name('missing'))
+    backend.write_interactions([_row('carol', 5, "graph", "ok", ['graph'])])
+
+    related = sorted(backend.related(_name('graph')), key=lambda r: (r['relationship'], r['concept'] or ''))
+    assert related == [{'relationship': 'HAS', 'concept': _name('edge')},
+                       {'relationship': 'MENTIONS', 'concept': None}]
+    assert backend.related(_name('edge')) == [{'relationship': 'HAS', 'concept': _name('graph')}]
+
+
+def test_manager_falls_back_to_embedded_graph(tmp_path):
+    path = tmp_path / "fallback.sqlite3"
+    with patch('src.memory_trace_manager.memory_graph.neo4j') as mock_neo4j:
+        mock_neo4j.GraphDatabase.driver.side_effect = ConnectionError("unreachable")
+        manager = MemoryTraceManager(fallback_path=str(path), reconnect=False)
+    assert manager.driver is None and isinstance(manager.backend, SQLiteGraphBackend)
+
+    manager.store_interaction("u1", "Explain graph databases", "Graph databases store relationships")
+    manager.memory_cache.clear()
+    assert manager.recall_relevant("u1", "which graph databases")['response'] == \
+        "Graph databases store relationships"
+    assert manager.get_user_context("u1")['interactions'] == 1
+    assert manager.get_persistence_stats() == {"mode": "synchronous", "backend": "sqlite"}
+    manager.close()
+
+    reopened = MemoryTraceManager(backend=SQLiteGraphBackend(path))
+    assert reopened.get_user_context("u1")['interactions'] == 1
+    reopened.close()
+
+
+def test_compaction_folds_old_interactions_into_summaries(history):
+    alice = _name('alice')
+    stats, concepts = history.user_stats(alice), sorted(
+        (c['name'], c['frequency']) for c in history.user_concepts(alice))
+
+    cutoff = "2024-01-01T00:00:03"
+    assert history.compact_interactions(cutoff, 'month', batch_size=1) == {
+        'interactions': 1, 'mentions': 3, 'summaries': 1, 'text_chars': len("graphs?graphs store edges"),
+        'users': [alice]}
+    assert history.compact_interactions(cutoff, 'month', batch_size=10)['interactions'] == 1
+    assert history.compact_interactions(cutoff, 'month', batch_size=10)['interactions'] == 0
+
+    assert history.user_stats(alice) == stats
+    assert sorted((c['name'], c['frequency']) for c in history.user_concepts(alice)) == concepts
+    assert [r['message'] for r in history.recent_interactions(alice, 5)] == ["graph indexes?"]
+    assert [r['message'] for r in history.recall_by_concepts(alice, [_name('lookup'), _name('graph')], 5)] == \
+        ["graph indexes?"]
+    assert [r['message'] for r in history.recent_interactions(_name('bob'), 5)] == ["graphs for bob"]
+
+
+def test_rewriting_a_batch_is_idempotent(history):
+    history.write_interactions([_row('alice', 1, "graphs?", "graphs store edges", ['graph'], ['graph', 'edge'])])
+    alice = _name('alice')
+    assert history.user_stats(alice)['interaction_count'] == 3
+    assert history.user_concepts(alice)[0] == {'name': _name('graph'), 'frequency': 3}
+
+
+def test_sqlite_reads_proceed_during_a_write(tmp_path):
+    backend = SQLiteGraphBackend(tmp_path / "memory.sqlite3")
+    backend.write_interactions([_row('alice', 1, "graphs?", "graphs store edges", ['graph'])])
+    found = []
+    with backend.lock, backend.connection:
+        # An open write transaction on the shared write connection
+        backend.connection.execute("UPDATE users SET last_interaction = 'pending'")
+        reader = threading.Thread(
+            target=lambda: found.extend(backend.recall_by_concepts(_name('alice'), [_name('graph')], 5)))
+        reader.start()
+        reader.join(5)
+        assert not reader.is_alive()
+    assert [r['message'] for r in found] == ["graphs?"]
+    assert backend.user_stats(_name('alice'))['last_interaction'] == 'pending'
+    backend.close()
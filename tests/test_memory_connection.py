@@ -0,0 +1,129 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.memory_trace_manager import MemoryTraceManager, SessionPool
+from src.memory_trace_manager.pool import PoolExhausted
+
+
+def test_pool_reuses_sessions_and_reports_waits():
+    driver = MagicMock()
+    pool = SessionPool(driver, max_size=1, acquire_timeout=0.05, default_access_mode="READ")
+    for _ in range(3):
+        with pool.session() as session:
+            session.run("RETURN 1")
+    driver.session.assert_called_once_with(default_access_mode="READ")
+
+    with pool.session():
+        with pytest.raises(PoolExhausted):
+            with pool.session():
+                pass
+    with pytest.raises(ValueError):
+        with pool.session():
+            raise ValueError("query failed")
+    stats = pool.get_stats()
+    assert stats['acquisitions'] == 5 and stats['timeouts'] == 1
+    assert stats['sessions_discarded'] == 1 and stats['idle'] == 0 and stats['in_use'] == 0
+    assert stats['peak_in_use'] == 1 and stats['max_wait_ms'] >= 0.0
+
+
+def test_pool_bounds_concurrent_sessions():
+    pool = SessionPool(MagicMock(), max_size=2)
+    release = threading.Event()
+
+    def hold():
+        with pool.session():
+            release.wait(1.0)
+
+    threads = [threading.Thread(target=hold) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    assert pool.get_stats()['in_use'] == 2
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert pool.get_stats()['peak_in_use'] == 2
+
+
+def test_reconnects_and_hands_over_the_embedded_graph(tmp_path):
+    mock_driver = MagicMock()
+    mock_tx = MagicMock()
+    mock_driver.session.return_value.__enter__.return_value.execute_write.side_effect = \
+        lambda fn, *args, **kwargs: fn(mock_tx, *args, **kwargs)
+
+    neo4j_up = threading.Event()
+
+    def connect(*args, **kwargs):
+        if not neo4j_up.is_set():
+            raise ConnectionError("down")
+        return mock_driver
+
+    with patch('src.memory_trace_manager.memory_graph.neo4j') as mock_neo4j:
+        mock_neo4j.GraphDatabase.driver.side_effect = connect
+        manager = MemoryTraceManager(fallback_path=str(tmp_path / "fallback.sqlite3"), reconnect_initial=0.01)
+        manager.store_interaction("u1", "Explain graph databases", "Graph databases store relationships")
+        assert manager.get_connection_stats()['backend'] == 'sqlite'
+        neo4j_up.set()
+
+        deadline = time.monotonic() + 5
+        while manager.reconnected_at is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    stats = manager.get_connection_stats()
+    assert stats['neo4j_connected'] and stats['reconnect_attempts'] >= 1 and stats['read_pool']['max_size'] == 50
+    assert manager.driver is mock_driver
+    row, = mock_tx.run.call_args.kwargs['interactions']
+    assert row['user_id'] == "u1" and {m['concept'] for m in row['mentions']} >= {"graph", "databases"}
+    manager.close()
+
+
+def test_failed_handover_keeps_the_embedded_graph_live_and_retries(tmp_path):
+    mock_driver = MagicMock()
+    mock_tx = MagicMock()
+    writes_fail = threading.Event()
+    writes_fail.set()
+    failed_writes = []
+
+    def execute_write(fn, *args, **kwargs):
+        if writes_fail.is_set():
+            failed_writes.append(fn)
+            raise ConnectionError("write timed out")
+        return fn(mock_tx, *args, **kwargs)
+
+    mock_driver.session.return_value.__enter__.return_value.execute_write.side_effect = execute_write
+    neo4j_up = threading.Event()
+
+    def connect(*args, **kwargs):
+        if not neo4j_up.is_set():
+            raise ConnectionError("down")
+        return mock_driver
+
+    with patch('src.memory_trace_manager.memory_graph.neo4j') as mock_neo4j:
+        mock_neo4j.GraphDatabase.driver.side_effect = connect
+        manager = MemoryTraceManager(fallback_path=str(tmp_path / "fallback.sqlite3"),
+                                     reconnect_initial=0.01, reconnect_max=0.05)
+        manager.store_interaction("u1", "Explain graph databases", "Graph databases store relationships")
+        neo4j_up.set()
+        deadline = time.monotonic() + 5
+        while len(failed_writes) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        stats = manager.get_connection_stats()
+        assert stats['backend'] == 'sqlite' and not stats['neo4j_connected']
+        assert stats['reconnecting'] and stats['reconnected_at'] is None
+        assert manager.driver is None and mock_driver.close.called
+        manager.store_interaction("u1", "Tune cache latency", "Measure the cache hit rate")
+        assert manager.get_user_context("u1")['interactions'] == 2
+
+        writes_fail.clear()
+        while manager.reconnected_at is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    assert manager.get_connection_stats()['neo4j_connected'] and manager.driver is mock_driver
+    copied = [row['user_message'] for call in mock_tx.run.call_args_list
+              for row in call.kwargs.get('interactions', [])]
+    assert copied == ["Explain graph databases", "Tune cache latency"]
+    manager.close()
@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+
+from src.memory_trace_manager import WriteBehindWriter
+
+
+class RecordingWriter:
+    def __init__(self, failures=0):
+        self.batches = []
+        self.failures = failures
+
+    def __call__(self, batch):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+        self.batches.append([row['n'] for row in batch])
+
+
+def test_close_flushes_queued_rows_in_batches():
+    sink = RecordingWriter()
+    writer = WriteBehindWriter(sink, flush_interval=60.0, max_batch=2)
+    for n in range(5):
+        writer.submit({'n': n})
+    writer.close()
+    assert [n for batch in sink.batches for n in batch] == [0, 1, 2, 3, 4]
+    assert all(len(batch) <= 2 for batch in sink.batches)
+    assert writer.get_stats()['written'] == 5
+    assert not writer.submit({'n': 5})
+
+
+@pytest.mark.parametrize('overflow, kept', [('drop', [0, 1]), ('drop_oldest', [1, 2])])
+def test_overflow_policies(overflow, kept):
+    sink = RecordingWriter()
+    writer = WriteBehindWriter(sink, flush_interval=60.0, max_batch=10, queue_size=2, overflow=overflow)
+    results = [writer.submit({'n': n}) for n in range(3)]
+    assert writer.get_stats()['queue_depth'] == 2
+    writer.close()
+    assert [n for batch in sink.batches for n in batch] == kept
+    assert writer.get_stats()['dropped'] == 1
+    assert results == ([True, True, False] if overflow == 'drop' else [True, True, True])
+
+
+def test_block_policy_waits_for_room():
+    release = threading.Event()
+    sink = RecordingWriter()
+
+    def slow_sink(batch):
+        release.wait(5)
+        sink(batch)
+
+    writer = WriteBehindWriter(slow_sink, flush_interval=60.0, max_batch=1, queue_size=1,
+                               overflow='block', block_timeout=5.0)
+    writer.submit({'n': 0})
+    threading.Timer(0.05, release.set).start()
+    assert writer.submit({'n': 1})
+    writer.submit({'n': 2})
+    writer.close()
+    assert [n for batch in sink.batches for n in batch] == [0, 1, 2]
+    assert writer.get_stats()['dropped'] == 0
+
+
+def test_failed_batches_are_retried_then_counted():
+    flaky = RecordingWriter(failures=2)
+    writer = WriteBehindWriter(flaky, flush_interval=60.0, max_retries=2, retry_backoff=0.001)
+    writer.submit({'n': 0})
+    writer.flush()
+    stats = writer.get_stats()
+    assert flaky.batches == [[0]] and stats['retries'] == 2 and stats['failed'] == 0
+
+    broken = RecordingWriter(failures=10)
+    writer_down = WriteBehindWriter(broken, flush_interval=60.0, max_retries=1, retry_backoff=0.001)
+    writer_down.submit({'n': 0})
+    writer_down.close()
+    assert writer_down.get_stats()['failed'] == 1
+    writer.close()
+
+
+def test_unknown_overflow_policy_is_rejected():
+    with pytest.raises(ValueError):
+        WriteBehindWriter(RecordingWriter(), overflow='spill')
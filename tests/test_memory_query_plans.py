@@ -0,0 +1,39 @@
+"""Query-plan checks against a live Neo4j; skipped unless NEO4J_URI is set."""
+import os
+
+import pytest
+
+from src.memory_trace_manager.backends import (INTERACTION_TEXTS_QUERY, RECALL_BY_CONCEPTS_QUERY,
+                                               RECENT_INTERACTIONS_QUERY)
+from src.memory_trace_manager.memory_graph import MemoryTraceManager
+
+pytestmark = pytest.mark.skipif(not os.environ.get("NEO4J_URI"), reason="NEO4J_URI not set")
+
+
+def _operators(plan):
+    yield plan['operatorType']
+    for child in plan.get('children', []):
+        yield from _operators(child)
+
+
+@pytest.fixture(scope='module')
+def manager():
+    manager = MemoryTraceManager(os.environ["NEO4J_URI"], os.environ.get("NEO4J_USER", "neo4j"),
+                                 os.environ.get("NEO4J_PASSWORD", "password"))
+    assert manager.driver is not None
+    assert manager.ensure_schema()
+    yield manager
+    manager.close()
+
+
+@pytest.mark.parametrize('query, parameters', [
+    (RECALL_BY_CONCEPTS_QUERY, {'user_id': 'plan-check', 'concepts': ['graph', 'index'], 'limit': 5}),
+    (RECENT_INTERACTIONS_QUERY, {'user_id': 'plan-check', 'limit': 5}),
+    (INTERACTION_TEXTS_QUERY, {'after': '2024-01-01T00:00:00', 'limit': 500}),
+])
+def test_recall_starts_from_index_seek(manager, query, parameters):
+    with manager.driver.session() as session:
+        plan = session.run("EXPLAIN " + query, **parameters).consume().plan
+    operators = [operator.split('@')[0] for operator in _operators(plan)]
+    assert any('IndexSeek' in operator for operator in operators), operators
+    assert not any(operator in ('AllNodesScan', 'NodeByLabelScan') for operator in operators), operators
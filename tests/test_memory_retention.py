@@ -0,0 +1,79 @@
+import time
+from datetime import timedelta
+
+from src.memory_trace_manager import MemoryTraceManager, SQLiteGraphBackend
+from src.memory_trace_manager.retention import period_of, summarize
+
+
+def _old_row(index, timestamp, concepts):
+    return {
+        'user_id': "u1",
+        'interaction_id': f"u1_{index}",
+        'user_message': f"old question {index}",
+        'assistant_response': "old answer",
+        'timestamp': timestamp,
+        'mentions': [{'concept': concept, 'source': 'user'} for concept in concepts]
+    }
+
+
+def test_summaries_group_by_user_and_period():
+    assert [period_of("2024-01-31T23:59:59", period) for period in ('day', 'week', 'month')] == \
+        ["2024-01-31", "2024-W05", "2024-01"]
+    summaries = summarize([
+        {'user_id': "u1", 'timestamp': "2024-01-02T00:00:00", 'concepts': ["graph", "cache"]},
+        {'user_id': "u1", 'timestamp': "2024-01-01T00:00:00", 'concepts': ["graph"]},
+        {'user_id': "u1", 'timestamp': "2024-02-01T00:00:00", 'concepts': []},
+        {'user_id': "u2", 'timestamp': "2024-01-03T00:00:00", 'concepts': ["cache"]},
+    ], 'month')
+    assert summaries[0] == {'user_id': "u1", 'period': "2024-01", 'interaction_count': 2,
+                            'first_timestamp': "2024-01-01T00:00:00", 'last_timestamp': "2024-01-02T00:00:00",
+                            'concepts': [{'concept': "graph", 'frequency': 2}, {'concept': "cache", 'frequency': 1}]}
+    assert [(s['user_id'], s['period'], s['interaction_count']) for s in summaries[1:]] == [
+        ("u1", "2024-02", 1), ("u2", "2024-01", 1)]
+
+
+def test_manager_compacts_on_schedule_and_keeps_context(tmp_path):
+    backend = SQLiteGraphBackend(tmp_path / "memory.sqlite3")
+    backend.write_interactions([
+        _old_row(1, "2023-01-05T10:00:00", ["graph", "cache"]),
+        _old_row(2, "2023-01-20T10:00:00", ["graph"]),
+        _old_row(3, "2023-02-03T10:00:00", ["latency"]),
+    ])
+    manager = MemoryTraceManager(backend=backend, retention=timedelta(days=30), compaction_batch=2,
+                                 compaction_interval=3600)
+    deadline = time.monotonic() + 5
+    while manager.get_retention_stats()['runs'] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    stats = manager.get_retention_stats()
+    assert stats['enabled'] and stats['period'] == "month" and stats['total_interactions_compacted'] == 3
+    assert stats['last_run']['batches'] == 2 and stats['total_mentions_deleted'] == 4
+    assert [(s['period'], s['interaction_count'], s['first_timestamp']) for s in
+            sorted(backend.export_summaries(), key=lambda s: s['period'])] == [
+        ("2023-01", 2, "2023-01-05T10:00:00"), ("2023-02", 1, "2023-02-03T10:00:00")]
+
+    manager.store_interaction("u1", "Explain graph databases", "Graph databases store relationships")
+    context = manager.get_user_context("u1")
+    assert context['interactions'] == 4
+    assert context['concepts'][0] == {'name': "graph", 'frequency': 4}
+    manager.memory_cache.clear()
+    assert manager.recall_relevant("u1", "graph cache")['message'] == "Explain graph databases"
+    assert manager.compact(timedelta(days=1)) == {
+        'interactions': 0, 'mentions': 0, 'summaries': 0, 'text_chars': 0, 'batches': 0}
+    manager.close()
+
+
+def test_compaction_drops_stale_users_from_the_concept_index():
+    manager = MemoryTraceManager(backend=SQLiteGraphBackend(':memory:'))
+    manager.store_interaction("u1", "Explain graph databases", "Graph databases store relationships")
+    manager.memory_cache.clear()
+    assert manager.recall_relevant("u1", "graph")['response'] == "Graph databases store relationships"
+
+    report = manager.compact(timedelta(seconds=-1))
+    assert report['interactions'] == 1 and report['text_chars'] == len(
+        "Explain graph databasesGraph databases store relationships")
+    manager.memory_cache.clear()
+    assert manager.recall_relevant("u1", "graph") is None
+    assert manager.get_user_context("u1")['interactions'] == 1
+    assert manager.get_retention_stats() == {"enabled": False}
+    manager.close()
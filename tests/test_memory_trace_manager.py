@@ -17,3 +17,82 @@ def test_add_memory(mock_neo4j):
     assert "MERGE (c:Concept {name: $concept})" in args[0]
     assert kwargs['concept'] == 'test_concept'
 
+
+
+@patch('src.memory_trace_manager.memory_graph.neo4j')
+def test_memory_cache_is_bounded_lru(mock_neo4j):
+    mock_driver = MagicMock()
+    mock_neo4j.GraphDatabase.driver.return_value = mock_driver
+
+    manager = MemoryTraceManager(max_cache_size=2)
+    manager.store_interaction("u1", "first message", "first response")
+    manager.store_interaction("u1", "second message", "second response")
+    assert manager.recall_relevant("u1", "first message")['response'] == "first response"
+    manager.store_interaction("u1", "third message", "third response")
+
+    assert len(manager.memory_cache) == 2
+    assert manager.memory_cache.get(manager._get_cache_key("u1", "second message")) is None
+    stats = manager.get_cache_stats()
+    assert stats['hits'] == 1 and stats['evictions'] == 1
+
+
+def _transactional_driver(mock_neo4j):
+    mock_driver = MagicMock()
+    mock_session = MagicMock()
+    mock_tx = MagicMock()
+    mock_driver.session.return_value.__enter__.return_value = mock_session
+    mock_session.execute_write.side_effect = lambda fn, *args, **kwargs: fn(mock_tx, *args, **kwargs)
+    mock_neo4j.GraphDatabase.driver.return_value = mock_driver
+    return mock_session, mock_tx
+
+
+@patch('src.memory_trace_manager.memory_graph.neo4j')
+def test_store_interaction_is_one_statement(mock_neo4j):
+    mock_session, mock_tx = _transactional_driver(mock_neo4j)
+
+    manager = MemoryTraceManager()
+    manager.store_interaction("u1", "Explain graph databases", "Graph databases store relationships")
+
+    mock_session.run.assert_not_called()
+    mock_session.execute_write.assert_called_once()
+    mock_tx.run.assert_called_once()
+    query, = mock_tx.run.call_args.args
+    assert "UNWIND $interactions AS row" in query and "UNWIND row.mentions AS mention" in query
+    row, = mock_tx.run.call_args.kwargs['interactions']
+    assert row['user_id'] == "u1"
+    assert {(m['concept'], m['source']) for m in row['mentions']} == {
+        ('explain', 'user'), ('graph', 'user'), ('databases', 'user'),
+        ('graph', 'assistant'), ('databases', 'assistant'), ('store', 'assistant'), ('relationships', 'assistant')}
+
+
+@patch('src.memory_trace_manager.memory_graph.neo4j')
+def test_write_behind_coalesces_interactions(mock_neo4j):
+    mock_session, mock_tx = _transactional_driver(mock_neo4j)
+
+    manager = MemoryTraceManager(write_behind=True, flush_interval=60.0)
+    for index in range(3):
+        manager.store_interaction("u1", f"message {index}", f"response {index}")
+    assert manager.recall_relevant("u1", "message 2")['response'] == "response 2"
+    mock_tx.run.assert_not_called()
+
+    manager.close()
+    mock_tx.run.assert_called_once()
+    assert [row['user_message'] for row in mock_tx.run.call_args.kwargs['interactions']] == \
+        ["message 0", "message 1", "message 2"]
+
+
+@patch('src.memory_trace_manager.memory_graph.neo4j')
+def test_recall_passes_concepts_as_parameter(mock_neo4j):
+    mock_driver = MagicMock()
+    mock_session = mock_driver.session.return_value
+    mock_session.run.return_value = []
+    mock_neo4j.GraphDatabase.driver.return_value = mock_driver
+
+    manager = MemoryTraceManager(concept_index=False)
+    manager.recall_relevant("u1", "tell me about o'brien graphs")
+    manager.recall_relevant("u1", "other words entirely")
+
+    first, second = mock_session.run.call_args_list
+    assert first.args[0] == second.args[0]
+    assert "$concepts" in first.args[0] and "o'brien" not in first.args[0]
+    assert sorted(first.kwargs['concepts']) == ["about", "graphs", "o'brien", "tell"]
@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from src.abstract_pattern_detector import AbstractPatternDetector, iter_query_log
+
+QUERIES = [
+    "What is the first step of the process?",
+    "Explain how the algorithm leads to better results because of caching.",
+    "Calculate 1. the sum 2. the mean",
+    "Why does the system slow down during peak hours?",
+    "the cache is cold",
+] * 4
+
+
+def test_streaming_matches_materialized_analysis():
+    detector = AbstractPatternDetector()
+    full = detector.analyze_patterns(QUERIES)
+    assert len(full['individual_analyses']) == len(QUERIES)
+    streamed = detector.analyze_patterns(iter(QUERIES), include_individual=False)
+    assert 'individual_analyses' not in streamed
+    assert streamed == {key: value for key, value in full.items() if key != 'individual_analyses'}
+    assert detector.analyze_patterns(iter([])) == {'error': 'No queries provided'}
+
+
+def test_process_pool_merges_partial_aggregates():
+    detector = AbstractPatternDetector()
+    serial = detector.analyze_patterns(QUERIES)
+    pooled = detector.analyze_patterns(iter(QUERIES), workers=2, chunk_size=3, max_pending_chunks=2)
+    assert pooled['average_complexity'] == pytest.approx(serial.pop('average_complexity'))
+    pooled.pop('average_complexity')
+    assert pooled == serial
+
+
+def test_iter_query_log_reads_strings_and_records(tmp_path):
+    log = tmp_path / 'queries.jsonl'
+    log.write_text('\n'.join([
+        json.dumps("What is a pattern?"),
+        json.dumps({"query": "Explain the theory", "user": "u1"}),
+        "",
+        "{not json",
+        json.dumps({"other": "no query"}),
+    ]) + '\n', encoding='utf-8')
+    assert list(iter_query_log(log)) == ["What is a pattern?", "Explain the theory"]
+    result = AbstractPatternDetector().analyze_patterns(iter_query_log(log), include_individual=False)
+    assert result['pattern_distribution'] == {'WHAT': 1, 'EXPLANATORY': 1}
@@ -0,0 +1,34 @@
+from src.abstract_pattern_detector.pattern_finder import FEATURE_NAMES, AbstractPatternDetector
+from src.text_analysis import AnalyzedText
+
+
+def test_feature_vector_follows_feature_names():
+    detector = AbstractPatternDetector()
+    query = "First, explain how the algorithm works: step 1. then compare a) and b) because of cost?"
+    features = detector.extract_features(query)
+    assert set(features) == set(FEATURE_NAMES)
+    assert detector.feature_vector(query) == [float(features[name]) for name in FEATURE_NAMES]
+
+
+def test_detect_is_built_from_features():
+    detector = AbstractPatternDetector()
+    query = "Why does the system lead to more errors during the process? It leads to retries."
+    features = detector.extract_features(query)
+    result = detector.detect(query)
+    assert result['question_type'] == 'WHY'
+    assert result['complexity_score'] == features['complexity_score']
+    assert result['structural_elements'] == ['sequences', 'causality']
+    assert result['cognitive_patterns']['temporal_references'] == features['temporal_references']
+
+
+def test_case_unsafe_text_matches_regex_semantics():
+    detector = AbstractPatternDetector()
+    # U+0130 matches 'i' under IGNORECASE, so 'İf' counts as a logical operator
+    features = detector.extract_features("İf ſome are better, then all are")
+    assert features['logical_operators'] == 2
+    assert features['quantifiers'] == 2
+
+
+def test_sentence_count_matches_split():
+    for text in ["", "One. Two!! Three?", "...", "a.b..c!?d", "Ünïcode. text"]:
+        assert AnalyzedText(text).sentence_count == len(AnalyzedText(text).sentences)
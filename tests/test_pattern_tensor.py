@@ -0,0 +1,45 @@
+import array
+
+import pytest
+
+import stubs.torch as torch
+from src.abstract_pattern_detector import pattern_finder
+from src.abstract_pattern_detector.pattern_finder import AbstractPatternDetector
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def detector(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(pattern_finder, 'np', None)
+    return AbstractPatternDetector()
+
+
+def test_tensor_inputs_reduce_to_mean(detector):
+    assert detector.detect([[1.5, 2.25], [3, 4]])['reconstruction_error'] == pytest.approx(0.6875)
+    assert detector.detect([[1], [1, 2.5]])['reconstruction_error'] == pytest.approx(0.5)
+    assert detector.detect(torch.tensor([[0.1, 0.2]]))['reconstruction_error'] == pytest.approx(0.15)
+    assert detector.detect(array.array('d', [0.3, 0.4]))['reconstruction_error'] == pytest.approx(0.35)
+    assert detector.detect([])['reconstruction_error'] == 0.0
+
+
+def test_reconstruction_errors_reduce_each_batch_entry(detector):
+    batch = [[[1, 2], [3, 4.5]], [[0, 0], [0, 1]]]
+    assert detector.reconstruction_errors(batch) == pytest.approx([0.625, 0.25])
+    assert detector.reconstruction_errors([]) == []
+
+
+def test_unreadable_tensor_raises(detector):
+    with pytest.raises(ValueError):
+        detector.detect(['not a number'])
+    with pytest.raises(ValueError):
+        detector.detect(object())
+
+
+def test_numpy_batch_matches_per_entry_detect():
+    np = pytest.importorskip('numpy')
+    detector = AbstractPatternDetector()
+    batch = np.linspace(-3, 3, 60, dtype=np.float32).reshape(5, 3, 4)
+    expected = [detector.detect(entry)['reconstruction_error'] for entry in batch]
+    assert detector.reconstruction_errors(batch) == pytest.approx(expected)
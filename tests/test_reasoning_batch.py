@@ -0,0 +1,28 @@
+import json
+
+from src.reasoning_body.logic_engine import ReasoningBody
+
+DOCUMENTS = [
+    "If it rains then the ground is wet. Therefore we stay inside.",
+    "All men are mortal because all men are.",
+    "Either you agree or you are against us.",
+    "Probably the cache is cold, likely due to restarts.",
+    "",
+] * 3
+
+
+def test_analyze_many_preserves_input_order_across_workers():
+    body = ReasoningBody()
+    expected = [body.analyze(document) for document in DOCUMENTS]
+    results = list(body.analyze_many(iter(DOCUMENTS), workers=2, chunk_size=2, max_pending_chunks=2))
+    assert results == expected
+
+
+def test_analyze_stream_writes_jsonl_sink(tmp_path):
+    body = ReasoningBody()
+    sink = tmp_path / 'reasoning.jsonl'
+    results = list(body.analyze_stream(DOCUMENTS, sink=sink, workers=0))
+    lines = sink.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == len(DOCUMENTS) == len(results)
+    assert [json.loads(line)['primary_reasoning_type'] for line in lines] == \
+        [result['primary_reasoning_type'] for result in results]
@@ -0,0 +1,27 @@
+from src.reasoning_body.logic_engine import ReasoningBody
+from src.reasoning_body.matcher import ReasoningMatcher
+
+
+def test_scan_finds_overlapping_literals():
+    matcher = ReasoningMatcher(['is', 'is a', 'is like', 'so '])
+    matches = matcher.scan('This IS a test, also so.')
+    assert matches.positions['is'] == [2, 5]
+    assert matches.positions['is a'] == [5]
+    assert matches.positions['so '] == [18]
+    assert not matches.contains('is like')
+
+
+def test_matcher_analysis_matches_per_pattern_scans():
+    texts = [
+        "If it rains then the ground is wet. Therefore we stay inside.",
+        "All men are mortal. Socrates is a man, so he is mortal because all men are.",
+        "Either you agree or you are against us. Experts say this will lead to chaos then ruin.",
+        "You claim it works but really it fails. Probably the cache is cold, likely due to restarts.",
+        "Suppose the model is like a brain! Thus it learns since data correlates with outcomes?",
+        "İf the ſky is blue then ı am happy.",
+        "",
+    ]
+    per_pattern = ReasoningBody(use_matcher=False)
+    compiled = ReasoningBody()
+    for text in texts:
+        assert compiled.analyze(text) == per_pattern.analyze(text)
@@ -0,0 +1,82 @@
+from src.response_cache import LRUTTLCache, SQLiteCacheStore, TieredCache, response_cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUTTLCache(max_entries=2, ttl=None)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (3, 1, 1)
+
+
+def test_entries_expire_lazily():
+    clock = FakeClock()
+    cache = LRUTTLCache(max_entries=10, ttl=5.0, clock=clock)
+    cache.put('a', 'x')
+    clock.now = 4.9
+    assert cache.get('a') == 'x'
+    clock.now = 5.0
+    assert len(cache) == 1
+    assert cache.get('a') is None
+    assert len(cache) == 0 and cache.get_stats()['expirations'] == 1
+
+
+def test_byte_budget_bounds_memory():
+    cache = LRUTTLCache(max_entries=100, ttl=None, max_bytes=100, sizer=len)
+    cache.put('a', 'x' * 40)
+    cache.put('b', 'y' * 40)
+    cache.put('c', 'z' * 40)
+    assert 'a' not in cache and 'b' in cache and 'c' in cache
+    assert cache.get_stats()['bytes'] == 80
+    cache.put('huge', 'w' * 101)
+    assert 'huge' not in cache and cache.get_stats()['rejected'] == 1
+
+
+def test_sqlite_tier_warms_a_new_memory_tier(tmp_path):
+    path = tmp_path / 'cache.sqlite'
+    first = TieredCache(LRUTTLCache(), SQLiteCacheStore(path))
+    first.put('key', {'response': 'cached', 'scores': (0.5, 1)})
+    first.close()
+
+    restarted = TieredCache(LRUTTLCache(), SQLiteCacheStore(path))
+    assert restarted.get('key') == {'response': 'cached', 'scores': (0.5, 1)}
+    assert restarted.get('key') == {'response': 'cached', 'scores': (0.5, 1)}
+    stats = restarted.get_stats()
+    assert stats['backing_hits'] == 1 and stats['hits'] == 1
+    assert stats['backing']['entries'] == 1
+    restarted.close()
+
+
+def test_sqlite_tier_trims_oldest_entries(tmp_path):
+    store = SQLiteCacheStore(tmp_path / 'cache.sqlite', max_entries=10)
+    for index in range(11):
+        store.put(f'k{index}', index)
+    # Crossing the cap trims down to 90% of it in one delete
+    assert store.get('k0') is None and store.get('k1') is None and store.get('k2') == 2
+    assert store.get_stats()['entries'] == 9
+    store.put('k10', 'replaced')
+    assert store.get('k10') == 'replaced' and store.get_stats()['entries'] == 9
+    assert store.connection.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0] == 9
+    store.close()
+
+
+def test_cache_key_covers_every_input():
+    versions = {'reasoning': 'abc'}
+    key = response_cache_key('Why?', ['reasoning', 'emotion'], False, versions)
+    assert key == response_cache_key('Why?', ['emotion', 'reasoning', 'emotion'], False, versions)
+    assert key != response_cache_key('why?', ['reasoning', 'emotion'], False, versions)
+    assert key != response_cache_key('Why?', ['reasoning'], False, versions)
+    assert key != response_cache_key('Why?', ['reasoning', 'emotion'], True, versions)
+    assert key != response_cache_key('Why?', ['reasoning', 'emotion'], False, {'reasoning': 'abd'})
@@ -0,0 +1,50 @@
+from src.entropy_matrix_harmonizer.coherence_engine import CoherenceEngine, ResponseSynthesizer
+
+PATTERN = {'question_type': 'WHY', 'complexity_score': 0.8,
+           'cognitive_patterns': {'logical_connectives': 1}, 'structural_elements': ['lists']}
+
+
+def test_template_response_matches_fragment_order():
+    synthesizer = ResponseSynthesizer()
+    outputs = [
+        {'type': 'Deductive Reasoning', 'premises': 'all men are mortal', 'conclusion': 'he is mortal'},
+        {'emotion': 'POSITIVE', 'intensity': 0.9},
+        PATTERN,
+    ]
+    response = synthesizer.synthesize_response(
+        outputs, {'coherence_score': 0.5, 'flags': ['LOW_COHERENCE', 'UNCERTAIN_REASONING']},
+        {'expertise_level': 'novice'})
+    assert response == (
+        "Addressing your why inquiry with comprehensive analysis. "
+        "Through deductive reasoning from premises 'all men are mortal', the conclusion is: he is mortal. "
+        "Your positive engagement enhances the depth of this analysis. "
+        "Recognizing the logical structure in your query for systematic processing. "
+        "Your structured approach facilitates precise analysis. "
+        "To ensure clarity, could you provide additional context? "
+        "Note: This analysis carries some uncertainty due to reasoning confidence levels. "
+        "I've included detailed explanation for clarity.")
+
+
+def test_simple_response_without_reasoning():
+    synthesizer = ResponseSynthesizer()
+    response = synthesizer.synthesize_response(
+        [{'emotion': 'ANGER', 'intensity': 0.9}, {'question_type': 'WHEN', 'complexity_score': 0.1}],
+        {'coherence_score': 0.2, 'flags': []}, {'expertise_level': 'expert'})
+    assert response == ("Analyzing your query through integrated cognitive processing. "
+                        "Given your expertise, I've kept this concise - expand if you need technical details.")
+
+
+def test_coherence_uses_first_output_of_each_kind():
+    engine = CoherenceEngine()
+    outputs = [
+        {'emotion': 'JOY', 'intensity': 0.9},
+        {'type': 'Inductive Reasoning', 'confidence': 0.6},
+        {'emotion': 'FEAR', 'intensity': 0.1},
+        {'emotion': 'SADNESS'},
+        PATTERN,
+    ]
+    result = engine.assess_coherence(outputs, context_history=['earlier turn'])
+    assert result['metrics'] == {'reasoning_confidence': 0.6, 'emotion_intensity': 0.9, 'pattern_complexity': 0.8}
+    assert result['flags'] == ['LOW_COHERENCE', 'UNCERTAIN_REASONING', 'HIGH_EMOTIONAL_INTENSITY',
+                               'EMOTIONAL_INCONSISTENCY']
+    assert not result['context_consistent']
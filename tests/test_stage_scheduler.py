@@ -0,0 +1,36 @@
+import time
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+
+import pytest
+from src.stage_scheduler.scheduler import StageScheduler
+
+def _sleeper(seconds, value):
+    def stage():
+        time.sleep(seconds)
+        return value
+    return stage
+
+def test_stages_run_concurrently():
+    scheduler = StageScheduler(max_workers=4)
+    start = time.perf_counter()
+    results, timings = scheduler.run({name: _sleeper(0.1, name) for name in ("a", "b", "c", "d")})
+    elapsed = time.perf_counter() - start
+
+    assert results == {"a": "a", "b": "b", "c": "c", "d": "d"}
+    assert set(timings) == {"a", "b", "c", "d"}
+    assert elapsed < 0.3  # roughly the slowest stage, not the sum
+    assert scheduler.get_stage_metrics()["a"]["samples"] == 1
+
+def test_stage_failure_propagates():
+    scheduler = StageScheduler(max_workers=2)
+
+    def broken():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        scheduler.run({"ok": _sleeper(0.0, 1), "broken": broken})
+
+def test_timeout_raises():
+    scheduler = StageScheduler(max_workers=2)
+    with pytest.raises(FuturesTimeoutError):
+        scheduler.run({"slow": _sleeper(0.5, None)}, timeout=0.05)
@@ -0,0 +1,28 @@
+import re
+
+from src.text_analysis import AnalyzedText
+from src.emotional_analyzer.emotion_processor import EmotionalAnalyzer
+from src.reasoning_body.logic_engine import ReasoningBody
+
+TEXT = "All men are mortal. Socrates is a man!  Therefore Socrates is mortal? Very happy, very HAPPY."
+
+def test_views_match_raw_derivations():
+    analyzed = AnalyzedText(TEXT)
+    assert analyzed.lower == TEXT.lower()
+    assert analyzed.words == TEXT.split()
+    assert analyzed.lower_words == TEXT.lower().split()
+    assert analyzed.tokens == re.findall(r'\b\w+\b', TEXT.lower())
+    assert [analyzed.lower[s:e] for s, e in analyzed.token_offsets] == analyzed.tokens
+    assert analyzed.token_counts['happy'] == 2
+    assert analyzed.sentences == re.split(r'[.!?]+', TEXT)
+    assert len(analyzed.lower_sentences) == len(analyzed.sentences)
+
+def test_of_reuses_instance():
+    analyzed = AnalyzedText(TEXT)
+    assert AnalyzedText.of(analyzed) is analyzed
+    assert AnalyzedText.of(TEXT).text == TEXT
+
+def test_analyzers_accept_analyzed_text():
+    analyzed = AnalyzedText(TEXT)
+    assert ReasoningBody().analyze(analyzed) == ReasoningBody().analyze(TEXT)
+    assert EmotionalAnalyzer().analyze(analyzed) == EmotionalAnalyzer().analyze(TEXT)